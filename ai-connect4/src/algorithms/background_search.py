@@ -0,0 +1,172 @@
+import threading
+from typing import *
+
+from src.state.state import State
+
+"""
+Connect 4 Background Search
+
+This code runs a search of an engine (see `SearchEngine`) in a worker thread, so that the caller (e.g. the GUI event
+loop) stays responsive while it runs: the caller polls the search (`done`, and the live `depth`, `best_move` and
+`nodes` of its progress) instead of waiting for it, and can stop it at any time (`move_now`), in which case the best
+move of its last completed depth is played.
+
+The engine can also ponder in a worker thread (see `BackgroundPonder` and `SearchEngine.ponder`) while the human is
+thinking, it must be stopped before the engine searches the computer move.
+
+The searches run in a thread of the same process, so that they keep using (and filling) the transposition table of
+the engine between the moves. The engine must not be used by anything else until the search is done.
+
+"""
+
+
+class BackgroundSearch:
+    def __init__(self, engine, state: State, time_budget: Optional[float] = None, node_budget: Optional[int] = None):
+        """
+        Prepares the search of the best move of the computer from the given state, started by `start`.
+
+        :param engine: The search engine (`SearchEngine`).
+        :param state: The current state of the game, it is copied so that the caller can keep using it.
+        :type state: State
+        :param time_budget: The wall-clock budget of the search in seconds. Defaults to None (no time limit).
+        :type time_budget: float
+        :param node_budget: The maximum number of nodes to be visited. Defaults to None (no nodes limit).
+        :type node_budget: int
+        """
+        self.engine = engine
+        self.state = state.copy()
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.depth = 0  # the last completed depth
+        self.best_move: Optional[int] = None  # the best move of the last completed depth
+        self.value: Optional[float] = None  # the value of the best move of the last completed depth
+        self.result: Optional[Tuple[float, State]] = None  # the result of the engine search, once done
+        self.error: Optional[BaseException] = None  # the exception raised by the search, if any
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="connect4-search", daemon=True)
+
+    def start(self) -> "BackgroundSearch":
+        """
+        Starts the search in its worker thread.
+
+        :return: The search itself.
+        """
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.engine.search(self.state, self.time_budget, self.node_budget, stop=self._stop,
+                                             progress=self._progress)
+        except BaseException as err:  # raised again in the caller thread by get_result
+            self.error = err
+
+    def _progress(self, depth: int, best_move: int, value: float):
+        self.depth, self.best_move, self.value = depth, best_move, value
+
+    @property
+    def nodes(self) -> int:
+        """
+        The number of nodes visited so far.
+        """
+        return self.engine.searched_nodes
+
+    def done(self) -> bool:
+        """
+        Checks whether the search is over, without waiting.
+
+        :return: True if the result is available.
+        :rtype: bool
+        """
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def move_now(self):
+        """
+        Asks the search to stop as soon as possible, it then plays the best move of its last completed depth.
+        """
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the search to be over.
+
+        :param timeout: The maximum waiting time in seconds. Defaults to None (no limit).
+        :type timeout: float
+        :return: True if the search is over.
+        :rtype: bool
+        """
+        self._thread.join(timeout)
+        return self.done()
+
+    def get_result(self) -> Tuple[float, State]:
+        """
+        Returns the result of the search, once done.
+
+        :return: Tuple of the value of the best move and the state after playing it.
+        :raises RuntimeError: if the search is not over yet.
+        """
+        if not self.done():
+            raise RuntimeError("The search is not over yet")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class BackgroundPonder:
+    def __init__(self, engine, state: State):
+        """
+        Prepares the pondering of the engine (see `SearchEngine.ponder`) from the given state, started by `start`.
+
+        :param engine: The search engine (`SearchEngine`).
+        :param state: The current state of the game (of the human turn), it is copied so that the caller can keep
+                      using it.
+        :type state: State
+        """
+        self.engine = engine
+        self.state = state.copy()
+        self.pondered = 0  # the number of replies whose search was completed, once done
+        self.error: Optional[BaseException] = None  # the exception raised by the pondering, if any
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="connect4-ponder", daemon=True)
+
+    def start(self) -> "BackgroundPonder":
+        """
+        Starts the pondering in its worker thread.
+
+        :return: The pondering itself.
+        """
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.pondered = self.engine.ponder(self.state, self._stop)
+        except BaseException as err:  # raised again in the caller thread by stop and join
+            self.error = err
+
+    def stop(self):
+        """
+        Stops the pondering and waits for it to be over, so that the engine can be used again.
+
+        :raises: the exception raised by the pondering, if any.
+        """
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the pondering to be over, without stopping it.
+
+        :param timeout: The maximum waiting time in seconds. Defaults to None (no limit).
+        :type timeout: float
+        :return: True if the pondering is over.
+        :rtype: bool
+        :raises: the exception raised by the pondering, if any.
+        """
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return not self._thread.is_alive()
@@ -0,0 +1,285 @@
+import copy
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State
+from src.algorithms.minimax import Minimax
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.negamax import NegamaxPVS
+from src.algorithms.move_ordering import MoveOrderer, center_out_order
+from src.algorithms.search_limits import SearchLimits, SearchTimeout
+from src.algorithms.search_stats import SearchStats
+from src.algorithms.transposition_table import TranspositionTable, state_key, canonical_key, mirror_move
+from src.tree.tree_representation import RECORD_OFF
+
+"""
+Connect 4 Search Engine
+
+This code defines an engine object that owns a transposition table and keeps it alive across the searches of the
+moves of a game (and optionally across games), so that every search starts from the work of the previous ones instead
+of an empty table.
+
+Every search starts a new generation of the table (see `TranspositionTable.new_search`), so that the entries of the old
+moves are replaced first when the table is full.
+
+When a time or node budget is given, the search is iteratively deepened: depths 1, 2, 3 ... k are searched in turn,
+each one starting with the best move of the previous one, until depth k is done or the budget expires, in which case
+the best move of the last completed depth is played. The algorithms that take a guess (negamax) also start each
+iteration with an aspiration window around the value of the previous one.
+
+A search can also be stopped from another thread (e.g. a "move now" button) with a stop flag, in which case it is
+iteratively deepened as well. While it runs, its progress can be followed with a callback called after every
+completed depth, and with `searched_nodes`, the live count of its visited nodes.
+
+The engine can also ponder (see `ponder`), that is, search on the human time: the positions after every human reply
+are searched in advance (the predicted reply first), so that the searches fill the table, and the reply that is
+actually played is answered at once if its search was completed.
+
+When an opening book (see `OpeningBook`) or positions databases (see `PositionDB`) are attached, the positions they
+cover are played from them without any search, as long as their moves were searched at least as deep as the engine
+depth.
+
+When statistics are collected (see `SearchStats`), every search fills a stats object (the counters of all its
+iterations), available as `stats` after the search.
+
+"""
+
+PURE_MINIMAX = "Pure Minimax"
+MINIMAX_WITH_ALPHA_BETA = "Minimax with Alpha-Beta Pruning"
+NEGAMAX_PVS = "Negamax with Principal Variation Search"
+
+# approach name -> (solver class, name of its run method, whether it takes a move ordering, whether it takes a guess)
+ALGORITHMS = {
+    PURE_MINIMAX: (Minimax, "run_minimax", False, False),
+    MINIMAX_WITH_ALPHA_BETA: (MinimaxWithAlphaBeta, "run_minimax_with_alpha_beta", True, False),
+    NEGAMAX_PVS: (NegamaxPVS, "run_negamax", True, True),
+}
+
+
+class SearchEngine:
+    def __init__(self, approach: str = MINIMAX_WITH_ALPHA_BETA, k: int = 2, table_capacity: int = 1 << 20,
+                 keep_table_across_games: bool = False, move_ordering: bool = True, record_depth: float = RECORD_OFF,
+                 book=None, collect_stats: bool = False):
+        """
+        Initializes the engine.
+
+        :param approach: The search algorithm name, one of the `ALGORITHMS` keys.
+        :type approach: str
+        :param k: The search depth.
+        :type k: int
+        :param table_capacity: The maximum number of entries of the transposition table.
+        :type table_capacity: int
+        :param keep_table_across_games: Flag to keep the table entries when a new game starts. Defaults to False.
+        :type keep_table_across_games: bool
+        :param move_ordering: Flag to order the moves (center-out, table move, killers and history) of the
+                              algorithms that prune. Defaults to True.
+        :type move_ordering: bool
+        :param record_depth: The depth down to which the search tree is recorded (`RECORD_OFF`, `RECORD_ROOT`,
+                             `RECORD_FULL` or any depth N). Defaults to RECORD_OFF (no tree is built).
+        :type record_depth: float
+        :param book: The opening book (`OpeningBook`) to be consulted before searching. Defaults to None (no book).
+        :param collect_stats: Flag to collect the statistics of every search (see `SearchStats`). Defaults to False.
+        :type collect_stats: bool
+        """
+        assert approach in ALGORITHMS, f"Unknown approach {approach}"
+        self.approach = approach
+        self.k = k
+        self.table = TranspositionTable(table_capacity)
+        self.keep_table_across_games = keep_table_across_games
+        self.move_ordering = move_ordering
+        self.record_depth = record_depth
+        self.book = book
+        self.databases = []  # the attached positions databases, consulted after the book
+        self._ordering = None  # the move ordering of the current search, shared by its iterations
+        # the solver of the last completed search (None if played from the book), e.g. to display its tree
+        self.solver = None
+        self.depth_reached = 0  # the depth of the last completed search
+        self.nodes = 0  # the number of nodes visited by the last search (all its iterations)
+        self._limits: List[SearchLimits] = []  # the limits of the iterations of the current search, counting its nodes
+        # state key -> (approach, depth, result, solver, nodes) of the searches completed by `ponder`
+        self._pondered: Dict[int, Tuple[str, int, Tuple[float, State], Any, int]] = {}
+        self.collect_stats = collect_stats
+        self.stats: Optional[SearchStats] = None  # the statistics of the last search, if collected
+        self._board_size = (state_module.WIDTH, state_module.HEIGHT)
+
+    def new_game(self):
+        """
+        Notifies the engine that a new game starts, the table is cleared unless it is kept across games.
+        """
+        if not self.keep_table_across_games:
+            self.table.clear()
+        self._pondered.clear()
+
+    def attach_database(self, database):
+        """
+        Attaches a positions database, whose best moves are played without searching.
+
+        :param database: The database (`PositionDB`, or any object with a `depth` and a `lookup(state)` method).
+        """
+        self.databases.append(database)
+
+    @property
+    def searched_nodes(self) -> int:
+        """
+        The number of nodes visited so far by the current search (or by the last one once it is done), it can be read
+        from another thread while the search runs.
+        """
+        return sum(limits.nodes for limits in self._limits)
+
+    def search(self, state: State, time_budget: Optional[float] = None, node_budget: Optional[int] = None,
+               stats: Optional[SearchStats] = None, stop=None,
+               progress: Optional[Callable[[int, int, float], None]] = None) -> Tuple[float, State]:
+        """
+        Searches the best move of the computer from the given state, with the current approach and depth.
+
+        :param state: The current state of the game.
+        :type state: State
+        :param time_budget: The wall-clock budget of the search in seconds. Defaults to None (no time limit).
+        :type time_budget: float
+        :param node_budget: The maximum number of nodes to be visited. Defaults to None (no nodes limit).
+        :type node_budget: int
+        :param stats: The statistics to be filled by the search (e.g. with timing on, or a node callback). Defaults to
+                      None (a new `SearchStats` if the statistics are collected).
+        :type stats: SearchStats
+        :param stop: A flag with an `is_set` method (e.g. `threading.Event`) that stops the search once set, the best
+                     move of the last completed depth is then played. Defaults to None (no stop flag).
+        :param progress: A callback called with the depth, the best move and its value after every completed depth.
+                         Defaults to None.
+
+        :return: Tuple of the value of the best move and the state after playing it.
+        """
+        if stats is None and self.collect_stats:
+            stats = SearchStats()
+        self.stats = stats
+        if stats is not None:
+            stats.start()
+        try:
+            return self._search(state, time_budget, node_budget, stop, progress)
+        finally:
+            if stats is not None:
+                stats.stop()
+                stats.depth = self.depth_reached
+
+    def _search(self, state: State, time_budget: Optional[float], node_budget: Optional[int], stop,
+                progress: Optional[Callable[[int, int, float], None]]) -> Tuple[float, State]:
+        board_size = (state_module.WIDTH, state_module.HEIGHT)
+        if board_size != self._board_size:  # the keys of different board sizes are not comparable
+            self.table.clear()
+            self._pondered.clear()
+            self._board_size = board_size
+
+        pondered = self._pondered.pop(state_key(state), None)
+        if pondered is not None and pondered[:2] == (self.approach, self.k):
+            _, _, (value, next_state), self.solver, self.nodes = pondered
+            self.depth_reached = self.k
+            self._limits = []
+            if progress is not None:
+                progress(self.k, self.solver.best_move, value)
+            return value, next_state.copy()
+
+        for source in ([self.book] if self.book is not None else []) + self.databases:
+            entry = source.lookup(state) if source.depth >= self.k else None
+            if entry is not None:
+                move, value = entry
+                next_state = state.copy()
+                next_state.update_col(move, True)
+                self.solver = None
+                self.depth_reached = source.depth
+                self._limits = []
+                self.nodes = 0
+                if progress is not None:
+                    progress(source.depth, move, value)
+                return value, next_state
+
+        self._ordering = MoveOrderer(state_module.WIDTH) if self.move_ordering else None
+        limits = SearchLimits(time_budget, node_budget, stop)  # with no budgets, it only counts the nodes
+        if time_budget is None and node_budget is None and stop is None:
+            self._limits = [limits]
+            result = self._search_depth(state, self.k, limits, None, None)
+            self.depth_reached = self.k
+            self.nodes = limits.nodes
+            if progress is not None:
+                progress(self.k, self.solver.best_move, result[0])
+            return result
+        return self._iterative_deepening(state, limits, progress)
+
+    def _iterative_deepening(self, state: State, limits: SearchLimits,
+                             progress: Optional[Callable[[int, int, float], None]]) -> Tuple[float, State]:
+        """
+        Searches depths 1, 2, ... k until the limits are exhausted. The depth 1 search is never limited, so that there
+        is always a move to be played.
+        """
+        first_limits = SearchLimits()
+        self._limits = [first_limits, limits]
+        result = self._search_depth(state, 1, first_limits, None, None)
+        self.depth_reached = 1
+        if progress is not None:
+            progress(1, self.solver.best_move, result[0])
+        for depth in range(2, self.k + 1):
+            if limits.expired():
+                break
+            try:
+                result = self._search_depth(state, depth, limits, self.solver.best_move, result[0])
+            except SearchTimeout:
+                break
+            self.depth_reached = depth
+            if progress is not None:
+                progress(depth, self.solver.best_move, result[0])
+        self.nodes = first_limits.nodes + limits.nodes
+        return result
+
+    def _search_depth(self, state: State, depth: int, limits: Optional[SearchLimits],
+                      first_move: Optional[int], guess: Optional[float]) -> Tuple[float, State]:
+        solver_cls, run_method, takes_ordering, takes_guess = ALGORITHMS[self.approach]
+        if takes_ordering:
+            solver = solver_cls(depth, self.table, limits, self._ordering, record_depth=self.record_depth,
+                                stats=self.stats)
+        else:
+            solver = solver_cls(depth, self.table, limits, record_depth=self.record_depth, stats=self.stats)
+        if takes_guess:
+            result = getattr(solver, run_method)(state, first_move, guess)
+        else:
+            result = getattr(solver, run_method)(state, first_move)
+        self.solver = solver
+        return result
+
+    def ponder(self, state: State, stop=None) -> int:
+        """
+        Searches the positions after every human reply from the given state (of the human turn), the predicted reply
+        (the best move stored in the table) first, then from the center to the sides, until they are all searched or
+        the stop flag is set. The completed searches are kept, so that the next search of one of these positions (with
+        the same approach and depth) returns at once, the other ones still start with the table they filled.
+
+        :param state: The current state of the game, after the computer move.
+        :type state: State
+        :param stop: A flag with an `is_set` method (e.g. `threading.Event`) that stops the pondering once set. Defaults
+                     to None (all the replies are searched).
+        :return: The number of replies whose search was completed.
+        :rtype: int
+        """
+        self._pondered.clear()
+        # the replies are searched by a copy of the engine, sharing its table and pondered results, so that the fields
+        # of the last search (solver, nodes, depth reached, stats) are left alone while the caller reads them
+        searcher = copy.copy(self)
+        replies = center_out_order(state_module.WIDTH)
+        key, mirrored = canonical_key(state)
+        entry = self.table.get(key)
+        predicted = mirror_move(entry[3], mirrored, state_module.WIDTH) if entry is not None else None
+        if predicted is not None:
+            replies.remove(predicted)
+            replies.insert(0, predicted)
+        legal_moves = state.legal_moves()
+        for col in replies:
+            if stop is not None and stop.is_set():
+                break
+            if col not in legal_moves:
+                continue
+            reply = state.copy()
+            reply.update_col(col, True)
+            if not reply.legal_moves():  # the board is full
+                continue
+            result = searcher.search(reply, stop=stop)
+            if searcher.solver is not None and searcher.depth_reached >= searcher.k:  # searched, not stopped early
+                self._pondered[state_key(reply)] = (searcher.approach, searcher.k, result, searcher.solver,
+                                                    searcher.nodes)
+        return len(self._pondered)
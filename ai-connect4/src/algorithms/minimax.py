@@ -1,87 +1,144 @@
 import random
 from typing import *
 from src.state.state import State
-from src.tree.tree_representation import Tree
-from src.utilities.get_heuristic import calculate_heuristic
+from src.state.bitboard_state import BitboardState
+from src.tree.tree_representation import Tree, RECORD_OFF
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.search_stats import SearchStats
+from src.algorithms.transposition_table import TranspositionTable, canonical_key, mirror_move, EXACT
+from src.utilities.incremental_heuristic import IncrementalHeuristic
 
 """
 Connect 4 Minimax Algorithm
 
 This code defines an implementation of the Minimax algorithm for the Connect 4 game.
 
+The search is done in place on a single `BitboardState` copy of the initial state, by playing a move before exploring
+a child and taking it back after (make / unmake), instead of allocating a successor state for every explored child.
+The leaves are evaluated by an `IncrementalHeuristic` that is updated along with every played / taken back move.
+
 """
 
 
 class Minimax:
-    def __init__(self, k: int):
+    def __init__(self, k: int, table: Optional[TranspositionTable] = None, limits: Optional[SearchLimits] = None,
+                 record_depth: float = RECORD_OFF, stats: Optional[SearchStats] = None):
         self.k = k
-        self.explored = {}  # dictionary
-        self.tree = None
-
-    def run_minimax(self, initial_state: State) -> Tuple[float, State]:
+        self.limits = limits
+        self.best_move = None
+        self.explored = table if table is not None else TranspositionTable()
+        self.record_depth = record_depth  # the depth down to which the tree is recorded (see RECORD_*)
+        self.tree = None  # None when the tree is not recorded
+        self.evaluator = None
+        self.stats = stats  # None to count nothing
+
+    def run_minimax(self, initial_state: State, first_move: Optional[int] = None) -> Tuple[float, State]:
         """
 
         Get the maximum value the computer can get from all its children
 
         :param initial_state: the initial state from which the algorithm runs
         :type initial_state: State
+        :param first_move: a column to be searched first (e.g. the best move of a previous shallower search)
+        :type first_move: int
 
         :return: Tuple of the max value the computer can get and the state of next step
+        :raises SearchTimeout: if the search limits are exhausted before the search completes
         """
-        self.tree = Tree((initial_state.get_value(), 0))
-        self.explored = {}
-        successors = initial_state.get_successors()
+        root_value = initial_state.get_value()
+        self.tree = Tree((root_value, 0)) if self.record_depth else None
+        self.explored.new_search()
+        state = BitboardState(initial_state.is_computer_turn(), root_value)
+        self.evaluator = IncrementalHeuristic(state)
+        if self.stats is not None:
+            state, self.evaluator = self.stats.timed(state, self.evaluator)
+        is_computer = state.is_computer_turn()
         max_value = - float('inf')
-        next_step = initial_state
-        for successor in successors:
-            current_value = self.value(successor, 1)
-            self.tree.add_child_to_node(initial_state.get_value(), (successor.get_value(), current_value))
+        next_col = None
+        moves = state.legal_moves()
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+        for col in moves:
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            current_value = self.value(state, 1)
+            if self.tree is not None:
+                self.tree.add_child_to_node(root_value, (state.get_value(), current_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
             if current_value > max_value:
-                next_step = successor
+                next_col = col
                 max_value = current_value
 
-        self.tree.set_root((initial_state.get_value(), max_value))
+        if self.tree is not None:
+            self.tree.set_root((root_value, max_value))
+        self.best_move = next_col
+        next_step = initial_state
+        if next_col is not None:
+            next_step = initial_state.copy()
+            next_step.update_col(next_col, True)
         return max_value, next_step
 
-    def value(self, state: State, level: int):
+    def search_child(self, child: BitboardState, alpha: float = - float('inf')) -> float:
+        """
+        Calculate the value of a child of the root on its own (e.g. by a parallel search worker)
+
+        :param child: the state after the root move, it is restored to its initial value before returning
+        :type child: BitboardState
+        :param alpha: the value the computer is already guaranteed at the root (not used, nothing is pruned)
+        :type alpha: float
+        :return: the value of the child
+        """
+        self.tree = Tree((child.get_value(), 0)) if self.record_depth else None
+        self.evaluator = IncrementalHeuristic(child)
+        return self.value(child, 1)
+
+    def value(self, state: BitboardState, level: int):
         """
         Calculate the value of state
 
-        NOTE: there is explored map where it checks if this value of state has been explored before it returns its value
-              otherwise, the value is computed and then stored in explored map to save time
+        NOTE: there is explored transposition table where it checks if this state has been explored before (at least
+              as deep as needed) it returns its value otherwise, the value is computed and then stored in the explored
+              table to save time (a state and its mirror share the same entry, see `canonical_key`)
 
         :param state: Current game state.
-        :type state: State
+        :type state: BitboardState
         :param level: Current level in the search tree.
         :type level: int
 
         :return: Evaluated value of the current state.
         :rtype: int
         """
-
-        if state.get_value() in self.explored:
-            return self.explored[state.get_value()]
-
-        evaluated_value = 0
-
-        if level == self.k or len(state.get_successors()) == 0:  # terminal state
-            evaluated_value = calculate_heuristic(state.to_2d(), 1, 2)
-            self.explored[state.get_value()] = evaluated_value
+        if self.limits is not None:
+            self.limits.count_node()
+        if self.stats is not None:
+            self.stats.enter_node(state, level)
+
+        key, _ = canonical_key(state)
+        cached_value, _ = self.explored.probe(key, self.k - level, -float('inf'), float('inf'))
+        if self.stats is not None:
+            self.stats.count_probe(cached_value is not None)
+        if cached_value is not None:
+            return cached_value
+
+        if level == self.k or state.is_full():  # terminal state
+            evaluated_value = self.evaluator.get_value()
+            if self.stats is not None:
+                self.stats.leaves += 1
+            self.explored.store(key, self.k - level, evaluated_value, EXACT)
             return evaluated_value
         if state.is_computer_turn():  # max
-            evaluated_value = self.max_value(state, level)
+            return self.max_value(state, level)
         else:  # min
-            evaluated_value = self.min_value(state, level)
+            return self.min_value(state, level)
 
-        self.explored[state.get_value()] = evaluated_value
-        return evaluated_value
-
-    def max_value(self, state: State, level: int):
+    def max_value(self, state: BitboardState, level: int):
         """
         Function for the max player (computer).
 
-        :param state: Current game state.
-        :type state: State
+        :param state: Current game state, it is restored to its initial value before returning.
+        :type state: BitboardState
         :param level: Current level in the search tree.
         :type level: int
         :return: Maximum evaluated value for the current state.
@@ -89,38 +146,62 @@ class Minimax:
         """
 
         v = -float('inf')
-        successors = state.get_successors()
-
-        for successor in successors:
-            child_value = self.value(successor, level + 1)
-
-            self.tree.add_child_to_node(state.get_value(), (successor.get_value(), child_value))
-
-            v = max(v, child_value)
-
+        best_col = None
+        parent = state.get_value()
+        record = level < self.record_depth
+        is_computer = state.is_computer_turn()
+
+        for col in state.legal_moves():
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            child_value = self.value(state, level + 1)
+
+            if record:
+                self.tree.add_child_to_node(parent, (state.get_value(), child_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
+
+            if child_value > v:
+                v = child_value
+                best_col = col
+
+        key, mirrored = canonical_key(state)
+        self.explored.store(key, self.k - level, v, EXACT, mirror_move(best_col, mirrored, state.geometry.width))
         return v
 
-    def min_value(self, state: State, level: int):
+    def min_value(self, state: BitboardState, level: int):
         """
         Function for the min player (player).
 
-        :param state: Current game state.
-        :type state: State
+        :param state: Current game state, it is restored to its initial value before returning.
+        :type state: BitboardState
         :param level: Current level in the search tree.
         :type level: int
         :return: Minimum evaluated value for the current state.
         :rtype: int
         """
         v = float('inf')
-        successors = state.get_successors()
-
-        for successor in successors:
-            child_value = self.value(successor, level + 1)
-
-            self.tree.add_child_to_node(state.get_value(), (successor.get_value(), child_value))
-
-            v = min(v, child_value)
-
+        best_col = None
+        parent = state.get_value()
+        record = level < self.record_depth
+        is_computer = state.is_computer_turn()
+
+        for col in state.legal_moves():
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            child_value = self.value(state, level + 1)
+
+            if record:
+                self.tree.add_child_to_node(parent, (state.get_value(), child_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
+
+            if child_value < v:
+                v = child_value
+                best_col = col
+
+        key, mirrored = canonical_key(state)
+        self.explored.store(key, self.k - level, v, EXACT, mirror_move(best_col, mirrored, state.geometry.width))
         return v
 
 # '''
@@ -1,51 +1,102 @@
 from typing import *
 from src.state.state import State
-from src.tree.tree_representation import Tree
-from src.utilities.get_heuristic import calculate_heuristic
+from src.state.bitboard_state import BitboardState
+from src.tree.tree_representation import Tree, RECORD_OFF
+from src.algorithms.move_ordering import MoveOrderer, ordered_moves
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.search_stats import SearchStats
+from src.algorithms.transposition_table import TranspositionTable, canonical_key, mirror_move, EXACT, LOWER, UPPER
+from src.utilities.incremental_heuristic import IncrementalHeuristic
 
 
 class MinimaxWithAlphaBeta:
 
-    def __init__(self, k: int):
+    def __init__(self, k: int, table: Optional[TranspositionTable] = None, limits: Optional[SearchLimits] = None,
+                 ordering: Optional[MoveOrderer] = None, record_depth: float = RECORD_OFF,
+                 stats: Optional[SearchStats] = None):
         self.k = k
-        self.explored = {}
-        self.tree = None
-
-    def run_minimax_with_alpha_beta(self, initial_state: State) -> Tuple[float, State]:
+        self.limits = limits
+        self.ordering = ordering  # None to search the columns in order (after the table move)
+        self.best_move = None
+        self.explored = table if table is not None else TranspositionTable()
+        self.record_depth = record_depth  # the depth down to which the tree is recorded (see RECORD_*)
+        self.tree = None  # None when the tree is not recorded
+        self.evaluator = None
+        self.stats = stats  # None to count nothing
+
+    def run_minimax_with_alpha_beta(self, initial_state: State, first_move: Optional[int] = None) -> Tuple[float, State]:
         """
 
         Get the maximum value the computer can get from all its children
 
+        The search is done in place on a single `BitboardState` copy of the initial state (make / unmake moves), and
+        the leaves are evaluated by an `IncrementalHeuristic` updated along with every move.
+
         :param initial_state: the initial state from which the algorithm runs
         :type initial_state: State
+        :param first_move: a column to be searched first (e.g. the best move of a previous shallower search)
+        :type first_move: int
 
         :return: Tuple of the max value the computer can get and the state of next step
+        :raises SearchTimeout: if the search limits are exhausted before the search completes
         """
-        self.tree = Tree((initial_state.get_value(), 0))
-        self.explored = {}
-        successors = initial_state.get_successors()
+        root_value = initial_state.get_value()
+        self.tree = Tree((root_value, 0)) if self.record_depth else None
+        self.explored.new_search()
+        state = BitboardState(initial_state.is_computer_turn(), root_value)
+        self.evaluator = IncrementalHeuristic(state)
+        if self.stats is not None:
+            state, self.evaluator = self.stats.timed(state, self.evaluator)
+        is_computer = state.is_computer_turn()
         alpha = - float('inf')
         beta = float('inf')
-        next_step = initial_state
-        for successor in successors:
-            current_value = self.value(successor, 1, alpha, beta)
-            self.tree.add_child_to_node(initial_state.get_value(), (successor.get_value(), current_value))
+        next_col = None
+        moves = ordered_moves(state, self.ordering, 0, first_move)
+        for col in moves:
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            current_value = self.value(state, 1, alpha, beta)
+            if self.tree is not None:
+                self.tree.add_child_to_node(root_value, (state.get_value(), current_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
             if current_value > alpha:
-                next_step = successor
+                next_col = col
                 alpha = current_value
 
-        self.tree.set_root((initial_state.get_value(), alpha))
+        if self.tree is not None:
+            self.tree.set_root((root_value, alpha))
+        self.best_move = next_col
+        next_step = initial_state
+        if next_col is not None:
+            next_step = initial_state.copy()
+            next_step.update_col(next_col, True)
         return alpha, next_step
 
-    def value(self, state: State, level: int, alpha: float, beta: float) -> float:
+    def search_child(self, child: BitboardState, alpha: float = - float('inf')) -> float:
+        """
+        Calculate the value of a child of the root on its own (e.g. by a parallel search worker)
+
+        :param child: the state after the root move, it is restored to its initial value before returning
+        :type child: BitboardState
+        :param alpha: the value the computer is already guaranteed at the root
+        :type alpha: float
+        :return: the value of the child, which is only an upper bound of it if it does not exceed alpha
+        """
+        self.tree = Tree((child.get_value(), 0)) if self.record_depth else None
+        self.evaluator = IncrementalHeuristic(child)
+        return self.value(child, 1, alpha, float('inf'))
+
+    def value(self, state: BitboardState, level: int, alpha: float, beta: float) -> float:
         """
         Calculate the value of state
 
-        NOTE: there is explored map where it checks if this value of state has been seen before it returns its value
-              otherwise, the value is computed and then stored in explored map
+        NOTE: there is explored transposition table where it checks if this state has been seen before, and its
+              stored value (or bound) can be used for the remaining depth and the current window, it returns its value
+              otherwise, the value is computed and then stored in the explored table along with its bound flag
 
         :param state: the current state
-        :type state: State
+        :type state: BitboardState
         :param level: the level or the depth of this state
         :type level: int
         :param alpha: the maximum value, this state has seen
@@ -54,58 +105,115 @@ class MinimaxWithAlphaBeta:
         :type beta: float
         :return: the value of this state
         """
-        if state.get_value() in self.explored:
-            return self.explored[state.get_value()]
-
-        evaluated_value = 0
-        if level == self.k or len(state.get_successors()) == 0:  # terminal state
-            evaluated_value = calculate_heuristic(state.to_2d(), 1, 2)
-            self.explored[state.get_value()] = evaluated_value
+        if self.limits is not None:
+            self.limits.count_node()
+        if self.stats is not None:
+            self.stats.enter_node(state, level)
+
+        key, mirrored = canonical_key(state)
+        cached_value, table_move = self.explored.probe(key, self.k - level, alpha, beta)
+        if self.stats is not None:
+            self.stats.count_probe(cached_value is not None)
+        if cached_value is not None:
+            return cached_value
+        table_move = mirror_move(table_move, mirrored, state.geometry.width)
+
+        if level == self.k or state.is_full():  # terminal state
+            evaluated_value = self.evaluator.get_value()
+            if self.stats is not None:
+                self.stats.leaves += 1
+            self.explored.store(key, self.k - level, evaluated_value, EXACT)
             return evaluated_value
 
         if state.is_computer_turn():
-            evaluated_value = self.max_value(state, level, alpha, beta)
+            return self.max_value(state, level, alpha, beta, table_move)
         else:
-            evaluated_value = self.min_value(state, level, alpha, beta)
-
-        self.explored[state.get_value()] = evaluated_value
-        return evaluated_value
+            return self.min_value(state, level, alpha, beta, table_move)
 
-    def min_value(self, state: State, level: int, alpha: float, beta: float) -> float:
+    def min_value(self, state: BitboardState, level: int, alpha: float, beta: float,
+                  table_move: Optional[int] = None) -> float:
         v = float('inf')
-        successors = state.get_successors()
-
-        for successor in successors:
-            child_value = self.value(successor, level + 1, alpha, beta)
-
-            self.tree.add_child_to_node(state.get_value(), (successor.get_value(), child_value))
-
-            v = min(v, child_value)
+        best_col = None
+        alpha_orig, beta_orig = alpha, beta
+        parent = state.get_value()
+        record = level < self.record_depth
+        is_computer = state.is_computer_turn()
+
+        for col in ordered_moves(state, self.ordering, level, table_move):
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            child_value = self.value(state, level + 1, alpha, beta)
+
+            if record:
+                self.tree.add_child_to_node(parent, (state.get_value(), child_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
+
+            if child_value < v:
+                v = child_value
+                best_col = col
 
             if v <= alpha:
-                return v
+                if self.ordering is not None:
+                    self.ordering.record_cutoff(col, level, self.k - level, is_computer)
+                if self.stats is not None:
+                    self.stats.record_cutoff(level)
+                break
 
             beta = min(beta, v)
+
+        self._store(state, level, v, alpha_orig, beta_orig, best_col)
         return v
 
-    def max_value(self, state: State, level: int, alpha: float, beta: float) -> float:
+    def max_value(self, state: BitboardState, level: int, alpha: float, beta: float,
+                  table_move: Optional[int] = None) -> float:
         v = - float('inf')
-        successors = state.get_successors()
-
-        for successor in successors:
-            child_value = self.value(successor, level + 1, alpha, beta)
-
-            self.tree.add_child_to_node(state.get_value(), (successor.get_value(), child_value))
-
-            v = max(v, child_value)
+        best_col = None
+        alpha_orig, beta_orig = alpha, beta
+        parent = state.get_value()
+        record = level < self.record_depth
+        is_computer = state.is_computer_turn()
+
+        for col in ordered_moves(state, self.ordering, level, table_move):
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            child_value = self.value(state, level + 1, alpha, beta)
+
+            if record:
+                self.tree.add_child_to_node(parent, (state.get_value(), child_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
+
+            if child_value > v:
+                v = child_value
+                best_col = col
 
             if v >= beta:
-                return v
+                if self.ordering is not None:
+                    self.ordering.record_cutoff(col, level, self.k - level, is_computer)
+                if self.stats is not None:
+                    self.stats.record_cutoff(level)
+                break
 
             alpha = max(alpha, v)
 
+        self._store(state, level, v, alpha_orig, beta_orig, best_col)
         return v
 
+    def _store(self, state: BitboardState, level: int, v: float, alpha: float, beta: float, best_col: int):
+        """
+        Stores the value of a searched state in the explored table, flagged as an upper bound if it did not reach
+        alpha, a lower bound if it was cut off by beta, and as an exact value otherwise.
+        """
+        if v <= alpha:
+            flag = UPPER
+        elif v >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        key, mirrored = canonical_key(state)
+        self.explored.store(key, self.k - level, v, flag, mirror_move(best_col, mirrored, state.geometry.width))
+
 
 # k = 13
 # minimax_with = MinimaxWithAlphaBeta(k)
@@ -0,0 +1,167 @@
+from typing import *
+
+"""
+Connect 4 Move Ordering
+
+This code defines the order in which the alpha-beta search explores the moves of a state. Alpha-beta prunes the most
+when the best move is searched first, and searching the columns in plain 0 .. WIDTH - 1 order is close to its worst
+case for Connect 4, where the center columns are usually the strongest.
+
+The moves are ordered by (each heuristic can be turned off):
+    - The transposition table move: the best move found by a previous search of the same state.
+    - The threat moves (off by default): the moves completing a four in a row, then the ones stopping a four in a
+      row of the opponent (see `BitboardState.threat_moves`). As a four does not end the game, they are not forced
+      moves, and the heuristic already favors them, so they save few nodes for the time their bitmasks take.
+    - The killer moves: the last moves that caused a cutoff at the same ply (in sibling states).
+    - The history table: how many (and how deep) cutoffs each column caused for the player to move.
+    - The static center-out order: 3 2 4 1 5 0 6 for the standard board, used to break the ties.
+
+"""
+
+KILLERS_PER_PLY = 2
+
+
+def center_out_order(width: int) -> List[int]:
+    """
+    Returns the columns sorted from the center to the sides.
+
+    :param width: Board width.
+    :type width: int
+    :return: The columns indices, e.g. [3, 2, 4, 1, 5, 0, 6] for a 7 columns board.
+    :rtype: List[int]
+    """
+    return sorted(range(width), key=lambda col: (abs(2 * col - (width - 1)), col))
+
+
+class MoveOrderer:
+    def __init__(self, width: int, center_first: bool = True, use_table_move: bool = True, use_killers: bool = True,
+                 use_history: bool = True, use_threats: bool = False):
+        """
+        Initializes the ordering of a search.
+
+        :param width: Board width.
+        :type width: int
+        :param center_first: Flag to use the center-out static order instead of the columns order.
+        :type center_first: bool
+        :param use_table_move: Flag to search the transposition table move first.
+        :type use_table_move: bool
+        :param use_killers: Flag to search the killer moves early.
+        :type use_killers: bool
+        :param use_history: Flag to sort the remaining moves by the history table.
+        :type use_history: bool
+        :param use_threats: Flag to search the threat moves right after the table move. Defaults to False.
+        :type use_threats: bool
+        """
+        self.use_table_move = use_table_move
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.use_threats = use_threats
+        static_order = center_out_order(width) if center_first else list(range(width))
+        self.static_rank = [0] * width
+        for rank, col in enumerate(static_order):
+            self.static_rank[col] = rank
+        self.killers: List[List[int]] = []
+        # player (0 for the human, 1 for the computer) -> column -> history score
+        self.history = [[0] * width, [0] * width]
+
+    def order(self, moves: List[int], ply: int, is_computer: bool, table_move: Optional[int] = None,
+              threat_moves: Sequence[int] = ()) -> List[int]:
+        """
+        Sorts the legal moves of a state, best candidates first.
+
+        :param moves: The legal moves (columns) of the state.
+        :type moves: List[int]
+        :param ply: The level of the state in the search tree.
+        :type ply: int
+        :param is_computer: True if it is the computer turn.
+        :type is_computer: bool
+        :param table_move: The best move stored in the transposition table for this state, if any.
+        :type table_move: int
+        :param threat_moves: The threat moves of the state, best first.
+        :type threat_moves: Sequence[int]
+        :return: The sorted moves.
+        :rtype: List[int]
+        """
+        static_rank = self.static_rank
+        if self.use_history:
+            history = self.history[is_computer]
+            ordered = sorted(moves, key=lambda col: (-history[col], static_rank[col]))
+        else:
+            ordered = sorted(moves, key=static_rank.__getitem__)
+
+        if self.use_killers and ply < len(self.killers):
+            for killer in reversed(self.killers[ply]):
+                if killer in ordered:
+                    ordered.remove(killer)
+                    ordered.insert(0, killer)
+        if self.use_threats:
+            for threat in reversed(threat_moves):
+                ordered.remove(threat)
+                ordered.insert(0, threat)
+        if self.use_table_move and table_move is not None and table_move in ordered:
+            ordered.remove(table_move)
+            ordered.insert(0, table_move)
+        return ordered
+
+    def order_state(self, state, ply: int, table_move: Optional[int] = None) -> List[int]:
+        """
+        Sorts the legal moves of a searched state, best candidates first (see `order`).
+
+        :param state: The searched state (`BitboardState`).
+        :param ply: The level of the state in the search tree.
+        :type ply: int
+        :param table_move: The best move stored in the transposition table for this state, if any.
+        :type table_move: int
+        :return: The sorted moves.
+        :rtype: List[int]
+        """
+        threat_moves = state.threat_moves() if self.use_threats else ()
+        return self.order(state.legal_moves(), ply, state.is_computer_turn(), table_move, threat_moves)
+
+    def record_cutoff(self, col: int, ply: int, depth: int, is_computer: bool):
+        """
+        Records a move that caused a cutoff.
+
+        :param col: The move (column) that caused the cutoff.
+        :type col: int
+        :param ply: The level of the state in the search tree.
+        :type ply: int
+        :param depth: The remaining depth that was searched below the state.
+        :type depth: int
+        :param is_computer: True if the move was the computer one.
+        :type is_computer: bool
+        """
+        if self.use_killers:
+            while len(self.killers) <= ply:
+                self.killers.append([])
+            killers = self.killers[ply]
+            if col in killers:
+                killers.remove(col)
+            killers.insert(0, col)
+            del killers[KILLERS_PER_PLY:]
+        if self.use_history:
+            self.history[is_computer][col] += depth * depth
+
+
+def ordered_moves(state, ordering: Optional[MoveOrderer], ply: int, table_move: Optional[int] = None) -> List[int]:
+    """
+    Returns the legal moves of a searched state in the order they are to be searched: sorted by the move ordering if
+    any, in the columns order otherwise, the table move (or the root first move) being searched first in both cases.
+
+    :param state: The searched state (`BitboardState`).
+    :param ordering: The move ordering of the search, None for no ordering.
+    :type ordering: MoveOrderer
+    :param ply: The level of the state in the search tree.
+    :type ply: int
+    :param table_move: The best move stored in the transposition table for this state, if any.
+    :type table_move: int
+    :return: The moves.
+    :rtype: List[int]
+    """
+    if ordering is not None:
+        return ordering.order_state(state, ply, table_move)
+    moves = state.legal_moves()
+    if table_move in moves:
+        moves.remove(table_move)
+        moves.insert(0, table_move)
+    return moves
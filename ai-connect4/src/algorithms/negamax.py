@@ -0,0 +1,224 @@
+from typing import *
+from src.state.state import State
+from src.state.bitboard_state import BitboardState
+from src.tree.tree_representation import Tree, RECORD_OFF
+from src.algorithms.move_ordering import MoveOrderer, ordered_moves
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.search_stats import SearchStats
+from src.algorithms.transposition_table import TranspositionTable, canonical_key, mirror_move, EXACT, LOWER, UPPER
+from src.utilities.incremental_heuristic import IncrementalHeuristic
+
+"""
+Connect 4 Negamax with Principal Variation Search
+
+This code defines a negamax implementation of the alpha-beta search, where every state is scored from the point of
+view of the player to move (color = 1 for the computer, -1 for the human), so a single function handles both players.
+
+On top of it, the principal variation search (PVS) assumes that the first ordered move is the best one: it is searched
+with the full window, while the other moves are only searched with a null window (alpha, alpha + 1) proving they are
+not better, and are re-searched with the full window only when that proof fails. The heuristic values are integers,
+so the null window is enough to tell whether a move is better.
+
+Aspiration windows: when the value of a previous (shallower) search is given, the root is first searched with a narrow
+window around it, and only re-searched with the full window if the value falls outside of it.
+
+The values stored in the transposition table are always from the computer point of view, so that the table can be
+shared with the minimax algorithms.
+
+"""
+
+ASPIRATION_WINDOW = 50
+
+
+class NegamaxPVS:
+
+    def __init__(self, k: int, table: Optional[TranspositionTable] = None, limits: Optional[SearchLimits] = None,
+                 ordering: Optional[MoveOrderer] = None, record_depth: float = RECORD_OFF,
+                 stats: Optional[SearchStats] = None):
+        self.k = k
+        self.limits = limits
+        self.ordering = ordering  # None to search the columns in order (after the table move)
+        self.best_move = None
+        self.explored = table if table is not None else TranspositionTable()
+        self.record_depth = record_depth  # the depth down to which the tree is recorded (see RECORD_*)
+        self.tree = None  # None when the tree is not recorded
+        self.evaluator = None
+        self.stats = stats  # None to count nothing
+
+    def run_negamax(self, initial_state: State, first_move: Optional[int] = None,
+                    guess: Optional[float] = None) -> Tuple[float, State]:
+        """
+
+        Get the best value the player to move can get from all its children
+
+        :param initial_state: the initial state from which the algorithm runs
+        :type initial_state: State
+        :param first_move: a column to be searched first (e.g. the best move of a previous shallower search)
+        :type first_move: int
+        :param guess: the expected value (e.g. the value of a previous shallower search), to search the root with an
+                      aspiration window around it
+        :type guess: float
+
+        :return: Tuple of the value (from the computer point of view) and the state of next step
+        :raises SearchTimeout: if the search limits are exhausted before the search completes
+        """
+        root_value = initial_state.get_value()
+        self.tree = Tree((root_value, 0)) if self.record_depth else None
+        self.explored.new_search()
+        state = BitboardState(initial_state.is_computer_turn(), root_value)
+        self.evaluator = IncrementalHeuristic(state)
+        if self.stats is not None:
+            state, self.evaluator = self.stats.timed(state, self.evaluator)
+        color = 1 if state.is_computer_turn() else -1
+
+        best_value, next_col = - float('inf'), None
+        if guess is not None:
+            alpha, beta = color * guess - ASPIRATION_WINDOW, color * guess + ASPIRATION_WINDOW
+            best_value, next_col = self._search_root(state, alpha, beta, color, first_move)
+            if best_value <= alpha or best_value >= beta:  # outside of the window, the value is only a bound
+                self.tree = Tree((root_value, 0)) if self.record_depth else None
+                guess = None
+        if guess is None:
+            best_value, next_col = self._search_root(state, - float('inf'), float('inf'), color, first_move)
+
+        if self.tree is not None:
+            self.tree.set_root((root_value, color * best_value))
+        self.best_move = next_col
+        next_step = initial_state
+        if next_col is not None:
+            next_step = initial_state.copy()
+            next_step.update_col(next_col, True)
+        return color * best_value, next_step
+
+    def search_child(self, child: BitboardState, alpha: float = - float('inf')) -> float:
+        """
+        Calculate the value of a child of the root on its own (e.g. by a parallel search worker)
+
+        :param child: the state after the root move, it is restored to its initial value before returning
+        :type child: BitboardState
+        :param alpha: the value the computer is already guaranteed at the root
+        :type alpha: float
+        :return: the value of the child (from the computer point of view), which is only an upper bound of it if it
+                 does not exceed alpha
+        """
+        self.tree = Tree((child.get_value(), 0)) if self.record_depth else None
+        self.evaluator = IncrementalHeuristic(child)
+        if child.is_computer_turn():
+            return self.negamax(child, 1, alpha, float('inf'), 1)
+        return - self.negamax(child, 1, - float('inf'), - alpha, -1)
+
+    def negamax(self, state: BitboardState, level: int, alpha: float, beta: float, color: int) -> float:
+        """
+        Calculate the value of state from the point of view of the player to move
+
+        NOTE: there is explored transposition table where it checks if this state has been seen before, and its
+              stored value (or bound) can be used for the remaining depth and the current window, it returns its value
+              otherwise, the value is computed and then stored in the explored table along with its bound flag
+
+        :param state: the current state, it is restored to its initial value before returning
+        :type state: BitboardState
+        :param level: the level or the depth of this state
+        :type level: int
+        :param alpha: the value the player to move is already guaranteed
+        :type alpha: float
+        :param beta: the value the opponent is already guaranteed (negated)
+        :type beta: float
+        :param color: 1 if it is the computer turn, -1 otherwise
+        :type color: int
+        :return: the value of this state for the player to move
+        """
+        if self.limits is not None:
+            self.limits.count_node()
+        if self.stats is not None:
+            self.stats.enter_node(state, level)
+
+        key, mirrored = canonical_key(state)
+        cached_value, table_move = self._probe(key, self.k - level, alpha, beta, color)
+        if self.stats is not None:
+            self.stats.count_probe(cached_value is not None)
+        if cached_value is not None:
+            return cached_value
+        width = state.geometry.width
+        table_move = mirror_move(table_move, mirrored, width)
+
+        if level == self.k or state.is_full():  # terminal state
+            evaluated_value = self.evaluator.get_value()
+            if self.stats is not None:
+                self.stats.leaves += 1
+            self.explored.store(key, self.k - level, evaluated_value, EXACT)
+            return color * evaluated_value
+
+        v, best_col = self._search_children(state, level, alpha, beta, color, table_move)
+        self._store(key, level, v, alpha, beta, color, mirror_move(best_col, mirrored, width))
+        return v
+
+    def _search_root(self, state: BitboardState, alpha: float, beta: float, color: int,
+                     first_move: Optional[int]) -> Tuple[float, Optional[int]]:
+        return self._search_children(state, 0, alpha, beta, color, first_move)
+
+    def _search_children(self, state: BitboardState, level: int, alpha: float, beta: float, color: int,
+                         table_move: Optional[int]) -> Tuple[float, Optional[int]]:
+        """
+        Searches the children of a state with the principal variation search.
+
+        :return: Tuple of the best value for the player to move and the best move.
+        """
+        v = - float('inf')
+        best_col = None
+        parent = state.get_value()
+        record = level < self.record_depth
+        is_computer = color == 1
+        first = True
+
+        for col in ordered_moves(state, self.ordering, level, table_move):
+            row = state.play(col)
+            self.evaluator.add(row, col, is_computer)
+            if first:
+                child_value = - self.negamax(state, level + 1, - beta, - alpha, - color)
+            else:
+                child_value = - self.negamax(state, level + 1, - alpha - 1, - alpha, - color)
+                if alpha < child_value < beta:  # the move may be better than the first one, search it fully
+                    child_value = - self.negamax(state, level + 1, - beta, - child_value, - color)
+
+            if record:
+                self.tree.add_child_to_node(parent, (state.get_value(), color * child_value))
+            state.undo(col)
+            self.evaluator.remove(row, col, is_computer)
+            first = False
+
+            if child_value > v:
+                v = child_value
+                best_col = col
+
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                if self.ordering is not None:
+                    self.ordering.record_cutoff(col, level, self.k - level, is_computer)
+                if self.stats is not None:
+                    self.stats.record_cutoff(level)
+                break
+
+        return v, best_col
+
+    def _probe(self, key: int, depth: int, alpha: float, beta: float,
+               color: int) -> Tuple[Optional[float], Optional[int]]:
+        """
+        Looks up the explored table, converting the window and the value from / to the computer point of view.
+        """
+        if color == 1:
+            return self.explored.probe(key, depth, alpha, beta)
+        cached_value, table_move = self.explored.probe(key, depth, - beta, - alpha)
+        return (None if cached_value is None else - cached_value), table_move
+
+    def _store(self, key: int, level: int, v: float, alpha: float, beta: float, color: int, best_col: int):
+        """
+        Stores the value of a searched state in the explored table, from the computer point of view, flagged as an
+        upper bound if it did not reach alpha, a lower bound if it was cut off by beta, and as an exact value otherwise.
+        """
+        if v <= alpha:
+            flag = UPPER if color == 1 else LOWER
+        elif v >= beta:
+            flag = LOWER if color == 1 else UPPER
+        else:
+            flag = EXACT
+        self.explored.store(key, self.k - level, color * v, flag, best_col)
@@ -0,0 +1,215 @@
+import struct
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.geometry import get_geometry
+from src.algorithms.engine import SearchEngine, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.solver import Solver
+from src.algorithms.position_db import PositionDBBuilder
+
+"""
+Connect 4 Opening Book
+
+This code defines an opening book: the best moves of the computer for every position of the first plies of the game,
+precomputed once (by a search engine, or by the perfect play solver for the small boards), so that the engine plays
+them without searching.
+
+The positions are keyed by their `State.get_value()`, folded by symmetry: a position and its left to right mirror have
+mirrored best moves and the same value, so only the smallest of both keys is stored.
+
+The book is saved in a compact binary file: the `BOOK_MAGIC` bytes, a header (width, height, plies, depth), then one
+fixed-size record per position sorted by key: the key (little endian, as many bytes as the packed state needs), the
+best move (uint8) and the value (double).
+
+"""
+
+BOOK_MAGIC = b"C4BOOK1\n"
+SOLVED_DEPTH = 0xFFFF  # the depth of the books built by the solver, deeper than any search
+
+_HEADER = struct.Struct("<HHHH")
+_ENTRY = struct.Struct("<Bd")
+
+
+class OpeningBook:
+    def __init__(self, width: int, height: int, plies: int = 0, depth: int = 0):
+        """
+        Initializes an empty book.
+
+        :param width: Board width.
+        :type width: int
+        :param height: Board height.
+        :type height: int
+        :param plies: The number of plies (discs) covered by the book.
+        :type plies: int
+        :param depth: The search depth of the book moves (SOLVED_DEPTH if they were solved).
+        :type depth: int
+        """
+        self.width = width
+        self.height = height
+        self.plies = plies
+        self.depth = depth
+        self.geometry = get_geometry(width, height)
+        self.key_bytes = (width * self.geometry.col_bits + 7) // 8
+        # canonical state value -> (best move, value)
+        self.entries: Dict[int, Tuple[int, float]] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def canonical(self, state_val: int) -> Tuple[int, bool]:
+        """
+        Returns the key of a position, that is, the smallest of its value and of its mirror value.
+
+        :param state_val: The state value (as returned by `State.get_value`).
+        :type state_val: int
+        :return: Tuple of the key and whether it is the mirror value.
+        """
+        return self.geometry.canonical_value(state_val)
+
+    def add(self, state_val: int, move: int, value: float):
+        """
+        Adds the best move of a position (of the computer turn).
+
+        :param state_val: The state value (as returned by `State.get_value`).
+        :type state_val: int
+        :param move: The best move (column).
+        :type move: int
+        :param value: The value of the best move.
+        :type value: float
+        """
+        key, mirrored = self.canonical(state_val)
+        self.entries[key] = (self.width - 1 - move if mirrored else move, value)
+
+    def lookup(self, state: State) -> Optional[Tuple[int, float]]:
+        """
+        Looks up the best move of the computer in a position.
+
+        :param state: The current state of the game.
+        :type state: State
+        :return: Tuple of the best move and its value, or None if the position is not in the book.
+        """
+        if not state.is_computer_turn() or (state_module.WIDTH, state_module.HEIGHT) != (self.width, self.height):
+            return None
+        key, mirrored = self.canonical(state.get_value())
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        move, value = entry
+        return (self.width - 1 - move if mirrored else move), value
+
+    def save(self, file_path: str):
+        """
+        Writes the book to a binary file.
+
+        :param file_path: The path of the book file.
+        :type file_path: str
+        """
+        with open(file_path, "wb") as file:
+            file.write(BOOK_MAGIC)
+            file.write(_HEADER.pack(self.width, self.height, self.plies, self.depth))
+            for key in sorted(self.entries):
+                move, value = self.entries[key]
+                file.write(key.to_bytes(self.key_bytes, "little"))
+                file.write(_ENTRY.pack(move, value))
+
+    def save_db(self, file_path: str) -> int:
+        """
+        Writes the book as a (folded) positions database, to be opened with `PositionDB` without loading it.
+
+        :param file_path: The path of the database file.
+        :type file_path: str
+        :return: The number of records of the database.
+        :rtype: int
+        """
+        builder = PositionDBBuilder(file_path, self.width, self.height, self.depth, folded=True)
+        for key, (move, value) in self.entries.items():
+            builder.add(key, True, value, move)
+        return builder.finish()
+
+    @classmethod
+    def load(cls, file_path: str) -> "OpeningBook":
+        """
+        Reads a book from a binary file.
+
+        :param file_path: The path of the book file.
+        :type file_path: str
+        :return: The book.
+        :raises ValueError: if the file is not a book.
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+        if not data.startswith(BOOK_MAGIC):
+            raise ValueError(f"{file_path} is not an opening book")
+        book = cls(*_HEADER.unpack_from(data, len(BOOK_MAGIC)))
+        record_size = book.key_bytes + _ENTRY.size
+        for offset in range(len(BOOK_MAGIC) + _HEADER.size, len(data), record_size):
+            key = int.from_bytes(data[offset:offset + book.key_bytes], "little")
+            book.entries[key] = _ENTRY.unpack_from(data, offset + book.key_bytes)
+        return book
+
+
+def book_positions(plies: int) -> Iterator[State]:
+    """
+    Generates the positions of the computer turn of the first plies of the games of the current board, whoever starts
+    the game, once per symmetric pair of positions.
+
+    :param plies: The maximum number of discs of the positions.
+    :type plies: int
+    :return: Iterator of the states.
+    """
+    seen = set()
+    level = [State(False), State(True)]
+    for _ in range(plies + 1):
+        next_level = []
+        for state in level:
+            key = (state.get_canonical_value()[0], state.is_computer_turn())
+            if key in seen:
+                continue
+            seen.add(key)
+            moves = state.legal_moves()
+            if state.is_computer_turn() and moves:
+                yield state
+            for col in moves:
+                successor = state.copy()
+                successor.update_col(col, True)
+                next_level.append(successor)
+        level = next_level
+
+
+def build_book(width: int, height: int, plies: int, k: int = 6, approach: str = MINIMAX_WITH_ALPHA_BETA,
+               use_solver: bool = False, progress: Optional[Callable[[int], None]] = None) -> OpeningBook:
+    """
+    Builds the book of the first plies of the games of a board.
+
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param plies: The maximum number of discs of the book positions.
+    :type plies: int
+    :param k: The search depth of the book moves.
+    :type k: int
+    :param approach: The search algorithm name of the book moves, one of the engine `ALGORITHMS` keys.
+    :type approach: str
+    :param use_solver: Flag to solve the book moves with the perfect play solver instead of searching them (only
+                       feasible for the small boards).
+    :type use_solver: bool
+    :param progress: A callback called with the number of positions done after every position. Defaults to None.
+    :return: The book.
+    """
+    change_game_board(width, height)
+    book = OpeningBook(width, height, plies, SOLVED_DEPTH if use_solver else k)
+    engine = SearchEngine(approach, k, keep_table_across_games=True)
+    solver = Solver()
+    for count, state in enumerate(book_positions(plies), 1):
+        if use_solver:
+            value, _ = solver.run_solver(state)
+            move = solver.best_move
+        else:
+            value, _ = engine.search(state)
+            move = engine.solver.best_move
+        book.add(state.get_value(), move, value)
+        if progress is not None:
+            progress(count)
+    return book
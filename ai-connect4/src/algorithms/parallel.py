@@ -0,0 +1,315 @@
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.bitboard_state import BitboardState
+from src.algorithms.engine import ALGORITHMS, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.move_ordering import MoveOrderer, center_out_order
+from src.algorithms.search_limits import SearchLimits, SearchTimeout
+from src.algorithms.transposition_table import TranspositionTable
+from src.algorithms.shared_transposition_table import SharedTranspositionTable
+
+"""
+Connect 4 Parallel Search
+
+This code defines a root-parallel search, where the moves of the root are searched by the workers of a process pool
+(the search algorithms are pure Python, so threads would all wait on the same interpreter lock).
+
+The root is split following the Young Brothers Wait idea: the first (eldest) move, the one expected to be the best,
+is searched alone first to get a good alpha bound, then all its brothers are searched in parallel starting from that
+bound. The workers share the best value found so far (a shared memory double), every job starts from the best bound
+known when it starts, and publishes its value when it is done.
+
+A value that does not exceed the alpha bound its job started from is only an upper bound of the move value, such
+moves can not be the best move, so only the exact values are merged into the result.
+
+Every worker keeps its own transposition table alive across its jobs (and the searches), and starts a new generation
+of it for every new search.
+
+This code also defines a Lazy SMP search, where the workers do not split the tree, but all search the whole tree with
+a single shared transposition table (see `SharedTranspositionTable`): the main search runs in the calling process,
+while every helper worker starts from a different root move, so that they fill the table with the results the main
+search is about to need. The helpers are stopped as soon as the main search is done, and its result is returned.
+
+"""
+
+# the worker process globals, set by _init_worker
+_worker_alpha = None
+_worker_table: Optional[TranspositionTable] = None
+_worker_search_id = None
+_worker_stop = None
+
+
+def _init_worker(shared_alpha, width: int, height: int, table_capacity: int):
+    global _worker_alpha, _worker_table
+    change_game_board(width, height)
+    _worker_alpha = shared_alpha
+    _worker_table = TranspositionTable(table_capacity)
+
+
+def _search_root_move(search_id: int, approach: str, k: int, comp_turn: bool, state_value: int, col: int,
+                      alpha: float) -> Tuple[int, float, float, int]:
+    """
+    Searches a single move of the root in a worker process.
+
+    :return: Tuple of the move, its value, the alpha bound it was searched with and the number of visited nodes.
+    """
+    global _worker_search_id
+    if search_id != _worker_search_id:
+        _worker_table.new_search()
+        _worker_search_id = search_id
+    alpha = max(alpha, _worker_alpha.value)
+
+    state = BitboardState(comp_turn, state_value)
+    state.play(col)
+    solver_cls, _, takes_ordering, _ = ALGORITHMS[approach]
+    limits = SearchLimits()
+    if takes_ordering:
+        solver = solver_cls(k, _worker_table, limits, MoveOrderer(state_module.WIDTH))
+    else:
+        solver = solver_cls(k, _worker_table, limits)
+    value = solver.search_child(state, alpha)
+
+    with _worker_alpha.get_lock():
+        if value > _worker_alpha.value:
+            _worker_alpha.value = value
+    return col, value, alpha, limits.nodes
+
+
+def _init_helper(table_name: str, table_capacity: int, stop, width: int, height: int):
+    global _worker_table, _worker_stop
+    change_game_board(width, height)
+    _worker_table = SharedTranspositionTable(table_capacity, table_name)
+    _worker_stop = stop
+
+
+def _helper_search(approach: str, k: int, comp_turn: bool, state_value: int, first_move: Optional[int]) -> int:
+    """
+    Searches the whole tree in a helper worker process, until it is done or stopped.
+
+    :return: The number of visited nodes.
+    """
+    state = State(comp_turn, state_value)
+    solver_cls, run_method, takes_ordering, _ = ALGORITHMS[approach]
+    limits = SearchLimits(stop=_worker_stop)
+    if takes_ordering:
+        solver = solver_cls(k, _worker_table, limits, MoveOrderer(state_module.WIDTH))
+    else:
+        solver = solver_cls(k, _worker_table, limits)
+    try:
+        getattr(solver, run_method)(state, first_move)
+    except SearchTimeout:
+        pass
+    return limits.nodes
+
+
+class ParallelSearch:
+    def __init__(self, k: int, approach: str = MINIMAX_WITH_ALPHA_BETA, workers: Optional[int] = None,
+                 table_capacity: int = 1 << 18):
+        """
+        Initializes the parallel search, its process pool is started by the first search.
+
+        :param k: The search depth.
+        :type k: int
+        :param approach: The search algorithm name of the workers, one of the engine `ALGORITHMS` keys.
+        :type approach: str
+        :param workers: The number of worker processes. Defaults to None (the number of cpus).
+        :type workers: int
+        :param table_capacity: The maximum number of entries of the transposition table of every worker.
+        :type table_capacity: int
+        """
+        assert approach in ALGORITHMS, f"Unknown approach {approach}"
+        self.k = k
+        self.approach = approach
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.table_capacity = table_capacity
+        self.best_move = None
+        self.nodes = 0  # the number of nodes visited by the workers in the last search
+        self._shared_alpha = multiprocessing.Value('d', - math.inf)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._board_size = None
+        self._search_id = 0
+
+    def close(self):
+        """
+        Shuts the process pool down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def run_parallel_search(self, initial_state: State, first_move: Optional[int] = None) -> Tuple[float, State]:
+        """
+
+        Get the maximum value the computer can get from all its children, searched in parallel
+
+        :param initial_state: the initial state from which the algorithm runs
+        :type initial_state: State
+        :param first_move: a column to be searched first (e.g. the best move of a previous shallower search)
+        :type first_move: int
+
+        :return: Tuple of the max value the computer can get and the state of next step
+        """
+        executor = self._get_executor()
+        self._search_id += 1
+        self._shared_alpha.value = - math.inf
+        self.nodes = 0
+
+        legal_moves = initial_state.legal_moves()
+        moves = [col for col in center_out_order(state_module.WIDTH) if col in legal_moves]
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+
+        results = {}
+        if moves:
+            job = (self._search_id, self.approach, self.k, initial_state.is_computer_turn(),
+                   initial_state.get_value())
+            # the eldest brother first, then all the others with its value as the alpha bound
+            eldest = executor.submit(_search_root_move, *job, moves[0], - math.inf).result()
+            results[eldest[0]] = eldest
+            pending = {executor.submit(_search_root_move, *job, col, eldest[1]) for col in moves[1:]}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[result[0]] = result
+
+        max_value = - float('inf')
+        next_col = None
+        for col in moves:
+            _, value, alpha, nodes = results[col]
+            self.nodes += nodes
+            if value > alpha and value > max_value:  # otherwise the value is only an upper bound
+                next_col = col
+                max_value = value
+
+        self.best_move = next_col
+        next_step = initial_state
+        if next_col is not None:
+            next_step = initial_state.copy()
+            next_step.update_col(next_col, True)
+        return max_value, next_step
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, (re)started if the board size changed since the workers were started.
+        """
+        board_size = (state_module.WIDTH, state_module.HEIGHT)
+        if self._executor is None or board_size != self._board_size:
+            self.close()
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self._shared_alpha, *board_size, self.table_capacity))
+            self._board_size = board_size
+        return self._executor
+
+
+class LazySMPSearch:
+    def __init__(self, k: int, approach: str = MINIMAX_WITH_ALPHA_BETA, workers: Optional[int] = None,
+                 table_capacity: int = 1 << 20):
+        """
+        Initializes the Lazy SMP search, its shared table and process pool are created by the first search.
+
+        :param k: The search depth.
+        :type k: int
+        :param approach: The search algorithm name, one of the engine `ALGORITHMS` keys.
+        :type approach: str
+        :param workers: The number of helper processes. Defaults to None (the number of cpus minus the main one).
+        :type workers: int
+        :param table_capacity: The maximum number of entries of the shared transposition table.
+        :type table_capacity: int
+        """
+        assert approach in ALGORITHMS, f"Unknown approach {approach}"
+        self.k = k
+        self.approach = approach
+        self.workers = workers if workers is not None else max(multiprocessing.cpu_count() - 1, 1)
+        self.table_capacity = table_capacity
+        self.table: Optional[SharedTranspositionTable] = None
+        # a table attached to the same memory, so that the main search follows the generation instead of starting one
+        self._search_table: Optional[SharedTranspositionTable] = None
+        self.solver = None  # the main solver of the last search, e.g. to display its tree
+        self.nodes = 0  # the number of nodes visited by the main search and the helpers in the last search
+        self._stop = multiprocessing.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._board_size = None
+
+    def close(self):
+        """
+        Shuts the process pool down, and frees the shared table.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.table is not None:
+            self._search_table.close()
+            self.table.unlink()
+            self.table = None
+            self._search_table = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def run_lazy_smp(self, initial_state: State, first_move: Optional[int] = None) -> Tuple[float, State]:
+        """
+
+        Get the maximum value the computer can get from all its children, along with helper searches filling the
+        shared table
+
+        :param initial_state: the initial state from which the algorithm runs
+        :type initial_state: State
+        :param first_move: a column to be searched first (e.g. the best move of a previous shallower search)
+        :type first_move: int
+
+        :return: Tuple of the max value the computer can get and the state of next step
+        """
+        executor = self._get_executor()
+        self.table.new_search()
+        self._stop.clear()
+
+        moves = [col for col in center_out_order(state_module.WIDTH) if col in initial_state.legal_moves()]
+        job = (self.approach, self.k, initial_state.is_computer_turn(), initial_state.get_value())
+        helpers = [executor.submit(_helper_search, *job, moves[(i + 1) % len(moves)] if moves else None)
+                   for i in range(self.workers)]
+
+        solver_cls, run_method, takes_ordering, _ = ALGORITHMS[self.approach]
+        limits = SearchLimits()
+        if takes_ordering:
+            solver = solver_cls(self.k, self._search_table, limits, MoveOrderer(state_module.WIDTH))
+        else:
+            solver = solver_cls(self.k, self._search_table, limits)
+        try:
+            result = getattr(solver, run_method)(initial_state, first_move)
+        finally:
+            self._stop.set()
+            wait(helpers)  # a helper failure must not replace the exception of the main search
+        self.nodes = limits.nodes + sum(helper.result() for helper in helpers)
+        self.solver = solver
+        return result
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, along with a new shared table if the board size changed since the workers were
+        started.
+        """
+        board_size = (state_module.WIDTH, state_module.HEIGHT)
+        if self._executor is None or board_size != self._board_size:
+            self.close()
+            self.table = SharedTranspositionTable(self.table_capacity)
+            self._search_table = SharedTranspositionTable(self.table_capacity, self.table.name)
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_helper,
+                                                 initargs=(self.table.name, self.table_capacity, self._stop,
+                                                           *board_size))
+            self._board_size = board_size
+        return self._executor
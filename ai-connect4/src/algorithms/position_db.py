@@ -0,0 +1,249 @@
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State
+from src.state.geometry import get_geometry
+from src.algorithms.transposition_table import value_key, canonical_value_key
+
+"""
+Connect 4 Position Database
+
+This code defines an on-disk database of positions (opening books, solved positions, cached evaluations), made of
+fixed-size records sorted by key, that is opened with `mmap` and queried by binary search: opening a database does
+not read it, only the pages of the visited records are read (and they are shared by all the processes through the OS
+page cache).
+
+The file is made of the `DB_MAGIC` bytes, a header (width, height, depth, folded flag, key bytes, records count), then
+the records: the key (big endian, so that the byte order is the key order), the score (double) and the best move
+(uint8, `NO_MOVE` if none).
+
+The key of a position is its table key (see `value_key`: its `State.get_value()` along with the player to move). A
+folded database only holds one position of every symmetric pair (the smallest key, see `canonical_value_key`), the
+lookups mirror the other ones.
+
+The databases are written by `PositionDBBuilder`, which streams the entries in any order: they are sorted in memory
+by chunks, written to temporary runs, and the runs are merged into the database file.
+
+"""
+
+DB_MAGIC = b"C4PDB01\n"
+NO_MOVE = 0xFF
+
+_HEADER = struct.Struct(">HHHBBQ")
+_VALUE = struct.Struct(">dB")
+
+
+def _key_bytes(width: int, height: int) -> int:
+    return (width * get_geometry(width, height).col_bits + 1 + 7) // 8
+
+
+class PositionDB:
+    def __init__(self, file_path: str):
+        """
+        Opens a database file (without reading its records).
+
+        :param file_path: The path of the database file.
+        :type file_path: str
+        :raises ValueError: if the file is not a positions database.
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(DB_MAGIC)] != DB_MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not a positions database")
+        self.width, self.height, self.depth, folded, self.key_bytes, self.count = \
+            _HEADER.unpack_from(self._map, len(DB_MAGIC))
+        self.folded = bool(folded)
+        self.geometry = get_geometry(self.width, self.height)
+        self.record_size = self.key_bytes + _VALUE.size
+        self._records = len(DB_MAGIC) + _HEADER.size
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def get(self, key: int) -> Optional[Tuple[float, Optional[int]]]:
+        """
+        Looks up a key by binary search.
+
+        :param key: The position key (see `value_key`).
+        :type key: int
+        :return: Tuple of the score and the best move of the position, or None if it is not in the database.
+        """
+        target = key.to_bytes(self.key_bytes, "big")
+        records, record_size, key_bytes = self._records, self.record_size, self.key_bytes
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = records + middle * record_size
+            middle_key = self._map[offset:offset + key_bytes]
+            if middle_key < target:
+                low = middle + 1
+            elif middle_key > target:
+                high = middle
+            else:
+                score, move = _VALUE.unpack_from(self._map, offset + key_bytes)
+                return score, None if move == NO_MOVE else move
+        return None
+
+    def lookup(self, state: State) -> Optional[Tuple[int, float]]:
+        """
+        Looks up the best move of a position (the same interface as `OpeningBook.lookup`).
+
+        :param state: The current state of the game.
+        :type state: State
+        :return: Tuple of the best move and the score, or None if the position (or its best move) is not in the
+                 database.
+        """
+        entry = self.lookup_score(state)
+        if entry is None or entry[1] is None:
+            return None
+        return entry[1], entry[0]
+
+    def lookup_score(self, state: State) -> Optional[Tuple[float, Optional[int]]]:
+        """
+        Looks up a position.
+
+        :param state: The position.
+        :type state: State
+        :return: Tuple of the score and the best move (None if not stored) of the position, or None if it is not in
+                 the database.
+        """
+        if (state_module.WIDTH, state_module.HEIGHT) != (self.width, self.height):
+            return None
+        if not self.folded:
+            return self.get(value_key(state.get_value(), state.is_computer_turn()))
+        key, mirrored = canonical_value_key(self.geometry, state.get_value(), state.is_computer_turn())
+        entry = self.get(key)
+        if entry is None or entry[1] is None or not mirrored:
+            return entry
+        return entry[0], self.width - 1 - entry[1]
+
+
+class PositionDBBuilder:
+    def __init__(self, file_path: str, width: int, height: int, depth: int = 0, folded: bool = False,
+                 chunk_size: int = 1 << 16):
+        """
+        Starts writing a database, the entries are added with `add` and the file is written by `finish`.
+
+        :param file_path: The path of the database file.
+        :type file_path: str
+        :param width: Board width.
+        :type width: int
+        :param height: Board height.
+        :type height: int
+        :param depth: The search depth of the scores (e.g. `SOLVED_DEPTH` for solved positions).
+        :type depth: int
+        :param folded: Flag to fold the symmetric positions into one record.
+        :type folded: bool
+        :param chunk_size: The number of entries sorted in memory before they are written to a temporary run.
+        :type chunk_size: int
+        """
+        self.file_path = file_path
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.folded = folded
+        self.chunk_size = chunk_size
+        self.geometry = get_geometry(width, height)
+        self.key_bytes = _key_bytes(width, height)
+        self._chunk: List[bytes] = []
+        self._runs: List[str] = []
+        self._directory = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(file_path)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.finish()
+        else:
+            self._cleanup()
+
+    def add(self, state_val: int, comp_turn: bool, score: float, move: Optional[int] = None):
+        """
+        Adds a position, when a position is added more than once, the first entry is kept.
+
+        :param state_val: The state value (as returned by `State.get_value`).
+        :type state_val: int
+        :param comp_turn: True if it is the computer turn.
+        :type comp_turn: bool
+        :param score: The score of the position.
+        :type score: float
+        :param move: The best move (column) of the position, if any.
+        :type move: int
+        """
+        if self.folded:
+            key, mirrored = canonical_value_key(self.geometry, state_val, comp_turn)
+            if mirrored and move is not None:
+                move = self.width - 1 - move
+        else:
+            key = value_key(state_val, comp_turn)
+        self._chunk.append(key.to_bytes(self.key_bytes, "big") + _VALUE.pack(score, NO_MOVE if move is None else move))
+        if len(self._chunk) >= self.chunk_size:
+            self._write_run()
+
+    def finish(self) -> int:
+        """
+        Merges the added entries into the database file.
+
+        :return: The number of records of the database.
+        :rtype: int
+        """
+        self._write_run()
+        record_size = self.key_bytes + _VALUE.size
+        runs = [open(run, "rb") for run in self._runs]
+        count = 0
+        try:
+            with open(self.file_path, "wb") as file:
+                file.write(DB_MAGIC)
+                file.write(_HEADER.pack(self.width, self.height, self.depth, self.folded, self.key_bytes, 0))
+                last_key = None
+                # the records of a run are sorted, and the ties are merged in the runs order
+                for record in heapq.merge(*(iter(lambda run=run: run.read(record_size), b"") for run in runs),
+                                          key=lambda record: record[:self.key_bytes]):
+                    if record[:self.key_bytes] != last_key:
+                        file.write(record)
+                        last_key = record[:self.key_bytes]
+                        count += 1
+                file.seek(len(DB_MAGIC))
+                file.write(_HEADER.pack(self.width, self.height, self.depth, self.folded, self.key_bytes, count))
+        finally:
+            for run in runs:
+                run.close()
+            self._cleanup()
+        return count
+
+    def _write_run(self):
+        if not self._chunk:
+            return
+        # a stable sort, so that the first added entry of a key is written first
+        self._chunk.sort(key=lambda record: record[:self.key_bytes])
+        run_path = os.path.join(self._directory, f"run{len(self._runs)}")
+        with open(run_path, "wb") as run:
+            run.write(b"".join(self._chunk))
+        self._runs.append(run_path)
+        self._chunk = []
+
+    def _cleanup(self):
+        for run in self._runs:
+            if os.path.exists(run):
+                os.remove(run)
+        self._runs = []
+        if os.path.isdir(self._directory):
+            os.rmdir(self._directory)
@@ -0,0 +1,66 @@
+import time
+from typing import *
+
+"""
+Connect 4 Search Limits
+
+This code defines the wall-clock and node budgets of a search. The search algorithms count every node they visit on
+the limits object, which raises `SearchTimeout` as soon as a budget is exhausted, so that the search is abandoned and
+the result of the last completed iteration can be used instead.
+
+A search can also be stopped from the outside (e.g. by another process) by setting its stop flag.
+
+"""
+
+# the clock is only read once every (_TIME_CHECK_MASK + 1) nodes
+_TIME_CHECK_MASK = 1023
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its time or node budget is exhausted.
+    """
+
+
+class SearchLimits:
+    def __init__(self, time_budget: Optional[float] = None, node_budget: Optional[int] = None, stop=None):
+        """
+        Starts the budgets of a search.
+
+        :param time_budget: The wall-clock budget in seconds, None for no time limit.
+        :type time_budget: float
+        :param node_budget: The maximum number of visited nodes, None for no nodes limit.
+        :type node_budget: int
+        :param stop: A flag with an `is_set` method (e.g. `threading.Event` or `multiprocessing.Event`) that stops the
+                     search once set, checked along with the clock. None for no stop flag.
+        """
+        self.deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        self.node_budget = node_budget
+        self.stop = stop
+        self.nodes = 0
+
+    def expired(self) -> bool:
+        """
+        Checks whether a budget is already exhausted, e.g. before starting a new iteration of the search.
+
+        :return: True if there is no budget left.
+        :rtype: bool
+        """
+        if self.node_budget is not None and self.nodes >= self.node_budget:
+            return True
+        if self.stop is not None and self.stop.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def count_node(self):
+        """
+        Counts a visited node, and raises `SearchTimeout` if a budget is exhausted.
+        """
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchTimeout()
+        if not self.nodes & _TIME_CHECK_MASK:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.stop is not None and self.stop.is_set():
+                raise SearchTimeout()
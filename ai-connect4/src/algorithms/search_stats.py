@@ -0,0 +1,217 @@
+import time
+from typing import *
+
+"""
+Connect 4 Search Statistics
+
+This code defines the statistics of a search, filled by the search algorithms when they are given a stats object
+(nothing is counted otherwise): the visited nodes, the evaluated leaves, the transposition table hits and misses, the
+cutoffs of every ply, and the derived effective branching factor and nodes per second.
+
+Every visited node can also be reported to a callback (`on_node`), e.g. to trace or sample a search.
+
+With timing on, the search time is split between the move generation (ordering the moves, playing and taking them
+back), the evaluation (the incremental heuristic updates and leaf values) and the bookkeeping (everything else: the
+table, the tree, the recursion). The timed calls go through timing proxies of the searched state and of the evaluator
+(see `timed`), so the search code itself has no timer calls, but timing slows the search down noticeably, and should
+only be turned on to profile it.
+
+"""
+
+
+class SearchStats:
+    def __init__(self, timing: bool = False, on_node: Optional[Callable[[Any, int], None]] = None):
+        """
+        Initializes empty statistics.
+
+        :param timing: Flag to split the search time between the move generation, the evaluation and the bookkeeping.
+        :type timing: bool
+        :param on_node: A callback called with the state and the level of every visited node (the state is searched
+                        in place, so it must not be kept). Defaults to None.
+        """
+        self.timing = timing
+        self.on_node = on_node
+        self.nodes = 0
+        self.leaves = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cutoffs: List[int] = []  # ply -> number of cutoffs
+        self.depth = 0  # the deepest completed search depth
+        self.elapsed = 0.0
+        self.move_generation_time = 0.0
+        self.evaluation_time = 0.0
+        self._start = None
+
+    def start(self):
+        """
+        Starts (or resumes) timing the search.
+        """
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """
+        Stops timing the search.
+        """
+        if self._start is not None:
+            self.elapsed += time.perf_counter() - self._start
+            self._start = None
+
+    def enter_node(self, state, level: int):
+        """
+        Counts a visited node.
+        """
+        self.nodes += 1
+        if self.on_node is not None:
+            self.on_node(state, level)
+
+    def count_probe(self, hit: bool):
+        """
+        Counts a transposition table probe, a hit if its entry could be used in place of a search.
+        """
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def record_cutoff(self, level: int):
+        """
+        Counts a cutoff at a ply.
+        """
+        cutoffs = self.cutoffs
+        while len(cutoffs) <= level:
+            cutoffs.append(0)
+        cutoffs[level] += 1
+
+    def timed(self, state, evaluator) -> Tuple[Any, Any]:
+        """
+        Returns the timing proxies of a searched state and of its evaluator, if timing is on.
+
+        :param state: The searched state (`BitboardState`).
+        :param evaluator: The evaluator (`IncrementalHeuristic`).
+        :return: Tuple of the state and of the evaluator to be searched with.
+        """
+        if not self.timing:
+            return state, evaluator
+        return _TimedState(state, self), _TimedEvaluator(evaluator, self)
+
+    @property
+    def cache_hit_rate(self) -> float:
+        probes = self.cache_hits + self.cache_misses
+        return self.cache_hits / probes if probes else 0.0
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """
+        The branching factor b of a uniform tree of the search depth with as many nodes (b ** depth = nodes).
+        """
+        return self.nodes ** (1 / self.depth) if self.depth and self.nodes else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bookkeeping_time(self) -> float:
+        """
+        The search time spent neither in the move generation nor in the evaluation (only split with timing on).
+        """
+        return max(self.elapsed - self.move_generation_time - self.evaluation_time, 0.0) if self.timing else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the statistics as a dict (e.g. to be dumped as JSON).
+        """
+        stats = {
+            "nodes": self.nodes,
+            "leaves": self.leaves,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cutoffs": list(self.cutoffs),
+            "depth": self.depth,
+            "effective_branching_factor": self.effective_branching_factor,
+            "elapsed": self.elapsed,
+            "nodes_per_second": self.nodes_per_second,
+        }
+        if self.timing:
+            stats["move_generation_time"] = self.move_generation_time
+            stats["evaluation_time"] = self.evaluation_time
+            stats["bookkeeping_time"] = self.bookkeeping_time
+        return stats
+
+    def report(self) -> str:
+        """
+        Returns a text report of the statistics.
+        """
+        lines = [
+            f"nodes {self.nodes:,} ({self.leaves:,} leaves) in {self.elapsed:.3f}s, {self.nodes_per_second:,.0f} "
+            f"nodes/s",
+            f"depth {self.depth}, effective branching factor {self.effective_branching_factor:.2f}",
+            f"table hits {self.cache_hits:,} / misses {self.cache_misses:,} ({100 * self.cache_hit_rate:.1f}%)",
+            "cutoffs per ply " + " ".join(str(count) for count in self.cutoffs),
+        ]
+        if self.timing and self.elapsed:
+            lines.append(f"move generation {100 * self.move_generation_time / self.elapsed:.1f}%, "
+                         f"evaluation {100 * self.evaluation_time / self.elapsed:.1f}%, "
+                         f"bookkeeping {100 * self.bookkeeping_time / self.elapsed:.1f}%")
+        return "\n".join(lines)
+
+
+class _TimedState:
+    """
+    Proxy of a searched state, timing its move generation methods.
+    """
+    def __init__(self, state, stats: SearchStats):
+        self._state = state
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
+    def legal_moves(self):
+        start = time.perf_counter()
+        moves = self._state.legal_moves()
+        self._stats.move_generation_time += time.perf_counter() - start
+        return moves
+
+    def threat_moves(self):
+        start = time.perf_counter()
+        moves = self._state.threat_moves()
+        self._stats.move_generation_time += time.perf_counter() - start
+        return moves
+
+    def play(self, col):
+        start = time.perf_counter()
+        row = self._state.play(col)
+        self._stats.move_generation_time += time.perf_counter() - start
+        return row
+
+    def undo(self, col):
+        start = time.perf_counter()
+        row = self._state.undo(col)
+        self._stats.move_generation_time += time.perf_counter() - start
+        return row
+
+
+class _TimedEvaluator:
+    """
+    Proxy of an evaluator, timing all its methods.
+    """
+    def __init__(self, evaluator, stats: SearchStats):
+        self._evaluator = evaluator
+        self._stats = stats
+
+    def add(self, row, col, is_computer):
+        start = time.perf_counter()
+        self._evaluator.add(row, col, is_computer)
+        self._stats.evaluation_time += time.perf_counter() - start
+
+    def remove(self, row, col, is_computer):
+        start = time.perf_counter()
+        self._evaluator.remove(row, col, is_computer)
+        self._stats.evaluation_time += time.perf_counter() - start
+
+    def get_value(self):
+        start = time.perf_counter()
+        value = self._evaluator.get_value()
+        self._stats.evaluation_time += time.perf_counter() - start
+        return value
@@ -0,0 +1,173 @@
+import struct
+from multiprocessing import shared_memory
+from typing import *
+
+from src.algorithms.transposition_table import TranspositionTable
+
+"""
+Connect 4 Shared Transposition Table
+
+This code defines a transposition table stored in a `multiprocessing.shared_memory` buffer, so that the search
+processes of a parallel search (see `LazySMPSearch`) read and write the same table.
+
+The buffer starts with a header word (the search generation), followed by fixed-size slots of three 64 bits words:
+    - check: the 64 bits key XOR the two data words.
+    - value: the search value (a double).
+    - info: the depth, flag, best move and generation of the entry, along with a valid bit.
+
+There are no locks: two processes may write the same slot at the same time and leave it torn (the words of different
+entries), so an entry is only used if its check word XOR its data words gives back the looked up key, otherwise it is
+treated as missing.
+
+The keys longer than 64 bits (boards larger than the standard one) are folded to 64 bits, so two states of such boards
+may share the same folded key, which is very unlikely.
+
+"""
+
+_MASK64 = (1 << 64) - 1
+
+_SLOT = struct.Struct("<QdQ")
+_HEADER = struct.Struct("<Q")
+_DOUBLE = struct.Struct("<d")
+_UINT64 = struct.Struct("<Q")
+
+# info word layout
+_FLAG_SHIFT = 16
+_MOVE_SHIFT = 18
+_GENERATION_SHIFT = 26
+_VALID = 1 << 42
+_NO_MOVE = 0xFF
+
+
+def _fold_key(key: int) -> int:
+    folded = 0
+    while key:
+        folded ^= key & _MASK64
+        key >>= 64
+    return folded
+
+
+def _double_bits(value: float) -> int:
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+
+class SharedTranspositionTable(TranspositionTable):
+    def __init__(self, capacity: int = 1 << 18, name: Optional[str] = None):
+        """
+        Creates a new shared table, or attaches to an existing one.
+
+        The process that created the table owns it: it starts the new search generations, and should `unlink` the
+        table when it is no longer used. The attached tables (e.g. in the worker processes) follow the generation of
+        the owner.
+
+        :param capacity: The maximum number of entries of the table (rounded down to an even number), it must be the
+                         same as the capacity of the attached table.
+        :type capacity: int
+        :param name: The name of the shared memory block of the table to attach to, None to create a new table.
+        :type name: str
+        """
+        self.buckets = max(capacity // 2, 1)
+        self.capacity = self.buckets * 2
+        size = _HEADER.size + self.capacity * _SLOT.size
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+        self.generation = _HEADER.unpack_from(self.shm.buf, 0)[0]
+        if self.owner:
+            self.clear()
+
+    def close(self):
+        """
+        Detaches this process from the table.
+        """
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Detaches this process from the table, and frees its memory (only the owner should do it).
+        """
+        self.shm.close()
+        self.shm.unlink()
+
+    def clear(self):
+        """
+        Removes all the table entries.
+        """
+        self.shm.buf[_HEADER.size:] = bytes(self.capacity * _SLOT.size)
+
+    def new_search(self):
+        """
+        Starts a new search generation. The owner starts the next generation, while the attached tables catch up with
+        the generation of the owner.
+        """
+        if self.owner:
+            _HEADER.pack_into(self.shm.buf, 0, self.generation + 1)
+        self.generation = _HEADER.unpack_from(self.shm.buf, 0)[0]
+
+    def __len__(self):
+        return sum(1 for slot in range(self.capacity) if self._read(slot)[2] & _VALID)
+
+    def get(self, key: int) -> Optional[Tuple[int, float, int, Optional[int]]]:
+        """
+        Looks up the entry of a key.
+
+        :param key: The state key (see `state_key`).
+        :type key: int
+        :return: Tuple of (depth, value, flag, best move) of the entry, or None if the key is not in the table (or its
+                 slot is torn).
+        """
+        key = _fold_key(key)
+        slot = self._bucket(key)
+        for slot in (slot, slot + 1):
+            check, value, info = self._read(slot)
+            if info & _VALID and check ^ _double_bits(value) ^ info == key:
+                move = (info >> _MOVE_SHIFT) & 0xFF
+                return info & 0xFFFF, value, (info >> _FLAG_SHIFT) & 0b11, None if move == _NO_MOVE else move
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: Optional[int] = None):
+        """
+        Stores the result of a search.
+
+        The entry goes to the depth-preferred slot if it was searched at least as deep as the entry already there, or
+        if that entry is stale (which is then moved to the always-replace slot), otherwise it goes to the
+        always-replace slot.
+
+        :param key: The state key (see `state_key`).
+        :type key: int
+        :param depth: The number of levels searched below the position.
+        :type depth: int
+        :param value: The search value.
+        :type value: float
+        :param flag: EXACT, LOWER or UPPER.
+        :type flag: int
+        :param move: The best move (column) found, if any.
+        :type move: int
+        """
+        folded = _fold_key(key)
+        slot = self._bucket(folded)
+        buf = self.shm.buf
+        if move is None:
+            existing = self.get(key)
+            move = existing[3] if existing is not None else None
+
+        if not self._holds(slot, folded):
+            _, _, info = self._read(slot)
+            stale = (info >> _GENERATION_SHIFT) & 0xFFFF != self.generation & 0xFFFF
+            if not info & _VALID or depth >= info & 0xFFFF or stale:
+                offset = _HEADER.size + slot * _SLOT.size
+                if info & _VALID:
+                    buf[offset + _SLOT.size:offset + 2 * _SLOT.size] = buf[offset:offset + _SLOT.size]
+            else:
+                slot += 1
+
+        info = (_VALID | min(depth, 0xFFFF) | flag << _FLAG_SHIFT | (_NO_MOVE if move is None else move) << _MOVE_SHIFT
+                | (self.generation & 0xFFFF) << _GENERATION_SHIFT)
+        _SLOT.pack_into(buf, _HEADER.size + slot * _SLOT.size, folded ^ _double_bits(value) ^ info, value, info)
+
+    def _holds(self, slot: int, folded: int) -> bool:
+        check, value, info = self._read(slot)
+        return bool(info & _VALID) and check ^ _double_bits(value) ^ info == folded
+
+    def _read(self, slot: int) -> Tuple[int, float, int]:
+        return _SLOT.unpack_from(self.shm.buf, _HEADER.size + slot * _SLOT.size)
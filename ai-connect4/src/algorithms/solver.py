@@ -0,0 +1,264 @@
+from typing import *
+from src.state import state as state_module
+from src.state.state import State
+from src.state.bitboard_state import BitboardState
+from src.state.geometry import get_geometry
+from src.algorithms.move_ordering import center_out_order
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.transposition_table import TranspositionTable, EXACT, LOWER, UPPER
+
+"""
+Connect 4 Perfect Play Solver
+
+This code defines a solver that searches a state down to the end of the game (the full board), instead of down to a
+heuristic depth k, and returns its exact game-theoretic score.
+
+In this game the board is always played until it is full, and the winner is the player with the most four in a row
+sequences (see `get_game_score`), so the score of a state is the final margin (computer fours - human fours) of the
+game under perfect play of both players: positive for a computer win, zero for a draw, negative for a loss. As the
+game never ends early, there are no "moves to win", and a four in a row does not end the search; instead:
+    - The search is a negamax on the bitboards (player to move and mask), scoring the fours made by every move.
+    - The windows still open to a player (without an opponent disc) bound the final margin, which prunes every state
+      whose bounds are already outside of the search window.
+    - The transposition table stores the exact values and the bounds of the solved states.
+    - The root is solved by a binary search on the margin with null-window searches, which prune much more than a
+      single full-window search.
+    - The moves making or stopping the most fours are searched first, then the ones closing the most windows to
+      the opponent, then the center-out order.
+
+The search is exponential in the number of empty cells, so only the late mid-game states (about 20 empty cells on the
+standard board) are solved in seconds, the small boards variants can be solved from further away.
+
+"""
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+
+def outcome(score: int) -> int:
+    """
+    Returns the outcome of a score for the computer.
+
+    :param score: The final margin (computer fours - human fours).
+    :type score: int
+    :return: WIN, DRAW or LOSS.
+    :rtype: int
+    """
+    return (score > 0) - (score < 0)
+
+
+class Solver:
+    def __init__(self, table_capacity: int = 1 << 20, limits: Optional[SearchLimits] = None):
+        """
+        Initializes the solver, its transposition table is kept across the solved states (of the same board size).
+
+        :param table_capacity: The maximum number of entries of the transposition table.
+        :type table_capacity: int
+        :param limits: The search budgets, the solve raises `SearchTimeout` once they are exhausted. Defaults to None.
+        :type limits: SearchLimits
+        """
+        self.table = TranspositionTable(table_capacity)
+        self.limits = limits
+        self.best_move = None  # the best move found by the last run_solver
+        self.nodes = 0
+        self._board_size = None
+
+    def solve(self, state: State) -> int:
+        """
+        Solves a state.
+
+        :param state: The state to be solved (`State` or `BitboardState`).
+        :type state: State
+        :return: The final margin (computer fours - human fours) of the game under perfect play.
+        :rtype: int
+        :raises SearchTimeout: if the search limits are exhausted before the state is solved
+        """
+        position = self._setup(state)
+        color = 1 if state.is_computer_turn() else -1
+        return color * self._solve_root(*position)
+
+    def analyze(self, state: State) -> Dict[int, int]:
+        """
+        Solves every move of a state.
+
+        :param state: The state to be solved (`State` or `BitboardState`).
+        :type state: State
+        :return: Mapping of every legal move (column) to the final margin (from the computer point of view) after it.
+        :rtype: Dict[int, int]
+        """
+        current, mask, diff, open_current, open_opponent = self._setup(state)
+        color = 1 if state.is_computer_turn() else -1
+        scores = {}
+        for col in self._moves(mask):
+            bit, gained, blocked, _ = self._play(current, mask, col)
+            scores[col] = - color * self._solve_root(current ^ mask, mask | bit, - diff - gained,
+                                                     open_opponent - blocked, open_current - gained)
+        return scores
+
+    def run_solver(self, initial_state: State, first_move: Optional[int] = None) -> Tuple[float, State]:
+        """
+
+        Get the best move of the player to move under perfect play
+
+        :param initial_state: the initial state from which the solver runs
+        :type initial_state: State
+        :param first_move: a column to be checked first
+        :type first_move: int
+
+        :return: Tuple of the final margin (from the computer point of view) and the state of next step
+        """
+        current, mask, diff, open_current, open_opponent = self._setup(initial_state)
+        color = 1 if initial_state.is_computer_turn() else -1
+        score = self._solve_root(current, mask, diff, open_current, open_opponent)
+        next_step = initial_state
+        self.best_move = None
+        moves = self._moves(mask)
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+        for col in moves:
+            bit, gained, blocked, _ = self._play(current, mask, col)
+            # a null-window search only checks whether the move keeps the score
+            if - self._negamax(current ^ mask, mask | bit, - diff - gained, open_opponent - blocked,
+                               open_current - gained, - score, - score + 1) >= score:
+                next_step = initial_state.copy()
+                next_step.update_col(col, True)
+                self.best_move = col
+                break
+        return color * score, next_step
+
+    def _setup(self, state: State) -> Tuple[int, int, int, int, int]:
+        """
+        Returns the bitboards of the player to move and of all the discs, the fours margin of the player to move, and
+        the number of windows still open to the player to move and to its opponent.
+        """
+        board_size = (state_module.WIDTH, state_module.HEIGHT)
+        if board_size != self._board_size:  # the keys of different board sizes are not comparable
+            self.table.clear()
+            self._board_size = board_size
+            geometry = get_geometry(*board_size)
+            self.geometry = geometry
+            self.order = center_out_order(geometry.width)
+        self.table.new_search()
+
+        bitboard = state if isinstance(state, BitboardState) else BitboardState(state.is_computer_turn(),
+                                                                                 state.get_value())
+        current, opponent = bitboard.current, bitboard.mask ^ bitboard.current
+        diff = self.geometry.count_fours(current) - self.geometry.count_fours(opponent)
+        return current, bitboard.mask, diff, self._open_windows(current, opponent), self._open_windows(opponent, current)
+
+    def _solve_root(self, current: int, mask: int, diff: int, open_current: int, open_opponent: int) -> int:
+        """
+        Solves a position with a binary search on its score, using null-window searches.
+        """
+        low, high = diff - open_opponent, diff + open_current
+        while low < high:
+            middle = (low + high) // 2
+            value = self._negamax(current, mask, diff, open_current, open_opponent, middle, middle + 1)
+            if value <= middle:
+                high = value
+            else:
+                low = value
+        return low
+
+    def _negamax(self, current: int, mask: int, diff: int, open_current: int, open_opponent: int, alpha: int,
+                 beta: int) -> int:
+        """
+        Calculates the final margin of a position for the player to move.
+
+        Every window still open to a player (with no opponent disc, and not already complete) may become one more four
+        of that player, so the final margin is between diff - open_opponent and diff + open_current.
+
+        :param current: the bitboard of the discs of the player to move
+        :param mask: the bitboard of all the discs
+        :param diff: the fours margin of the player to move so far
+        :param open_current: the number of windows open to the player to move
+        :param open_opponent: the number of windows open to the opponent
+        :param alpha: the margin the player to move is already guaranteed
+        :param beta: the margin the opponent is already guaranteed (negated)
+        :return: the margin, or a bound of it if it is outside of the (alpha, beta) window
+        """
+        self.nodes += 1
+        if self.limits is not None:
+            self.limits.count_node()
+        if mask == self.geometry.board_mask:
+            return diff
+
+        low, high = diff - open_opponent, diff + open_current
+        if high <= alpha:
+            return high
+        if low >= beta:
+            return low
+
+        key = current + mask  # unique, as the mask bits are always the lower bits of their column
+        empty_cells = bin(self.geometry.board_mask ^ mask).count('1')
+        cached_value, table_move = self.table.probe(key, empty_cells, alpha, beta)
+        if cached_value is not None:
+            return cached_value
+
+        alpha_orig = alpha
+        alpha = max(alpha, low)
+        beta = min(beta, high)
+
+        children = []
+        for col in self._moves(mask):
+            bit, gained, blocked, stopped = self._play(current, mask, col)
+            children.append((col != table_move, - gained - stopped, - blocked, col, bit, gained, blocked))
+        # the table move first, then the moves making or stopping the most fours, then closing the most windows
+        children.sort()
+
+        v = - float('inf')
+        best_col = None
+        opponent = current ^ mask
+        for _, _, _, col, bit, gained, blocked in children:
+            child_value = - self._negamax(opponent, mask | bit, - diff - gained, open_opponent - blocked,
+                                          open_current - gained, - beta, - alpha)
+            if child_value > v:
+                v = child_value
+                best_col = col
+            if v >= beta:
+                break
+            alpha = max(alpha, v)
+
+        if v <= alpha_orig:
+            flag = UPPER
+        elif v >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, empty_cells, v, flag, best_col)
+        return v
+
+    def _open_windows(self, player: int, opponent: int) -> int:
+        """
+        Returns the number of windows with no opponent disc, that are not already complete for the player.
+        """
+        return sum(1 for window in self.geometry.windows if not window & opponent and window & player != window)
+
+    def _moves(self, mask: int) -> List[int]:
+        return [col for col in self.order if not mask & self.geometry.top_masks[col]]
+
+    def _play(self, current: int, mask: int, col: int) -> Tuple[int, int, int, int]:
+        """
+        Returns the bit of the disc played in a column by the player to move, the number of fours it makes (which
+        are no longer open to the player), the number of windows it closes to the opponent, and the number of fours
+        of the opponent it stops (that the opponent would make by playing there).
+        """
+        geometry = self.geometry
+        bit = (mask + geometry.bottom_masks[col]) & geometry.column_masks[col]
+        discs = current | bit
+        opponent_discs = (mask ^ current) | bit
+        windows = geometry.windows
+        gained = 0
+        blocked = 0
+        stopped = 0
+        for window_idx in geometry.cell_windows[bit.bit_length() - 1]:
+            window = windows[window_idx]
+            if not window & current:
+                blocked += 1
+                if opponent_discs & window == window:
+                    stopped += 1
+            elif discs & window == window:
+                gained += 1
+        return bit, gained, blocked, stopped
@@ -0,0 +1,228 @@
+from typing import *
+
+"""
+Connect 4 Transposition Table
+
+This code defines a fixed-capacity transposition table, used by the search algorithms to remember the results of
+already searched positions.
+
+Every entry holds (key, depth, value, flag, best move), where depth is the number of levels that were searched below
+the position, and the flag tells whether the value is the exact value of the position or only a bound of it
+(the search was cut off):
+    - EXACT: the value is the exact value of the position.
+    - LOWER: the value is a lower bound of the position value (a beta cutoff happened).
+    - UPPER: the value is an upper bound of the position value (no move reached alpha).
+
+The table is made of buckets of two slots, the first slot is depth-preferred (it keeps the deepest search of the
+bucket), while the second slot is always replaced, so the table memory never grows beyond its capacity.
+
+The search algorithms key the table by `canonical_key`, so that a position and its left to right mirror share the
+same entry (the heuristic is symmetric), and the best moves stored for a mirrored key are mirrored back by
+`mirror_move`.
+
+The table can be kept alive across searches (e.g. the moves of a game), every search starts a new generation by
+calling `new_search`, and the entries written by older generations are still used, but are replaced first.
+
+"""
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def state_key(state) -> int:
+    """
+    Returns the table key of a state, that is, its integer value along with the player to move, as the state value
+    alone does not tell whose turn it is.
+
+    :param state: The state (`State` or `BitboardState`).
+    :return: The key of the state.
+    :rtype: int
+    """
+    return value_key(state.get_value(), state.is_computer_turn())
+
+
+def value_key(state_val: int, comp_turn: bool) -> int:
+    """
+    Returns the table key of a state given by its integer value (see `state_key`).
+
+    :param state_val: The state value (as returned by `State.get_value`).
+    :type state_val: int
+    :param comp_turn: True if it is the computer turn.
+    :type comp_turn: bool
+    :return: The key of the state.
+    :rtype: int
+    """
+    return (state_val << 1) | comp_turn
+
+
+def canonical_value_key(geometry, state_val: int, comp_turn: bool) -> Tuple[int, bool]:
+    """
+    Returns the symmetric table key of a state given by its integer value (see `canonical_key`).
+
+    :param geometry: The geometry of the board of the state (`BoardGeometry`).
+    :param state_val: The state value (as returned by `State.get_value`).
+    :type state_val: int
+    :param comp_turn: True if it is the computer turn.
+    :type comp_turn: bool
+    :return: Tuple of the key of the state and whether it is the key of the mirror.
+    :rtype: Tuple[int, bool]
+    """
+    value, mirrored = geometry.canonical_value(state_val)
+    return value_key(value, comp_turn), mirrored
+
+
+def canonical_key(state) -> Tuple[int, bool]:
+    """
+    Returns the symmetric table key of a state, that is, the key of the smallest of the state and of its left to right
+    mirror (see `get_canonical_value`).
+
+    :param state: The state (`State` or `BitboardState`).
+    :return: Tuple of the key of the state and whether it is the key of the mirror.
+    :rtype: Tuple[int, bool]
+    """
+    value, mirrored = state.get_canonical_value()
+    return value_key(value, state.is_computer_turn()), mirrored
+
+
+def mirror_move(move: Optional[int], mirrored: bool, width: int) -> Optional[int]:
+    """
+    Converts a best move between a state and the canonical state of its key (the conversion is its own inverse).
+
+    :param move: The move (column), or None.
+    :type move: int
+    :param mirrored: Whether the key is the key of the mirror (as returned by `canonical_key`).
+    :type mirrored: bool
+    :param width: Board width.
+    :type width: int
+    :return: The converted move.
+    :rtype: int
+    """
+    return width - 1 - move if mirrored and move is not None else move
+
+
+class TranspositionTable:
+    def __init__(self, capacity: int = 1 << 18):
+        """
+        Initializes an empty table.
+
+        :param capacity: The maximum number of entries of the table (rounded down to an even number).
+        :type capacity: int
+        """
+        self.buckets = max(capacity // 2, 1)
+        self.capacity = self.buckets * 2
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all the table entries.
+        """
+        self.keys: List[Optional[int]] = [None] * self.capacity
+        self.depths: List[int] = [0] * self.capacity
+        self.values: List[float] = [0] * self.capacity
+        self.flags: List[int] = [EXACT] * self.capacity
+        self.moves: List[Optional[int]] = [None] * self.capacity
+        self.generations: List[int] = [0] * self.capacity
+        self.size = 0
+
+    def new_search(self):
+        """
+        Starts a new search generation, the entries of the previous searches become stale and are replaced first.
+        """
+        self.generation += 1
+
+    def __len__(self):
+        return self.size
+
+    def get(self, key: int) -> Optional[Tuple[int, float, int, Optional[int]]]:
+        """
+        Looks up the entry of a key.
+
+        :param key: The state key (see `state_key`).
+        :type key: int
+        :return: Tuple of (depth, value, flag, best move) of the entry, or None if the key is not in the table.
+        """
+        slot = self._bucket(key)
+        if self.keys[slot] != key:
+            slot += 1
+            if self.keys[slot] != key:
+                return None
+        return self.depths[slot], self.values[slot], self.flags[slot], self.moves[slot]
+
+    def probe(self, key: int, depth: int, alpha: float, beta: float) -> Tuple[Optional[float], Optional[int]]:
+        """
+        Looks up a key, and checks whether its entry can be used in place of a search of the given depth and window.
+
+        :param key: The state key (see `state_key`).
+        :type key: int
+        :param depth: The depth the position is about to be searched to.
+        :type depth: int
+        :param alpha: The alpha bound of the search.
+        :type alpha: float
+        :param beta: The beta bound of the search.
+        :type beta: float
+        :return: Tuple of the usable value (or None if the position has to be searched) and the stored best move.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None, None
+        entry_depth, value, flag, move = entry
+        if entry_depth >= depth:
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                return value, move
+        return None, move
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: Optional[int] = None):
+        """
+        Stores the result of a search.
+
+        The entry goes to the depth-preferred slot if it was searched at least as deep as the entry already there, or
+        if that entry is stale (which is then moved to the always-replace slot), otherwise it goes to the
+        always-replace slot.
+
+        :param key: The state key (see `state_key`).
+        :type key: int
+        :param depth: The number of levels searched below the position.
+        :type depth: int
+        :param value: The search value.
+        :type value: float
+        :param flag: EXACT, LOWER or UPPER.
+        :type flag: int
+        :param move: The best move (column) found, if any.
+        :type move: int
+        """
+        slot = self._bucket(key)
+        keys = self.keys
+        if keys[slot] is not None and keys[slot] != key:
+            if depth >= self.depths[slot] or self.generations[slot] != self.generation:
+                if keys[slot + 1] is None:
+                    self.size += 1
+                self._write(slot + 1, keys[slot], self.depths[slot], self.values[slot], self.flags[slot],
+                            self.moves[slot])
+                self.generations[slot + 1] = self.generations[slot]
+            else:
+                slot += 1
+                if keys[slot] is None:
+                    self.size += 1
+        elif keys[slot] is None:
+            if keys[slot + 1] == key:  # the key is already in the always-replace slot
+                keys[slot + 1] = None
+            else:
+                self.size += 1
+        if move is None and keys[slot] == key:
+            move = self.moves[slot]
+        self._write(slot, key, depth, value, flag, move)
+
+    def _write(self, slot: int, key: int, depth: int, value: float, flag: int, move: Optional[int]):
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        self.flags[slot] = flag
+        self.moves[slot] = move
+        self.generations[slot] = self.generation
+
+    def _bucket(self, key: int) -> int:
+        return (((key * _HASH_MULTIPLIER) >> 32) % self.buckets) * 2
@@ -1,4 +1,8 @@
+from typing import *
 from src.state.state import State, change_game_board
+from src.algorithms.engine import SearchEngine, ALGORITHMS
+from src.algorithms.position_db import PositionDB
+from src.algorithms.background_search import BackgroundSearch, BackgroundPonder
 
 
 class Connect4Controller:
@@ -6,14 +10,24 @@ class Connect4Controller:
     Class representing a Connect 4 game controller.
     """
 
-    def __init__(self, wid, ht):
+    def __init__(self, wid, ht, engine: Optional[SearchEngine] = None, ponder: bool = False):
         """
         Initialize the Connect 4 game controller.
 
-        Initializes the game_state attribute using the State class.
+        Initializes the game_state attribute using the State class, and the ai agent search engine.
+
+        Args:
+            engine (SearchEngine): The engine searching the ai agent moves, it can be shared between the games
+                                   (e.g. to keep its transposition table), a new one is created if not given.
+            ponder (bool): Flag to search the replies of the player in the background after every ai agent move (see
+                           `SearchEngine.ponder`), so that the next ai agent move is found sooner.
         """
         change_game_board(wid, ht)
         self.game_state = State()
+        self.engine = engine if engine is not None else SearchEngine()
+        self.engine.new_game()
+        self.ponder = ponder
+        self.ponderer: Optional[BackgroundPonder] = None  # the running pondering, if any
 
     def play(self, col):
         """
@@ -56,3 +70,89 @@ class Connect4Controller:
         :type new_state: State
         """
         self.game_state = new_state
+
+    def set_ai_options(self, approach: str, k: int):
+        """
+        Selects the ai agent search algorithm and depth.
+
+        Args:
+            approach (str): The search algorithm name, one of the `ALGORITHMS` keys of the engine module.
+            k (int): The search depth.
+        """
+        assert approach in ALGORITHMS, f"Unknown approach {approach}"
+        if (approach, k) != (self.engine.approach, self.engine.k):  # the pondered searches are of the old options
+            self.stop_pondering()
+        self.engine.approach = approach
+        self.engine.k = k
+
+    def attach_database(self, file_path: str) -> PositionDB:
+        """
+        Opens a positions database file and attaches it to the ai agent engine, its best moves are played without
+        searching.
+
+        Args:
+            file_path (str): The path of the database file.
+
+        :return: PositionDB: The opened database.
+        """
+        database = PositionDB(file_path)
+        self.engine.attach_database(database)
+        return database
+
+    def ai_play(self, time_budget: Optional[float] = None):
+        """
+        Play the ai agent move in the Connect 4 game, searched with the selected algorithm and depth.
+
+        Args:
+            time_budget (float): The wall-clock budget of the search in seconds, None for no time limit.
+
+        :return: list: A 2D list representing the updated game state after the move.
+        """
+        self.stop_pondering()
+        self.set_state(self.engine.search(self.game_state, time_budget)[1])
+        self.start_pondering()
+        return self.game_state.to_2d()
+
+    def start_ai_search(self, time_budget: Optional[float] = None) -> BackgroundSearch:
+        """
+        Starts searching the ai agent move in a background thread, with the selected algorithm and depth, so that the
+        caller stays responsive. The move is played by `finish_ai_search` once the search is done.
+
+        Args:
+            time_budget (float): The wall-clock budget of the search in seconds, None for no time limit.
+
+        :return: BackgroundSearch: The running search, to be polled (and stopped with `move_now`).
+        """
+        self.stop_pondering()
+        return BackgroundSearch(self.engine, self.game_state, time_budget).start()
+
+    def finish_ai_search(self, search: BackgroundSearch):
+        """
+        Plays the ai agent move found by a background search (see `start_ai_search`), waiting for it if needed.
+
+        Args:
+            search (BackgroundSearch): The search.
+
+        :return: list: A 2D list representing the updated game state after the move.
+        """
+        search.join()
+        self.set_state(search.get_result()[1])
+        self.start_pondering()
+        return self.game_state.to_2d()
+
+    def start_pondering(self):
+        """
+        Starts searching the replies of the player in the background, if pondering is on and the game is not over. It
+        is stopped before the next ai agent search.
+        """
+        self.stop_pondering()
+        if self.ponder and self.game_state.legal_moves():
+            self.ponderer = BackgroundPonder(self.engine, self.game_state).start()
+
+    def stop_pondering(self):
+        """
+        Stops the running pondering, if any, and waits for it to be over.
+        """
+        if self.ponderer is not None:
+            ponderer, self.ponderer = self.ponderer, None  # forgotten even if it failed
+            ponderer.stop()
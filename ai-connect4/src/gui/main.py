@@ -3,6 +3,8 @@ from tkinter import messagebox, ttk
 from src.controller.controller import Connect4Controller
 from src.algorithms.minimax import *
 from src.algorithms.minimax_with_alpha_beta import *
+from src.algorithms.engine import SearchEngine, PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS
+from src.tree.tree_representation import RECORD_OFF, RECORD_FULL
 from src.state.state import State
 from src.utilities.get_score import *
 from typing import *
@@ -14,6 +16,15 @@ def toggle_minimax_tree_display():
     """
     global display_minimax_tree
     display_minimax_tree = not display_minimax_tree
+    engine.record_depth = RECORD_FULL if display_minimax_tree else RECORD_OFF  # no tree bookkeeping when hidden
+
+
+def toggle_pondering():
+    """
+    Toggle the pondering (searching the player replies in the background) of the next games.
+    """
+    global ponder
+    ponder = not ponder
 
 
 def create_board_canvas(game_window, rows, cols):
@@ -75,8 +86,8 @@ def column_click(event, canvas, controller, cell_size):
         Handle the click event on the game board column.
 
         First, it applies the human player move, specified by the mouse click position, after that
-        the chosen Ai agent method is being called, and the state is updated further by the created one from
-        the Ai method.
+        the chosen Ai agent method is started in the background, and the state is updated further by the created one
+        from the Ai method once it is done (see `poll_ai_agent`). The clicks are ignored while the Ai agent is thinking.
 
         :param event: The click event.
         :param canvas: The canvas displaying the game board.
@@ -86,20 +97,73 @@ def column_click(event, canvas, controller, cell_size):
         :param cell_size: Size of each cell on the board.
         :type cell_size: int
     """
+    if ai_search is not None:  # the Ai agent is thinking
+        return
+
     # Apply the user click
     controller.play(event.x // cell_size)
     update_game_board(canvas, controller, cell_size)
 
-    canvas.update()
+    # Start the Ai agent move
+    try:
+        ai_agent_play(controller)
+    except Exception as err:  # e.g. raised by the stopped pondering
+        thinking_label.config(text=f"Ai agent error: {err!r}")
+        return
+    canvas.config(cursor="watch")
+    move_now_button.config(state=tk.NORMAL)
+    canvas.after(POLL_INTERVAL_MS, poll_ai_agent, canvas, controller, cell_size)
+
+
+def poll_ai_agent(canvas, controller, cell_size):
+    """
+        Poll the Ai agent search running in the background.
+
+        While it runs, the thinking label shows its progress, and it is polled again later, once it is done, its move
+        is applied, and the clicks are accepted again.
+
+        :param canvas: The canvas displaying the game board.
+        :type canvas: tk.Canvas
+        :param controller: The game controller.
+        :type controller: Connect4Controller
+        :param cell_size: Size of each cell on the board.
+        :type cell_size: int
+    """
+    global ai_search
+    if not ai_search.done():
+        best_move = "-" if ai_search.best_move is None else ai_search.best_move
+        thinking_label.config(text=f"Thinking ... depth {ai_search.depth}/{controller.engine.k}\t"
+                                   f"nodes {ai_search.nodes:,}\tbest move {best_move}")
+        canvas.after(POLL_INTERVAL_MS, poll_ai_agent, canvas, controller, cell_size)
+        return
 
     # Apply the Ai agent move
-    controller.set_state(ai_agent_play(controller.get_state()))
+    search, ai_search = ai_search, None
+    try:
+        controller.finish_ai_search(search)
+    except Exception as err:  # raised by the search (or the pondering) thread, the clicks are accepted again
+        thinking_label.config(text=f"Ai agent error: {err!r}")
+        return
+    finally:
+        move_now_button.config(state=tk.DISABLED)
+        canvas.config(cursor="")
+    thinking_label.config(text=f"Depth {controller.engine.depth_reached}\tnodes {controller.engine.nodes:,}")
     update_game_board(canvas, controller, cell_size)
+    if display_minimax_tree and controller.engine.solver is not None:  # None when played from the opening book
+        controller.engine.solver.tree.display_tree()
 
     # Change the displayed score
     update_score_label(controller)
 
 
+def move_now():
+    """
+        Stop the Ai agent search, its best move of the last completed depth is played.
+    """
+    if ai_search is not None:
+        ai_search.move_now()
+
+
 def update_score_label(controller):
     global game_label, score_value
 
@@ -118,40 +182,37 @@ def update_score_label(controller):
                       bg="#34495e", fg="white")
 
 
-def ai_agent_play(state: State) -> State:
+def ai_agent_play(controller: Connect4Controller):
     """
-        Simulate the AI agent's move.
+        Start the AI agent's move.
 
-        :param state: The current state of the game.
-        :type state: State
+        The search is run in a background thread by the controller game engine, that keeps its transposition table
+        between the moves of the game, the move is applied once it is done (see `poll_ai_agent`).
 
-        :return: The updated state after the AI agent's move.
-        :rtype: State
+        :param controller: The game controller.
+        :type controller: Connect4Controller
     """
-    approach = var.get()
-    if approach == "Pure Minimax":
-        minimax_solver = Minimax(int(entry_k.get()))
-        new_state = minimax_solver.run_minimax(state)[1]
-        if display_minimax_tree:
-            minimax_solver.tree.display_tree()
-        return new_state
-    else:
-        minimax_ab_solver = MinimaxWithAlphaBeta(int(entry_k.get()))
-        new_state = minimax_ab_solver.run_minimax_with_alpha_beta(state)[1]
-        if display_minimax_tree:
-            minimax_ab_solver.tree.display_tree()
-        return new_state
+    global ai_search
+    controller.set_ai_options(var.get(), int(entry_k.get()))
+    time_budget = entry_time.get().strip()  # empty for no time limit
+    ai_search = controller.start_ai_search(float(time_budget) if time_budget else None)
+
 
+POLL_INTERVAL_MS = 100  # the interval between the polls of the Ai agent search
 
 game_label: tk.Label
+thinking_label: tk.Label
+move_now_button: tk.Button
 score_value = (0, 0)
+engine = SearchEngine()
+ai_search = None  # the running Ai agent search (BackgroundSearch), None when it is the player turn
 
 
 def start_game():
     """
         Start the Connect 4 game.
     """
-    global game_label, score_value
+    global game_label, thinking_label, move_now_button, score_value
     selected_option = var.get()  # Get the selected option (A or B)
     k_value = entry_k.get()  # Get the value of k
     rows = int(entry_rows.get())  # Get the value of rows
@@ -167,7 +228,7 @@ def start_game():
     game_window.configure(bg="#34495e")  # Change game window background color
 
     # Create the game board controller
-    controller = Connect4Controller(cols, rows)
+    controller = Connect4Controller(cols, rows, engine, ponder)
     canvas = create_board_canvas(game_window, rows, cols)
     update_game_board(canvas, controller, cell_size=4620 // (rows * cols))  # Initial board setup
 
@@ -185,6 +246,15 @@ def start_game():
                           bg="#34495e", fg="white")  # Change label background and text color
     game_label.pack(padx=20, pady=20)
 
+    # Label showing the progress of the Ai agent search
+    thinking_label = tk.Label(game_window, text="Your turn", font=(font_style, 14), bg="#34495e", fg="white")
+    thinking_label.pack(padx=20, pady=5)
+
+    # Button to stop the Ai agent search and play its best move so far
+    move_now_button = tk.Button(game_window, text="Move Now", command=move_now, bg=button_color, fg=text_color,
+                                font=(font_style, 16, "bold"), relief=tk.GROOVE, state=tk.DISABLED)
+    move_now_button.pack(pady=10)
+
     # Button to exit the game
     exit_game_button = tk.Button(game_window, text="Exit Game", command=exit_game, bg=button_color, fg=text_color,
                                  font=(font_style, 16, "bold"), relief=tk.GROOVE)
@@ -199,15 +269,16 @@ def select_option(option):
        :type option: str
    """
     var.set(option)
-    if option == "Pure Minimax":
-        option_pure_minimax.config(bg="#27ae60", relief=tk.SUNKEN, fg="white")
-        option_minimax_with.config(bg=button_color, relief=tk.RAISED, fg=text_color)
-    else:
-        option_minimax_with.config(bg="#27ae60", relief=tk.SUNKEN, fg="white")
-        option_pure_minimax.config(bg=button_color, relief=tk.RAISED, fg=text_color)
+    for name, button in option_buttons.items():
+        if name == option:
+            button.config(bg="#27ae60", relief=tk.SUNKEN, fg="white")
+        else:
+            button.config(bg=button_color, relief=tk.RAISED, fg=text_color)
 
 
 def exit_game():
+    if ai_search is not None:  # the search thread is a daemon, it is only asked to stop early
+        ai_search.move_now()
     root.destroy()
 
 
@@ -238,15 +309,25 @@ option_label.pack(pady=10)
 option_frame = tk.Frame(bottom_frame, bg=bg_color)
 option_frame.pack(pady=10)
 
-option_pure_minimax = tk.Button(option_frame, text="Pure Minimax", command=lambda: select_option("Pure Minimax"),
+option_pure_minimax = tk.Button(option_frame, text=PURE_MINIMAX, command=lambda: select_option(PURE_MINIMAX),
                                 bg=button_color, fg=text_color, font=(font_style, 22, "bold"), relief=tk.SUNKEN)
 option_pure_minimax.grid(row=0, column=0, padx=20, pady=5)
 
-option_minimax_with = tk.Button(option_frame, text="Minimax with Alpha-Beta Pruning",
-                                command=lambda: select_option("Minimax with Alpha-Beta Pruning"), bg=button_color,
+option_minimax_with = tk.Button(option_frame, text=MINIMAX_WITH_ALPHA_BETA,
+                                command=lambda: select_option(MINIMAX_WITH_ALPHA_BETA), bg=button_color,
                                 fg=text_color, font=(font_style, 22, "bold"), relief=tk.RAISED)
 option_minimax_with.grid(row=1, column=0, padx=20, pady=5)
 
+option_negamax = tk.Button(option_frame, text=NEGAMAX_PVS, command=lambda: select_option(NEGAMAX_PVS),
+                           bg=button_color, fg=text_color, font=(font_style, 22, "bold"), relief=tk.RAISED)
+option_negamax.grid(row=2, column=0, padx=20, pady=5)
+
+option_buttons = {
+    PURE_MINIMAX: option_pure_minimax,
+    MINIMAX_WITH_ALPHA_BETA: option_minimax_with,
+    NEGAMAX_PVS: option_negamax,
+}
+
 entry_label_k = tk.Label(top_frame, text="K:", fg=white_color, bg=bg_color, font=(font_style, 26))
 entry_label_k.pack(pady=10, side=tk.LEFT, padx=20)
 
@@ -268,7 +349,14 @@ entry_cols = tk.Entry(top_frame, font=(font_style, 22), justify='center', width=
 entry_cols.pack(side=tk.LEFT, padx=10)
 entry_cols.insert(0, "7")
 
-select_option("Pure Minimax")
+entry_label_time = tk.Label(top_frame, text="Time (s):", fg=white_color, bg=bg_color, font=(font_style, 26))
+entry_label_time.pack(pady=10, side=tk.LEFT, padx=20)
+
+entry_time = tk.Entry(top_frame, font=(font_style, 22), justify='center', width=5, fg="black")
+entry_time.pack(side=tk.LEFT, padx=10)
+entry_time.insert(0, "5")
+
+select_option(PURE_MINIMAX)
 
 display_minimax_tree = False
 tree_display_checkbox = tk.Checkbutton(
@@ -277,6 +365,13 @@ tree_display_checkbox = tk.Checkbutton(
     )
 tree_display_checkbox.pack(pady=10)
 
+ponder = False
+ponder_checkbox = tk.Checkbutton(
+        bottom_frame, text="Think on Player Time", command=toggle_pondering,
+        bg=button_color, fg=text_color, font=(font_style, 22)
+    )
+ponder_checkbox.pack(pady=10)
+
 start_button = tk.Button(bottom_frame, text="Start Game", command=start_game, bg=button_color, fg=text_color,
                          font=(font_style, 28, "bold"), relief=tk.GROOVE)
 start_button.pack(pady=30)
@@ -0,0 +1,348 @@
+"""
+Connect 4 Bitboard State Module
+
+This module provides `BitboardState`, a second backend for the Connect 4 game state that exposes the same public API
+as `State` (`update_col`, `get_successors`, `to_2d`, `is_computer_turn`, `get_value`) but keeps the board in the
+classic two-bitboard layout, so that applying a move and detecting a four-in-a-row are constant-time operations.
+
+Bitboard Layout:
+    Every column takes HEIGHT + 1 consecutive bits, the extra (sentinel) bit on top of each column is always 0 so that
+    shifted masks never wrap from one column into the next one. The bit index of a cell is `col * (HEIGHT + 1) + row`,
+    where row 0 is the bottom row.
+
+        - `mask`: a bit is set for every occupied cell.
+        - `current`: a bit is set for every disc of the player whose turn it is.
+
+    All the shifts and masks are read from the precomputed `BoardGeometry` of the board size.
+
+Besides the bitboards, the packed integer used by `State` is maintained alongside every move, so that `get_value`
+returns exactly the same key as `State.get_value` for the same board, and both backends can be used interchangeably.
+The packed integer of the left to right mirror of the board is maintained as well, so that `get_canonical_value` is a
+constant-time operation.
+
+Class:
+- `BitboardState`: Represents the state of the Connect 4 game using bitboards.
+    - `__init__`: Initializes the game state (optionally decoding a `State` integer value).
+    - `get_value`: Returns the `State` compatible integer value.
+    - `get_canonical_value`: Returns the value shared by the state and its left to right mirror.
+    - `update_col`: Updates the game state based on a selected column.
+    - `get_successors`: Generates possible successor states.
+    - `to_2d`: Converts the bitboards to a 2D array.
+    - `is_computer_turn`: Returns the current state turn player.
+    - `play`: Applies a move in place (make move).
+    - `undo`: Takes back the last move played in a column (unmake move).
+    - `legal_moves`: Returns the playable columns.
+    - `is_full`: Checks whether the board is full.
+    - `copy`: Returns a copy of the state.
+    - `get_player_masks`: Returns the computer and human bitboards.
+    - `has_four`: Checks in constant time whether a bitboard contains four in a row.
+    - `count_fours`: Counts the four in a row sequences of a bitboard.
+    - `get_scores`: Returns the game score of both players.
+    - `threats`: Returns the playable cells completing a four in a row of each player.
+    - `threat_moves`: Returns the moves completing or stopping a four in a row.
+"""
+
+from src.state import state as state_module
+from src.state.geometry import get_geometry
+
+
+class BitboardState:
+    __slots__ = ('mask', 'current', 'comp_turn', 'value', 'mirror', 'geometry')
+
+    def __init__(self, comp_turn=False, state_val=0):
+        """
+            Initializes the game state.
+
+            The board dimensions are read from the global dimensions of the `state` module, that is, the ones set
+            through `change_game_board`.
+
+            :param comp_turn: Flag indicating the current player's turn. Defaults to False.
+            :type comp_turn: bool
+            :param state_val: Initial state representation, in the `State` integer format. Defaults to 0.
+            :type state_val: int
+        """
+        self.geometry = get_geometry(state_module.WIDTH, state_module.HEIGHT)
+        self.comp_turn = comp_turn
+        self.value = state_val
+        self.mirror = self.geometry.mirror_value(state_val)
+        self.mask = 0
+        self.current = 0
+        if state_val:
+            self._decode(state_val)
+
+    # ---------------------- Public Methods ----------------------
+    def get_value(self):
+        """
+        Returns the current state integer value (identical to the one of `State` for the same board)
+        :return: State Integer Value
+        :rtype: int
+        """
+        return self.value
+
+    def get_canonical_value(self):
+        """
+            Returns the canonical value of the state, that is, the smallest of its value and of the value of its left
+            to right mirror (identical to `State.get_canonical_value` for the same board).
+
+            :return: Tuple of the canonical value and whether it is the mirror value.
+            :rtype: Tuple[int, bool]
+        """
+        return (self.mirror, True) if self.mirror < self.value else (self.value, False)
+
+    def update_col(self, col, change_turn=False):
+        """
+            Updates the game state based on a selected column.
+
+            :param col: Column index.
+            :type col: int
+            :param change_turn: Flag to change the player's turn. Defaults to False.
+            :type change_turn: bool
+        """
+        geometry = self.geometry
+        assert 0 <= col < geometry.width and not self.mask & geometry.top_masks[col], "Invalid cell was given"
+
+        new_mask = self.mask | (self.mask + geometry.bottom_masks[col])
+        move = new_mask ^ self.mask
+        row = move.bit_length() - 1 - col * geometry.h1
+
+        if not self.comp_turn:
+            self.value |= 1 << geometry.cell_shifts[row][col]
+            self.mirror |= 1 << geometry.mirror_cell_shifts[row][col]
+        self.value += 1 << geometry.height_shifts[col]
+        self.mirror += 1 << geometry.mirror_height_shifts[col]
+
+        if change_turn:
+            # the new disc is not part of the current player bitboard, so after the swap it belongs to the mover
+            self.current ^= self.mask
+            self.comp_turn = not self.comp_turn
+        else:
+            self.current |= move
+        self.mask = new_mask
+
+    def get_successors(self):
+        """
+            Generates possible successor states.
+
+            :return: List of possible successor states.
+            :rtype: list
+        """
+        successors = []
+        for col_idx in self.legal_moves():
+            temp_state = self.copy()
+            temp_state.play(col_idx)
+            successors.append(temp_state)
+        return successors
+
+    def to_2d(self):
+        """
+            Converts the bitboards to a 2D array.
+
+            :return: 2D representation of the game state.
+            :rtype: list
+        """
+        h1 = self.geometry.h1
+        computer, _ = self.get_player_masks()
+        state_2d = []
+        for row_idx in range(self.geometry.height - 1, -1, -1):
+            state_2d.append([])
+            for col_idx in range(self.geometry.width):
+                bit = 1 << (col_idx * h1 + row_idx)
+                if not self.mask & bit:
+                    state_2d[-1].append(0)
+                elif computer & bit:
+                    state_2d[-1].append(1)
+                else:
+                    state_2d[-1].append(2)
+        return state_2d
+
+    def is_computer_turn(self):
+        """
+            Returns the current state turn player.
+
+            :return: True if it's the computer's turn, False otherwise.
+            :rtype: bool
+        """
+        return self.comp_turn
+
+    def play(self, col):
+        """
+            Applies a move in place, dropping the current player disc in the given column and changing the turn.
+
+            Unlike `update_col`, the column is not validated, it has to be one of the `legal_moves`.
+
+            :param col: Column index.
+            :type col: int
+
+            :return: The row index the disc landed in.
+            :rtype: int
+        """
+        geometry = self.geometry
+        move = (self.mask + geometry.bottom_masks[col]) & geometry.column_masks[col]
+        row = move.bit_length() - 1 - col * geometry.h1
+        if not self.comp_turn:
+            self.value |= 1 << geometry.cell_shifts[row][col]
+            self.mirror |= 1 << geometry.mirror_cell_shifts[row][col]
+        self.value += 1 << geometry.height_shifts[col]
+        self.mirror += 1 << geometry.mirror_height_shifts[col]
+        self.current ^= self.mask
+        self.mask |= move
+        self.comp_turn = not self.comp_turn
+        return row
+
+    def undo(self, col):
+        """
+            Takes back the last disc dropped in the given column, and gives the turn back to its player.
+
+            :param col: Column index.
+            :type col: int
+
+            :return: The row index the disc was removed from.
+            :rtype: int
+        """
+        geometry = self.geometry
+        row = (self.mask & geometry.column_masks[col]).bit_length() - 1 - col * geometry.h1
+        self.mask ^= 1 << (col * geometry.h1 + row)
+        self.current ^= self.mask
+        self.comp_turn = not self.comp_turn
+        if not self.comp_turn:
+            self.value ^= 1 << geometry.cell_shifts[row][col]
+            self.mirror ^= 1 << geometry.mirror_cell_shifts[row][col]
+        self.value -= 1 << geometry.height_shifts[col]
+        self.mirror -= 1 << geometry.mirror_height_shifts[col]
+        return row
+
+    def legal_moves(self):
+        """
+            Returns the playable (not full) columns.
+
+            :return: List of the playable columns indices, in increasing order.
+            :rtype: list
+        """
+        mask = self.mask
+        top = self.geometry.top_masks
+        return [col for col in range(self.geometry.width) if not mask & top[col]]
+
+    def is_full(self):
+        """
+            Checks whether all the board columns are full.
+
+            :return: True if there is no playable column.
+            :rtype: bool
+        """
+        return self.mask == self.geometry.board_mask
+
+    def copy(self):
+        """
+            Returns a copy of the state.
+
+            :return: Copy of the state.
+            :rtype: BitboardState
+        """
+        other = BitboardState.__new__(BitboardState)
+        other.mask = self.mask
+        other.current = self.current
+        other.comp_turn = self.comp_turn
+        other.value = self.value
+        other.mirror = self.mirror
+        other.geometry = self.geometry
+        return other
+
+    def get_player_masks(self):
+        """
+            Returns the bitboards of both players.
+
+            :return: Tuple of the computer discs bitboard and the human discs bitboard.
+            :rtype: Tuple[int, int]
+        """
+        if self.comp_turn:
+            return self.current, self.mask ^ self.current
+        return self.mask ^ self.current, self.current
+
+    def has_four(self, bitboard):
+        """
+            Checks whether the given bitboard contains four discs in a row, in any direction.
+
+            :param bitboard: Bitboard of a single player discs.
+            :type bitboard: int
+
+            :return: True if there is at least one four in a row.
+            :rtype: bool
+        """
+        return self.geometry.has_four(bitboard)
+
+    def count_fours(self, bitboard):
+        """
+            Counts the four in a row sequences of the given bitboard, in all directions.
+
+            A sequence of n >= 4 consecutive discs is counted as n - 3 sequences, as it is counted by `get_game_score`.
+
+            :param bitboard: Bitboard of a single player discs.
+            :type bitboard: int
+
+            :return: Number of four in a row sequences.
+            :rtype: int
+        """
+        return self.geometry.count_fours(bitboard)
+
+    def get_scores(self):
+        """
+            Returns the game score of both players.
+
+            :return: Tuple of the computer score and the human score.
+            :rtype: Tuple[int, int]
+        """
+        computer, human = self.get_player_masks()
+        return self.count_fours(computer), self.count_fours(human)
+
+    def threats(self):
+        """
+            Returns the threats of both players, that is, the playable cells (the lowest empty cell of every column)
+            that would complete a four in a row.
+
+            :return: Tuple of the bitboards of the threats of the player to move and of its opponent.
+            :rtype: Tuple[int, int]
+        """
+        geometry = self.geometry
+        playable = (self.mask + geometry.bottom_row) & geometry.board_mask
+        return (geometry.winning_cells(self.current, self.mask) & playable,
+                geometry.winning_cells(self.mask ^ self.current, self.mask) & playable)
+
+    def threat_moves(self):
+        """
+            Returns the tactical moves of the player to move: the moves completing a four in a row first, then the
+            moves stopping a four in a row of the opponent.
+
+            As the game goes on until the board is full (the fours are counted), these moves are not forced, they are
+            only the most promising ones.
+
+            :return: List of the columns of the tactical moves.
+            :rtype: list
+        """
+        own, opponent = self.threats()
+        if not own | opponent:
+            return []
+        column_masks = self.geometry.column_masks
+        moves = [col for col in range(self.geometry.width) if own & column_masks[col]]
+        moves += [col for col in range(self.geometry.width)
+                  if opponent & column_masks[col] and not own & column_masks[col]]
+        return moves
+
+    # ---------------------- Private Methods ----------------------
+    def _decode(self, state_val):
+        """
+            Builds the bitboards out of a `State` integer value.
+
+            :param state_val: State integer value.
+            :type state_val: int
+        """
+        geometry = self.geometry
+        computer = 0
+        for col in range(geometry.width):
+            col_height = (state_val & geometry.height_masks[col]) >> geometry.height_shifts[col]
+            assert col_height <= geometry.height, "Invalid state value was given"
+            for row in range(col_height):
+                bit = 1 << (col * geometry.h1 + row)
+                self.mask |= bit
+                if not (state_val >> geometry.cell_shifts[row][col]) & 1:
+                    computer |= bit
+        self.current = computer if self.comp_turn else self.mask ^ computer
@@ -0,0 +1,262 @@
+"""
+Connect 4 Board Geometry Module
+
+This module precomputes, once per board size, every shift offset and bitmask that the game state backends, the
+heuristic and the scorer need, so that none of them derives offsets from the board dimensions on every call.
+
+Module Functions:
+    - Public Methods:
+        - `get_geometry`: Returns the (cached) geometry of a given board size.
+
+Class:
+- `BoardGeometry`: Holds the precomputed tables of a single board size.
+    - `State` packed integer tables: `col_bits`, `cell_shifts`, `height_shifts`, `height_masks`.
+    - `mirror_value`: Mirrors a packed integer state left to right.
+    - `canonical_value`: Returns the smallest of a packed integer state and of its mirror.
+    - `swap_players`: Swaps the discs of both players of a packed integer state.
+    - Mirrored `State` tables: `mirror_cell_shifts`, `mirror_height_shifts` (the shifts of the mirrored cells).
+    - Bitboard tables: `bottom_masks`, `top_masks`, `column_masks`, `bottom_row`, `board_mask`, `directions`.
+    - Windows: `windows` (every length-4 window as a bitboard mask) and `cell_windows` (windows passing by a cell).
+    - Heuristic lines: `row_lines`, `column_lines`, `diagonal_lines` (cells of the lines scanned by the heuristic).
+    - `has_four`: Checks in constant time whether a bitboard contains four in a row.
+    - `count_fours`: Counts the four in a row sequences of a bitboard.
+    - `winning_cells`: Returns the empty cells completing a four in a row of a bitboard.
+    - `to_bitboard`: Converts a player discs of a 2D board into a bitboard.
+
+PS: the 2D coordinates used by the heuristic lines are the ones of `State.to_2d`, that is, row 0 is the top row, while
+the bitboard and the packed integer coordinates consider row 0 as the bottom row.
+"""
+
+import math
+
+_geometries = {}
+
+
+def get_geometry(width, height):
+    """
+        Returns the geometry of the given board size, building it only the first time it is requested.
+
+        :param width: Board width.
+        :type width: int
+        :param height: Board height.
+        :type height: int
+
+        :return: The board geometry.
+        :rtype: BoardGeometry
+    """
+    geometry = _geometries.get((width, height))
+    if geometry is None:
+        geometry = _geometries[(width, height)] = BoardGeometry(width, height)
+    return geometry
+
+
+class BoardGeometry:
+    def __init__(self, width, height):
+        """
+            Builds all the tables of the given board size.
+
+            :param width: Board width.
+            :type width: int
+            :param height: Board height.
+            :type height: int
+        """
+        self.width = width
+        self.height = height
+
+        # State packed integer = [h0 C0 C1 ... C H-1 ... h W-1 C0 C1 ... C H-1] bits
+        self.h_i_bits_count = math.ceil(math.log2(height + 1))
+        col_bits = height + self.h_i_bits_count
+        self.col_bits = col_bits
+        self.cell_shifts = tuple(
+            tuple((width - 1 - col) * col_bits + row for col in range(width)) for row in range(height)
+        )
+        self.height_shifts = tuple(height + (width - 1 - col) * col_bits for col in range(width))
+        self.height_masks = tuple(((1 << self.h_i_bits_count) - 1) << shift for shift in self.height_shifts)
+        # the shifts of the cells of the left to right mirror, to keep a mirrored packed integer up to date
+        self.mirror_cell_shifts = tuple(tuple(reversed(row_shifts)) for row_shifts in self.cell_shifts)
+        self.mirror_height_shifts = tuple(reversed(self.height_shifts))
+
+        # Bitboards, every column has an extra sentinel bit on top of it
+        self.h1 = height + 1
+        self.bottom_masks = tuple(1 << (col * self.h1) for col in range(width))
+        self.top_masks = tuple(1 << (height - 1 + col * self.h1) for col in range(width))
+        self.column_masks = tuple(((1 << height) - 1) << (col * self.h1) for col in range(width))
+        self.bottom_row = sum(self.bottom_masks)
+        self.board_mask = sum(self.column_masks)
+        self.directions = (1, self.h1, self.h1 - 1, self.h1 + 1)  # vertical, horizontal, both diagonals
+
+        self.windows = tuple(self._build_windows())
+        cell_windows = [[] for _ in range(width * self.h1)]
+        for window_idx, window in enumerate(self.windows):
+            for bit_idx in range(width * self.h1):
+                if window >> bit_idx & 1:
+                    cell_windows[bit_idx].append(window_idx)
+        self.cell_windows = tuple(tuple(windows) for windows in cell_windows)
+
+        self.row_lines = tuple(tuple((row, col) for col in range(width)) for row in range(height))
+        self.column_lines = tuple(tuple((row, col) for row in range(height)) for col in range(width))
+        self.diagonal_lines = tuple(self._build_diagonal_lines())
+
+    # ---------------------- Public Methods ----------------------
+    def has_four(self, bitboard):
+        """
+            Checks whether the given bitboard contains four discs in a row, in any direction.
+
+            :param bitboard: Bitboard of a single player discs.
+            :type bitboard: int
+
+            :return: True if there is at least one four in a row.
+            :rtype: bool
+        """
+        for shift in self.directions:
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    def count_fours(self, bitboard):
+        """
+            Counts the four in a row sequences of the given bitboard, in all directions.
+
+            A sequence of n >= 4 consecutive discs is counted as n - 3 sequences, as it is counted by `get_game_score`.
+
+            :param bitboard: Bitboard of a single player discs.
+            :type bitboard: int
+
+            :return: Number of four in a row sequences.
+            :rtype: int
+        """
+        count = 0
+        for shift in self.directions:
+            pairs = bitboard & (bitboard >> shift)
+            count += bin(pairs & (pairs >> (2 * shift))).count('1')
+        return count
+
+    def winning_cells(self, bitboard, mask):
+        """
+            Returns the empty cells that would complete a four in a row of the given discs (in any direction), that is,
+            the empty cell of every window holding 3 of the discs.
+
+            :param bitboard: Bitboard of a single player discs.
+            :type bitboard: int
+            :param mask: Bitboard of all the discs.
+            :type mask: int
+
+            :return: Bitboard of the winning cells.
+            :rtype: int
+        """
+        cells = (bitboard << 1) & (bitboard << 2) & (bitboard << 3)  # vertical, the cell on top of 3 discs
+        for shift in self.directions[1:]:
+            pairs = (bitboard << shift) & (bitboard << 2 * shift)
+            cells |= pairs & (bitboard << 3 * shift)  # the cell after 3 discs
+            cells |= pairs & (bitboard >> shift)  # the cell between 2 discs and 1 disc
+            pairs = (bitboard >> shift) & (bitboard >> 2 * shift)
+            cells |= pairs & (bitboard << shift)  # the cell between 1 disc and 2 discs
+            cells |= pairs & (bitboard >> 3 * shift)  # the cell before 3 discs
+        return cells & (self.board_mask ^ mask)
+
+    def mirror_value(self, state_val):
+        """
+            Mirrors a packed integer state left to right, that is, reverses the order of its columns.
+
+            As every column (its height and cells) is a fixed-size field of the packed integer, mirroring just reverses
+            the order of the fields.
+
+            :param state_val: The packed integer state (as returned by `State.get_value`).
+            :type state_val: int
+
+            :return: The packed integer of the mirrored state.
+            :rtype: int
+        """
+        col_bits = self.col_bits
+        field_mask = (1 << col_bits) - 1
+        mirrored = 0
+        for _ in range(self.width):
+            mirrored = (mirrored << col_bits) | (state_val & field_mask)
+            state_val >>= col_bits
+        return mirrored
+
+    def canonical_value(self, state_val):
+        """
+            Returns the canonical packed integer of a state, that is, the smallest of its value and of its mirror value,
+            so that a position and its mirror (which have the same value and mirrored best moves) share the same key.
+
+            :param state_val: The packed integer state (as returned by `State.get_value`).
+            :type state_val: int
+
+            :return: Tuple of the canonical packed integer and whether it is the mirror value.
+            :rtype: Tuple[int, bool]
+        """
+        mirrored = self.mirror_value(state_val)
+        return (mirrored, True) if mirrored < state_val else (state_val, False)
+
+    def swap_players(self, state_val):
+        """
+            Swaps the computer and the human discs of a packed integer state, e.g. to let an engine (which always plays
+            the computer discs) play the human side.
+
+            :param state_val: The packed integer state (as returned by `State.get_value`).
+            :type state_val: int
+
+            :return: The packed integer of the state with the players swapped.
+            :rtype: int
+        """
+        occupied = 0
+        for col in range(self.width):
+            col_height = (state_val & self.height_masks[col]) >> self.height_shifts[col]
+            occupied |= ((1 << col_height) - 1) << self.cell_shifts[0][col]
+        return state_val ^ occupied
+
+    def to_bitboard(self, state_2d, player_piece):
+        """
+            Converts the discs of a single player of a 2D board into a bitboard.
+
+            :param state_2d: 2D representation of the game state (as returned by `State.to_2d`).
+            :type state_2d: list
+            :param player_piece: The player piece number.
+            :type player_piece: int
+
+            :return: Bitboard of the player discs.
+            :rtype: int
+        """
+        bitboard = 0
+        for row_idx, row in enumerate(state_2d):
+            bit_row = self.height - 1 - row_idx
+            for col_idx, cell in enumerate(row):
+                if cell == player_piece:
+                    bitboard |= 1 << (col_idx * self.h1 + bit_row)
+        return bitboard
+
+    # ---------------------- Private Methods ----------------------
+    def _build_windows(self):
+        """
+            Generates every length-4 window of the board (rows, columns and both diagonals) as a bitboard mask.
+        """
+        for col in range(self.width):
+            for row in range(self.height):
+                for d_col, d_row in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_col, end_row = col + 3 * d_col, row + 3 * d_row
+                    if end_col < self.width and 0 <= end_row < self.height:
+                        yield sum(1 << ((col + i * d_col) * self.h1 + row + i * d_row) for i in range(4))
+
+    def _build_diagonal_lines(self):
+        """
+            Generates the diagonals scanned by the heuristic, starting from every boundary point of the 2D board and
+            moving up-left and up-right. Lines shorter than 4 cells are skipped as they can never hold a window.
+        """
+        boundary_pts = []
+        for row in range(self.height):
+            boundary_pts.append((row, 0))
+            boundary_pts.append((row, self.width - 1))
+        for col in range(1, self.width):
+            boundary_pts.append((0, col))
+
+        for pt_row, pt_col in boundary_pts:
+            for d_col in (-1, 1):
+                line = []
+                row, col = pt_row, pt_col
+                while 0 <= row and 0 <= col < self.width:
+                    line.append((row, col))
+                    row, col = row - 1, col + d_col
+                if len(line) > 3:
+                    yield tuple(line)
@@ -11,6 +11,8 @@ Module Functions:
         - `_check_valid_indices`: Validates row and column indices for the game board.
         - `_get_cell_shift`: Computes the bit shift for a specific cell in the game state.
 
+The shifts and masks of the current board size are read from its precomputed `BoardGeometry` (see `geometry.py`).
+
 Class:
 - `State`: Represents the state of the Connect 4 game.
     - `__init__`: Initializes the game state.
@@ -18,6 +20,12 @@ Class:
     - `to_2d`: Converts the internal state representation to a 2D array.
     - `is_computer_turn`: Returns the current state turn player.
     - `update_col`: Updates the game state based on a selected column.
+    - `play`: Applies a move in place (make move).
+    - `undo`: Takes back the last move played in a column (unmake move).
+    - `legal_moves`: Returns the playable columns.
+    - `is_full`: Checks whether the board is full.
+    - `copy`: Returns a copy of the state.
+    - `get_canonical_value`: Returns the value shared by the state and its left to right mirror.
 
 Private Methods (in the State class):
 - `_update_height`: Manages the internal representation of column heights.
@@ -32,10 +40,11 @@ by a 0 value, while the computer and player discs with 1 and 2 values respective
 """
 
 
-import math
+from src.state.geometry import get_geometry
 
 WIDTH = 7
 HEIGHT = 6
+_geometry = get_geometry(WIDTH, HEIGHT)
 
 
 # Public
@@ -48,9 +57,10 @@ def change_game_board(wid, ht):
         :param ht: New height for the game board.
         :type ht: int
     """
-    global WIDTH, HEIGHT
+    global WIDTH, HEIGHT, _geometry
     WIDTH = wid
     HEIGHT = ht
+    _geometry = get_geometry(WIDTH, HEIGHT)
 
 
 class State:
@@ -113,13 +123,10 @@ class State:
             :rtype: list
         """
         successors = []
-        for col_idx in range(WIDTH):
-            try:
-                temp_state = State(state_val=self.value, comp_turn=self.is_computer_turn())
-                temp_state.update_col(col_idx, True)
-                successors.append(temp_state)
-            except AssertionError:
-                pass
+        for col_idx in self.legal_moves():
+            temp_state = State(state_val=self.value, comp_turn=self.is_computer_turn())
+            temp_state.update_col(col_idx, True)
+            successors.append(temp_state)
         return successors
 
     def to_2d(self):
@@ -146,6 +153,76 @@ class State:
         """
         return self.comp_turn
 
+    def play(self, col):
+        """
+            Applies a move in place, dropping the current player disc in the given column and changing the turn.
+
+            :param col: Column index.
+            :type col: int
+
+            :return: The row index the disc landed in.
+            :rtype: int
+        """
+        row = self._get_height(col)
+        self.update_col(col, True)
+        return row
+
+    def undo(self, col):
+        """
+            Takes back the last disc dropped in the given column, and gives the turn back to its player.
+
+            :param col: Column index.
+            :type col: int
+
+            :return: The row index the disc was removed from.
+            :rtype: int
+        """
+        row = self._get_height(col) - 1
+        _check_valid_indices(row, col)
+        self.value &= ~(1 << _geometry.cell_shifts[row][col])
+        self.value -= 1 << _geometry.height_shifts[col]
+        self.comp_turn = not self.comp_turn
+        return row
+
+    def legal_moves(self):
+        """
+            Returns the playable (not full) columns.
+
+            :return: List of the playable columns indices, in increasing order.
+            :rtype: list
+        """
+        return [col for col in range(WIDTH)
+                if (_geometry.height_masks[col] & self.value) >> _geometry.height_shifts[col] < HEIGHT]
+
+    def is_full(self):
+        """
+            Checks whether all the board columns are full.
+
+            :return: True if there is no playable column.
+            :rtype: bool
+        """
+        return not self.legal_moves()
+
+    def copy(self):
+        """
+            Returns a copy of the state.
+
+            :return: Copy of the state.
+            :rtype: State
+        """
+        return State(self.comp_turn, self.value)
+
+    def get_canonical_value(self):
+        """
+            Returns the canonical value of the state, that is, the smallest of its value and of the value of its left
+            to right mirror (a mirrored position has the same value and mirrored best moves).
+
+            :return: Tuple of the canonical value and whether it is the mirror value (the columns of the moves stored
+                     for it have to be mirrored, col -> WIDTH - 1 - col).
+            :rtype: Tuple[int, bool]
+        """
+        return _geometry.canonical_value(self.value)
+
     # ---------------------- Private Methods ----------------------
     def _update_height(self, col):
         """
@@ -157,10 +234,7 @@ class State:
             :param col: Column index.
             :type col: int
         """
-        mirrored_col = WIDTH - 1 - col  # 0 => 3 ,, 1 => 2 etc..
-        h_i_bits_count = math.ceil(math.log2(HEIGHT + 1))  # e.g. 3 bits
-        shift_len = HEIGHT + (mirrored_col * (h_i_bits_count + HEIGHT))
-        self.value += (1 << shift_len)
+        self.value += (1 << _geometry.height_shifts[col])
 
     def _get_height(self, col):
         """
@@ -177,11 +251,8 @@ class State:
         """
         # User see board columns indices as: 0 1 2 3
         # Integer Representation see board columns indices as: 3 2 1 0
-        h_i_bits_count = math.ceil(math.log2(HEIGHT + 1))  # e.g. 3 bits
-        h_i_bits = (1 << h_i_bits_count) - 1  # e.g. if 3 bits => 111
-        shift_len = HEIGHT + _get_cell_shift(0, col)
-        h_i = ((h_i_bits << shift_len) & self.value) >> shift_len
-        return h_i
+        _check_valid_indices(0, col)
+        return (_geometry.height_masks[col] & self.value) >> _geometry.height_shifts[col]
 
     def _get_cell_val(self, row, col, in_decimal=False):    # 0 > empty, 1 > computer, 2 > person
         """
@@ -253,6 +324,4 @@ def _get_cell_shift(row, col):
         :rtype: int
     """
     _check_valid_indices(row, col)
-    mirrored_col = WIDTH - 1 - col  # 0 => 3 ,, 1 => 2 etc..
-    h_i_bits_count = math.ceil(math.log2(HEIGHT + 1))  # e.g. 3 bits
-    return mirrored_col * (HEIGHT + h_i_bits_count) + row
+    return _geometry.cell_shifts[row][col]
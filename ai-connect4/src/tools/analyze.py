@@ -0,0 +1,251 @@
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.geometry import get_geometry
+from src.tools.match import EngineConfig
+
+"""
+Connect 4 Batch Analysis
+
+This script analyzes many positions without the GUI: every position is searched by an engine configuration (see
+`EngineConfig`), and its best move, score, search depth, visited nodes and search time are written as one JSON object
+per line (JSON Lines), in the input order.
+
+The positions are read one per line, in one of the `FORMATS`:
+    - moves: the columns played in order from the empty board, the human playing first, e.g. "334" (or separated by
+      commas or spaces, e.g. "3,3,10", for the boards wider than 10 columns).
+    - values: the `State.get_value()` integer of the position, the player to move being told by the number of discs
+      (the human playing first, so the computer moves when the number of discs is odd).
+The blank lines are skipped, the invalid positions are written with an "error" instead of the analysis.
+
+The best move and the score are given for the player to move, whoever it is: the engine always searches for the
+computer discs, so the positions of the human turn are searched with the players swapped (see
+`BoardGeometry.swap_players`).
+
+The input is streamed: the positions are read, sent to the worker processes by chunks, and written as soon as their
+chunk is done, with only a few chunks per worker in flight, so that files of millions of positions can be analyzed
+in constant memory. Every worker keeps its engine (and its transposition table) for all its positions.
+
+Usage (from the project root):
+    python -m src.tools.analyze positions.txt --engine alphabeta:8 --workers 4 --output results.jsonl
+    python -m src.tools.analyze values.txt --format values --width 9 --height 8 --engine negamax:6:0.5
+
+"""
+
+FORMATS = ("moves", "values")
+
+_CHUNKS_PER_WORKER = 2  # the number of chunks in flight per worker process
+
+_worker_engine = None
+_worker_config: Optional[EngineConfig] = None
+_worker_format = FORMATS[0]
+
+
+def parse_position(line: str, width: int, height: int, position_format: str = "moves") -> State:
+    """
+    Parses a position of the current board size (see `FORMATS`).
+
+    :param line: The position, without its end of line.
+    :type line: str
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param position_format: The position format, one of `FORMATS`.
+    :type position_format: str
+    :return: The state of the position.
+    :rtype: State
+    :raises ValueError: if the position is invalid.
+    """
+    geometry = get_geometry(width, height)
+    if position_format == "values":
+        value = int(line)
+        if not 0 <= value < 1 << (width * geometry.col_bits):
+            raise ValueError(f"Invalid state value {value}")
+        discs = 0
+        for mask, shift in zip(geometry.height_masks, geometry.height_shifts):
+            col_height = (value & mask) >> shift
+            if col_height > height:
+                raise ValueError(f"Invalid state value {value}")
+            discs += col_height
+        return State(discs % 2 == 1, value)
+
+    moves = line.replace(",", " ").split() if ("," in line or " " in line) else list(line)
+    state = State()
+    heights = [0] * width
+    for move in moves:
+        col = int(move)
+        if not 0 <= col < width or heights[col] == height:
+            raise ValueError(f"Invalid move {move}")
+        heights[col] += 1
+        state.update_col(col, True)
+    return state
+
+
+def analyze_position(engine, state: State, time_budget: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Searches the best move of the player to move in a position of the current board size.
+
+    :param engine: The search engine (`SearchEngine`).
+    :param state: The position.
+    :type state: State
+    :param time_budget: The wall-clock budget of the search in seconds. Defaults to None (no time limit).
+    :type time_budget: float
+    :return: The analysis: the best move, its score (for the player to move), the search depth, the visited nodes and
+             the search time in seconds.
+    :raises ValueError: if the game is over.
+    """
+    if not state.legal_moves():
+        raise ValueError("The game is over")
+    if not state.is_computer_turn():
+        geometry = get_geometry(state_module.WIDTH, state_module.HEIGHT)
+        state = State(True, geometry.swap_players(state.get_value()))
+    best = []
+    start = time.perf_counter()
+    score, _ = engine.search(state, time_budget, progress=lambda depth, move, value: best.append(move))
+    seconds = time.perf_counter() - start
+    return {
+        "best_move": best[-1],
+        "score": score,
+        "depth": engine.depth_reached,
+        "nodes": engine.nodes,
+        "time": seconds,
+    }
+
+
+def analyze_lines(lines: Iterable[str], config: EngineConfig, width: int = 7, height: int = 6,
+                  position_format: str = "moves", workers: int = 1, chunk_size: int = 64) -> Iterator[Dict[str, Any]]:
+    """
+    Analyzes the positions of the given lines, lazily and in order.
+
+    :param lines: The positions, one per line (see `FORMATS`), e.g. an open file.
+    :param config: The engine configuration.
+    :type config: EngineConfig
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param position_format: The positions format, one of `FORMATS`.
+    :type position_format: str
+    :param workers: The number of worker processes, 1 to analyze the positions in the calling process.
+    :type workers: int
+    :param chunk_size: The number of positions sent to a worker at once.
+    :type chunk_size: int
+    :return: Iterator of the analyses (see `analyze_position`), along with their "position" line, or of the "error"
+             of the invalid positions.
+    """
+    assert position_format in FORMATS, f"Unknown format {position_format}"
+    positions = (line.strip() for line in lines if line.strip())
+    board_size = (state_module.WIDTH, state_module.HEIGHT)
+    try:
+        if workers == 1:
+            _init_worker(config, width, height, position_format)
+            for position in positions:
+                yield _analyze_line(position)
+            return
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(config, width, height, position_format)) as executor:
+            pending = deque()
+            for chunk in _chunks(positions, chunk_size):
+                pending.append(executor.submit(_analyze_chunk, chunk))
+                if len(pending) >= _CHUNKS_PER_WORKER * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    finally:
+        _init_worker(None, *board_size, position_format)  # releases the engine (and its table) of the calling process
+
+
+def analyze_file(input_path: str, output_path: Optional[str], config: EngineConfig, width: int = 7, height: int = 6,
+                 position_format: str = "moves", workers: int = 1, chunk_size: int = 64,
+                 progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Analyzes the positions of a file into a JSON Lines file (see `analyze_lines`).
+
+    :param input_path: The path of the positions file, "-" for the standard input.
+    :type input_path: str
+    :param output_path: The path of the results file, None or "-" for the standard output.
+    :type output_path: str
+    :param progress: A callback called with the number of positions done after every chunk of positions. Defaults
+                     to None.
+    :return: The number of analyzed positions (including the invalid ones).
+    :rtype: int
+    """
+    input_file = sys.stdin if input_path == "-" else open(input_path)
+    output_file = sys.stdout if output_path in (None, "-") else open(output_path, "w")
+    count = 0
+    try:
+        for result in analyze_lines(input_file, config, width, height, position_format, workers, chunk_size):
+            output_file.write(json.dumps(result) + "\n")
+            count += 1
+            if progress is not None and not count % chunk_size:
+                progress(count)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return count
+
+
+def _init_worker(config: Optional[EngineConfig], width: int, height: int, position_format: str):
+    global _worker_engine, _worker_config, _worker_format
+    change_game_board(width, height)
+    _worker_engine = config.create() if config is not None else None
+    _worker_config = config
+    _worker_format = position_format
+
+
+def _analyze_chunk(positions: List[str]) -> List[Dict[str, Any]]:
+    return [_analyze_line(position) for position in positions]
+
+
+def _analyze_line(position: str) -> Dict[str, Any]:
+    try:
+        state = parse_position(position, state_module.WIDTH, state_module.HEIGHT, _worker_format)
+        return {"position": position, **analyze_position(_worker_engine, state, _worker_config.time_budget)}
+    except (ValueError, AssertionError) as err:
+        return {"position": position, "error": str(err) or type(err).__name__}
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyzes the positions of a file into JSON Lines.")
+    parser.add_argument("input", help="the positions file, one per line, - for the standard input")
+    parser.add_argument("--output", help="the JSON Lines results file (default: the standard output)")
+    parser.add_argument("--format", choices=FORMATS, default="moves", help="the positions format")
+    parser.add_argument("--engine", type=EngineConfig.parse, default=EngineConfig(), help="approach:k[:time budget]")
+    parser.add_argument("--width", type=int, default=7, help="the board width")
+    parser.add_argument("--height", type=int, default=6, help="the board height")
+    parser.add_argument("--workers", type=int, default=1, help="the number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="the number of positions sent to a worker at once")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = analyze_file(args.input, args.output, args.engine, args.width, args.height, args.format, args.workers,
+                         args.chunk_size,
+                         progress=lambda done: print(f"\r{done:,} positions", end="", file=sys.stderr, flush=True))
+    seconds = time.perf_counter() - start
+    print(f"\r{count:,} positions in {seconds:.1f}s ({count / seconds if seconds else 0:,.1f} positions/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.utilities.get_heuristic import calculate_heuristic
+from src.utilities.get_score import get_game_score
+from src.algorithms.engine import SearchEngine, PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS
+from src.tools.positions import POSITION_SETS, load_position
+
+"""
+Connect 4 Benchmarks
+
+This script measures the throughput of the hot paths, on every set of the fixed positions (see `POSITION_SETS`):
+    - state: `State.update_col` (on a fresh copy of the position), `State.get_successors` and `State.to_2d`, in ops/s.
+    - heuristic: `calculate_heuristic` and `get_game_score` of the 2D boards, in ops/s.
+    - search: a full search of every engine approach (fresh engine, fixed depth), in nodes/s. Only the searches are
+      timed, not the creation of the engines (and the allocation of their tables).
+
+Every benchmark is run once to warm up, then repeated (every measured run lasting at least `min_time`), and the median,
+mean, standard deviation, min and max of its throughput are reported. The results are saved as JSON, along with the
+commit and the Python version, so that a run can be compared with the results of another commit (--compare).
+
+Usage (from the project root):
+    python -m src.tools.benchmark --output results.json
+    python -m src.tools.benchmark --filter search --repeats 3 --compare results.json
+
+"""
+
+# approach -> search depth of the search benchmarks (pure minimax can not go as deep in the same time)
+SEARCH_DEPTHS = {
+    PURE_MINIMAX: 4,
+    MINIMAX_WITH_ALPHA_BETA: 6,
+    NEGAMAX_PVS: 6,
+}
+
+
+def state_benchmarks(states: List[State]) -> Dict[str, Callable[[], int]]:
+    """
+    Returns the benchmarks of the state operations on the given positions (of the current board size), every
+    benchmark runs its operation once per position (per move for update_col) and returns the number of operations.
+    """
+    def update_col():
+        count = 0
+        for state in states:
+            for col in state.legal_moves():
+                State(state.is_computer_turn(), state.get_value()).update_col(col, True)
+                count += 1
+        return count
+
+    def get_successors():
+        for state in states:
+            state.get_successors()
+        return len(states)
+
+    def to_2d():
+        for state in states:
+            state.to_2d()
+        return len(states)
+
+    return {"state.update_col": update_col, "state.get_successors": get_successors, "state.to_2d": to_2d}
+
+
+def heuristic_benchmarks(states: List[State]) -> Dict[str, Callable[[], int]]:
+    """
+    Returns the benchmarks of the evaluations of the 2D boards of the given positions.
+    """
+    boards = [state.to_2d() for state in states]
+
+    def heuristic():
+        for board in boards:
+            calculate_heuristic(board, 1, 2)
+        return len(boards)
+
+    def game_score():
+        for board in boards:
+            get_game_score(board, 1, 2)
+        return len(boards)
+
+    return {"heuristic.calculate_heuristic": heuristic, "heuristic.get_game_score": game_score}
+
+
+def search_benchmarks(states: List[State], depth: Optional[int] = None) -> Dict[str, Callable[[], Tuple[int, float]]]:
+    """
+    Returns the benchmarks of the searches of the given positions, every benchmark returns the number of visited nodes
+    and the time spent searching them (excluding the creation of the engines).
+    """
+    def search(approach: str):
+        def run():
+            nodes = 0
+            seconds = 0.0
+            for state in states:
+                engine = SearchEngine(approach, depth or SEARCH_DEPTHS[approach])
+                start = time.perf_counter()
+                engine.search(state)
+                seconds += time.perf_counter() - start
+                nodes += engine.nodes
+            return nodes, seconds
+        return run
+
+    return {f"search.{approach}": search(approach) for approach in SEARCH_DEPTHS}
+
+
+def measure(benchmark: Callable[[], Union[int, Tuple[int, float]]], repeats: int = 5, warmup: int = 1,
+            min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Measures the throughput of a benchmark.
+
+    :param benchmark: The benchmark, returning the number of operations (or nodes) it did, or the number of operations
+                      and the time they took, when it does more than the measured operations (e.g. a setup).
+    :param repeats: The number of measured runs.
+    :type repeats: int
+    :param warmup: The number of runs before the measured ones.
+    :type warmup: int
+    :param min_time: The minimum duration of a measured run in seconds, the benchmark is called again until it is
+                     reached, so that the fast benchmarks are not measured on a single call.
+    :type min_time: float
+    :return: The median, mean, stdev, min and max of the throughput of the runs (operations per second).
+    """
+    for _ in range(warmup):
+        benchmark()
+    rates = []
+    for _ in range(repeats):
+        count = 0
+        measured = 0.0  # the time of the measured operations
+        start = time.perf_counter()
+        while True:
+            call_start = time.perf_counter()
+            result = benchmark()
+            if isinstance(result, tuple):
+                operations, seconds = result
+            else:
+                operations, seconds = result, time.perf_counter() - call_start
+            count += operations
+            measured += seconds
+            if time.perf_counter() - start >= min_time:
+                break
+        rates.append(count / measured if measured else 0.0)
+    return {
+        "median": statistics.median(rates),
+        "mean": statistics.fmean(rates),
+        "stdev": statistics.stdev(rates) if len(rates) > 1 else 0.0,
+        "min": min(rates),
+        "max": max(rates),
+        "repeats": repeats,
+    }
+
+
+def run_benchmarks(name_filter: str = "", repeats: int = 5, warmup: int = 1, depth: Optional[int] = None,
+                   progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, Any]:
+    """
+    Runs the benchmarks of every positions set.
+
+    :param name_filter: Only the benchmarks whose name (e.g. "search.Pure Minimax/openings") contains it are run.
+    :type name_filter: str
+    :param repeats: The number of measured runs of every benchmark.
+    :type repeats: int
+    :param warmup: The number of runs before the measured ones.
+    :type warmup: int
+    :param depth: The search depth of every approach. Defaults to None (the `SEARCH_DEPTHS`).
+    :type depth: int
+    :param progress: A callback called with the name and the measure of every benchmark. Defaults to None.
+    :return: The results: the run metadata and the measures of every benchmark by name.
+    """
+    measures = {}
+    board_size = (state_module.WIDTH, state_module.HEIGHT)
+    try:
+        for set_name, positions in POSITION_SETS.items():
+            states = [load_position(position) for position in positions]  # every set is of a single board size
+            benchmarks = {**state_benchmarks(states), **heuristic_benchmarks(states),
+                          **search_benchmarks(states, depth)}
+            for name, benchmark in benchmarks.items():
+                full_name = f"{name}/{set_name}"
+                if name_filter in full_name:
+                    measures[full_name] = measure(benchmark, repeats, warmup)
+                    measures[full_name]["unit"] = "nodes/s" if name.startswith("search.") else "ops/s"
+                    if progress is not None:
+                        progress(full_name, measures[full_name])
+    finally:
+        change_game_board(*board_size)
+    return {
+        "commit": _current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": measures,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Tuple[str, float, float, float]]:
+    """
+    Compares the medians of the benchmarks of two runs.
+
+    :param results: The results of the new run.
+    :param baseline: The results of the run to compare with.
+    :return: List of (name, baseline median, new median, speedup) of the benchmarks of both runs.
+    """
+    rows = []
+    for name, measure_ in results["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            old, new = baseline["benchmarks"][name]["median"], measure_["median"]
+            rows.append((name, old, new, new / old if old else float("inf")))
+    return rows
+
+
+def _current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the throughput of the state, heuristic and search paths.")
+    parser.add_argument("--filter", default="", help="only run the benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5, help="the number of measured runs of every benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="the number of runs before the measured ones")
+    parser.add_argument("--depth", type=int, help="the search depth of every approach (default: per approach)")
+    parser.add_argument("--output", help="the JSON file the results are saved to")
+    parser.add_argument("--compare", help="a JSON results file to compare the results with")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.repeats, args.warmup, args.depth,
+                             progress=lambda name, measure_: print(
+                                 f"{name:<60}{measure_['median']:>14,.0f} {measure_['unit']:<8}"
+                                 f"(+-{measure_['stdev']:,.0f})"))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"\ncompared with {baseline.get('commit')}:")
+        for name, old, new, speedup in compare(results, baseline):
+            print(f"{name:<60}{old:>14,.0f}{new:>14,.0f}{speedup:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import time
+
+from src.algorithms.engine import ALGORITHMS, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.opening_book import build_book
+
+"""
+Connect 4 Opening Book Builder
+
+This script builds the opening book of the first plies of a board and saves it to a file, to be attached to the
+engine (`SearchEngine(book=OpeningBook.load(path))`).
+
+Usage (from the project root):
+    python -m src.tools.build_book --plies 4 --depth 6 --output book.bin
+    python -m src.tools.build_book --width 5 --height 4 --plies 6 --solver --output book-5x4.bin
+    python -m src.tools.build_book --plies 6 --depth 8 --db --output book.pdb
+
+With --db, the book is written as a positions database instead, to be attached without loading it
+(`SearchEngine.attach_database(PositionDB(path))` or `Connect4Controller.attach_database(path)`).
+
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the opening book of a board.")
+    parser.add_argument("--width", type=int, default=7, help="the board width")
+    parser.add_argument("--height", type=int, default=6, help="the board height")
+    parser.add_argument("--plies", type=int, default=4, help="the maximum number of discs of the book positions")
+    parser.add_argument("--depth", type=int, default=6, help="the search depth k of the book moves")
+    parser.add_argument("--approach", default=MINIMAX_WITH_ALPHA_BETA, choices=list(ALGORITHMS),
+                        help="the search algorithm of the book moves")
+    parser.add_argument("--solver", action="store_true", help="solve the book moves to the end of the game")
+    parser.add_argument("--db", action="store_true", help="write a positions database instead of a book file")
+    parser.add_argument("--output", required=True, help="the book file path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    book = build_book(args.width, args.height, args.plies, args.depth, args.approach, args.solver,
+                      progress=lambda count: print(f"\r{count} positions", end="", flush=True))
+    if args.db:
+        book.save_db(args.output)
+    else:
+        book.save(args.output)
+    print(f"\n{len(book)} positions saved to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
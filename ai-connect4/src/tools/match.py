@@ -0,0 +1,345 @@
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import *
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.bitboard_state import BitboardState
+from src.state.geometry import get_geometry
+from src.algorithms.engine import SearchEngine, PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS
+from src.algorithms.solver import WIN, DRAW, outcome
+
+"""
+Connect 4 Engine Matches
+
+This script plays matches between two engine configurations without the GUI, to check that a change (e.g. a
+performance one) does not weaken the play.
+
+Every game starts from a random opening (a few random moves), and every opening is played twice, each engine playing
+first once, so that the openings do not favor any of them. The engines always search for the computer discs: the
+engine playing the human discs is given the board with the players swapped (see `BoardGeometry.swap_players`).
+
+The games are played in a process pool, and the match reports the wins / draws / losses of the first engine, the Elo
+difference between both engines (with its 95% confidence interval), and the nodes per second of every engine.
+
+Usage (from the project root):
+    python -m src.tools.match --engine-a alphabeta:6 --engine-b alphabeta:4 --games 200 --workers 4
+    python -m src.tools.match --engine-a negamax:8:0.5 --engine-b alphabeta:8:0.5 --width 5 --height 4
+
+Every engine is given as approach:k[:time budget in seconds], the approaches being the `APPROACHES` keys.
+
+"""
+
+# short name -> approach name, for the command line
+APPROACHES = {
+    "minimax": PURE_MINIMAX,
+    "alphabeta": MINIMAX_WITH_ALPHA_BETA,
+    "negamax": NEGAMAX_PVS,
+}
+
+_Z_95 = 1.959964  # the standard normal quantile of the 95% confidence intervals
+
+
+class EngineConfig:
+    def __init__(self, approach: str = MINIMAX_WITH_ALPHA_BETA, k: int = 4, time_budget: Optional[float] = None,
+                 move_ordering: bool = True):
+        """
+        Initializes the configuration of an engine of a match.
+
+        :param approach: The search algorithm name, one of the engine `ALGORITHMS` keys.
+        :type approach: str
+        :param k: The search depth.
+        :type k: int
+        :param time_budget: The time budget of every move in seconds, None to always search depth k.
+        :type time_budget: float
+        :param move_ordering: Flag to order the moves of the algorithms that prune.
+        :type move_ordering: bool
+        """
+        self.approach = approach
+        self.k = k
+        self.time_budget = time_budget
+        self.move_ordering = move_ordering
+
+    @property
+    def name(self) -> str:
+        short = next((short for short, approach in APPROACHES.items() if approach == self.approach), self.approach)
+        name = f"{short}:{self.k}"
+        if self.time_budget is not None:
+            name += f":{self.time_budget:g}"
+        return name if self.move_ordering else name + " (no ordering)"
+
+    def create(self) -> SearchEngine:
+        """
+        Creates an engine of the configuration.
+
+        :return: The engine.
+        :rtype: SearchEngine
+        """
+        return SearchEngine(self.approach, self.k, move_ordering=self.move_ordering)
+
+    @classmethod
+    def parse(cls, spec: str) -> "EngineConfig":
+        """
+        Parses a command line engine, e.g. "alphabeta:6" or "negamax:8:0.5".
+
+        :param spec: The engine, as approach:k[:time budget].
+        :type spec: str
+        :return: The configuration.
+        :raises ValueError: if the engine can not be parsed.
+        """
+        parts = spec.split(":")
+        if len(parts) not in (2, 3) or parts[0] not in APPROACHES:
+            raise ValueError(f"Invalid engine {spec}, expected approach:k[:time budget] with approach in "
+                             f"{', '.join(APPROACHES)}")
+        return cls(APPROACHES[parts[0]], int(parts[1]), float(parts[2]) if len(parts) == 3 else None)
+
+
+class MatchResult:
+    def __init__(self, config_a: EngineConfig, config_b: EngineConfig):
+        """
+        Initializes the (empty) result of a match, from the point of view of the first engine.
+        """
+        self.config_a = config_a
+        self.config_b = config_b
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.nodes = [0, 0]  # the nodes visited by each engine
+        self.seconds = [0.0, 0.0]  # the search time of each engine
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """
+        The score rate of the first engine, a draw counting as half a win.
+        """
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    def add_game(self, margin: int, nodes: Sequence[int], seconds: Sequence[float]):
+        """
+        Adds the result of a game.
+
+        :param margin: The fours of the first engine minus the fours of the second one.
+        :type margin: int
+        :param nodes: The nodes visited by each engine.
+        :param seconds: The search time of each engine.
+        """
+        result = outcome(margin)
+        if result == WIN:
+            self.wins += 1
+        elif result == DRAW:
+            self.draws += 1
+        else:
+            self.losses += 1
+        for side in (0, 1):
+            self.nodes[side] += nodes[side]
+            self.seconds[side] += seconds[side]
+
+    def elo(self) -> Tuple[float, float, float]:
+        """
+        Returns the Elo difference between the first and the second engine, with its 95% confidence interval (from
+        the standard error of the games scores).
+
+        :return: Tuple of the Elo difference and the bounds of its confidence interval.
+        """
+        games, score = self.games, self.score
+        if not games:
+            return 0.0, - math.inf, math.inf
+        variance = (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2 + self.losses * score ** 2) / games
+        margin = _Z_95 * math.sqrt(variance / games)
+        return elo_difference(score), elo_difference(score - margin), elo_difference(score + margin)
+
+    def nodes_per_second(self, side: int) -> float:
+        return self.nodes[side] / self.seconds[side] if self.seconds[side] else 0.0
+
+    def report(self) -> str:
+        """
+        Returns the text report of the match.
+        """
+        elo, low, high = self.elo()
+        return (f"{self.config_a.name} vs {self.config_b.name}: {self.games} games, "
+                f"+{self.wins} ={self.draws} -{self.losses}\n"
+                f"score {100 * self.score:.1f}%, Elo difference {elo:+.1f} (95% CI {low:+.1f} .. {high:+.1f})\n"
+                f"{self.config_a.name}: {self.nodes_per_second(0):,.0f} nodes/s, "
+                f"{self.config_b.name}: {self.nodes_per_second(1):,.0f} nodes/s")
+
+
+def elo_difference(score: float) -> float:
+    """
+    Converts a score rate into an Elo difference.
+
+    :param score: The score rate, between 0 and 1.
+    :type score: float
+    :return: The Elo difference, infinite for a score of 0 or 1.
+    :rtype: float
+    """
+    if score <= 0:
+        return - math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def random_opening(width: int, height: int, plies: int, rng: random.Random) -> List[int]:
+    """
+    Returns random opening moves.
+
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param plies: The number of moves.
+    :type plies: int
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The columns of the moves.
+    :rtype: List[int]
+    """
+    heights = [0] * width
+    moves = []
+    for _ in range(min(plies, width * height)):
+        col = rng.choice([col for col in range(width) if heights[col] < height])
+        heights[col] += 1
+        moves.append(col)
+    return moves
+
+
+def play_game(config_a: EngineConfig, config_b: EngineConfig, width: int, height: int, opening: Sequence[int],
+              a_first: bool) -> Tuple[int, List[int], List[float]]:
+    """
+    Plays a game between two engines, the first engine playing the computer discs.
+
+    :param config_a: The first engine.
+    :type config_a: EngineConfig
+    :param config_b: The second engine.
+    :type config_b: EngineConfig
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param opening: The opening moves, played before the engines take over.
+    :param a_first: Flag to let the first engine play the first move (of the opening).
+    :type a_first: bool
+    :return: Tuple of the fours of the first engine minus the fours of the second one, the nodes visited by each
+             engine and the search time of each engine.
+    """
+    change_game_board(width, height)
+    geometry = get_geometry(width, height)
+    configs = (config_a, config_b)
+    engines = (config_a.create(), config_b.create())
+    for engine in engines:
+        engine.new_game()
+    nodes = [0, 0]
+    seconds = [0.0, 0.0]
+
+    state = State(a_first)
+    for col in opening:
+        state.update_col(col, True)
+    while not state.is_full():
+        side = 0 if state.is_computer_turn() else 1
+        view = state if side == 0 else State(True, geometry.swap_players(state.get_value()))
+        start = time.perf_counter()
+        _, next_view = engines[side].search(view, configs[side].time_budget)
+        seconds[side] += time.perf_counter() - start
+        nodes[side] += engines[side].nodes
+        state.update_col(_played_column(geometry, view.get_value(), next_view.get_value()), True)
+
+    computer, human = BitboardState(state.is_computer_turn(), state.get_value()).get_scores()
+    return computer - human, nodes, seconds
+
+
+def run_match(config_a: EngineConfig, config_b: EngineConfig, games: int = 100, width: int = 7, height: int = 6,
+              opening_plies: int = 4, workers: int = 1, seed: int = 0,
+              progress: Optional[Callable[[MatchResult], None]] = None) -> MatchResult:
+    """
+    Plays a match between two engines, every random opening being played twice (each engine playing first once).
+
+    :param config_a: The first engine.
+    :type config_a: EngineConfig
+    :param config_b: The second engine.
+    :type config_b: EngineConfig
+    :param games: The number of games (rounded up to an even number).
+    :type games: int
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param opening_plies: The number of random moves of the openings.
+    :type opening_plies: int
+    :param workers: The number of worker processes, 1 to play the games in the calling process.
+    :type workers: int
+    :param seed: The seed of the random openings.
+    :type seed: int
+    :param progress: A callback called with the result so far after every game. Defaults to None.
+    :return: The result of the match.
+    :rtype: MatchResult
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range((games + 1) // 2):
+        opening = random_opening(width, height, opening_plies, rng)
+        jobs.append((config_a, config_b, width, height, opening, True))
+        jobs.append((config_a, config_b, width, height, opening, False))
+
+    result = MatchResult(config_a, config_b)
+    board_size = (state_module.WIDTH, state_module.HEIGHT)
+    try:
+        if workers == 1:
+            outcomes = map(_play_job, jobs)
+            _collect(outcomes, result, progress)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                _collect(executor.map(_play_job, jobs, chunksize=max(1, len(jobs) // (8 * workers))), result,
+                         progress)
+    finally:
+        change_game_board(*board_size)
+    return result
+
+
+def _collect(outcomes: Iterable[Tuple[int, List[int], List[float]]], result: MatchResult,
+             progress: Optional[Callable[[MatchResult], None]]):
+    for margin, nodes, seconds in outcomes:
+        result.add_game(margin, nodes, seconds)
+        if progress is not None:
+            progress(result)
+
+
+def _play_job(job: Tuple) -> Tuple[int, List[int], List[float]]:
+    return play_game(*job)
+
+
+def _played_column(geometry, state_val: int, next_state_val: int) -> int:
+    """
+    Returns the column of the move between two packed integer states, that is, the column whose height changed.
+    """
+    return next(col for col in range(geometry.width)
+                if state_val & geometry.height_masks[col] != next_state_val & geometry.height_masks[col])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays a match between two engine configurations.")
+    parser.add_argument("--engine-a", required=True, type=EngineConfig.parse, help="approach:k[:time budget]")
+    parser.add_argument("--engine-b", required=True, type=EngineConfig.parse, help="approach:k[:time budget]")
+    parser.add_argument("--games", type=int, default=100, help="the number of games")
+    parser.add_argument("--width", type=int, default=7, help="the board width")
+    parser.add_argument("--height", type=int, default=6, help="the board height")
+    parser.add_argument("--opening-plies", type=int, default=4, help="the number of random moves of the openings")
+    parser.add_argument("--workers", type=int, default=1, help="the number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random openings")
+    args = parser.parse_args()
+
+    result = run_match(args.engine_a, args.engine_b, args.games, args.width, args.height, args.opening_plies,
+                       args.workers, args.seed,
+                       progress=lambda partial: print(f"\r{partial.games} games", end="", flush=True))
+    print()
+    print(result.report())
+
+
+if __name__ == "__main__":
+    main()
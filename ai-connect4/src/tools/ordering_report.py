@@ -0,0 +1,70 @@
+import argparse
+import time
+from typing import *
+
+from src.state import state as state_module
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.move_ordering import MoveOrderer
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.transposition_table import TranspositionTable
+from src.tools.positions import POSITIONS, load_position
+
+"""
+Connect 4 Move Ordering Report
+
+This script searches every position of the fixed positions set with the alpha-beta algorithm, once per move ordering
+configuration, and reports the number of visited nodes (and the time) of each configuration.
+
+Usage (from the project root):
+    python -m src.tools.ordering_report --depth 6
+
+"""
+
+# configuration name -> MoveOrderer keyword arguments, None for the plain columns order
+CONFIGURATIONS: Dict[str, Optional[dict]] = {
+    "columns": None,
+    "center": dict(use_table_move=False, use_killers=False, use_history=False),
+    "center+tt": dict(use_killers=False, use_history=False),
+    "center+tt+killers": dict(use_history=False),
+    "all": dict(),
+    "all+threats": dict(use_threats=True),
+}
+
+
+def count_nodes(position: str, depth: int, configuration: Optional[dict]) -> Tuple[int, float]:
+    """
+    Searches a position with a fresh table and the given move ordering.
+
+    :return: Tuple of the number of visited nodes and the search time in seconds.
+    """
+    state = load_position(position)
+    limits = SearchLimits()
+    ordering = MoveOrderer(state_module.WIDTH, **configuration) if configuration is not None else None
+    solver = MinimaxWithAlphaBeta(depth, TranspositionTable(), limits, ordering)
+    start = time.perf_counter()
+    solver.run_minimax_with_alpha_beta(state)
+    return limits.nodes, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports the alpha-beta node counts of every move ordering.")
+    parser.add_argument("--depth", type=int, default=6, help="the search depth k")
+    parser.add_argument("--positions", nargs="*", default=list(POSITIONS), help="the positions names")
+    args = parser.parse_args()
+
+    print(f"{'position':<24}" + "".join(f"{name:>20}" for name in CONFIGURATIONS))
+    totals = {name: [0, 0.0] for name in CONFIGURATIONS}
+    for position in args.positions:
+        row = f"{position:<24}"
+        for name, configuration in CONFIGURATIONS.items():
+            nodes, seconds = count_nodes(position, args.depth, configuration)
+            totals[name][0] += nodes
+            totals[name][1] += seconds
+            row += f"{nodes:>20}"
+        print(row)
+    print(f"{'total nodes':<24}" + "".join(f"{nodes:>20}" for nodes, _ in totals.values()))
+    print(f"{'total seconds':<24}" + "".join(f"{seconds:>20.2f}" for _, seconds in totals.values()))
+
+
+if __name__ == '__main__':
+    main()
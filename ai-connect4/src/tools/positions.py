@@ -0,0 +1,70 @@
+from typing import *
+
+from src.state.state import State, change_game_board
+
+"""
+Connect 4 Fixed Positions
+
+This code defines fixed sets of positions, used to compare the search algorithms (node counts, timings) across
+changes, grouped in sets (`POSITION_SETS`) by game phase and board size. Every position is given as the board size and
+the columns played in order, the human playing first, so that all the positions with an odd number of moves are the
+computer turn.
+
+"""
+
+# name -> (width, height, moves)
+POSITIONS: Dict[str, Tuple[int, int, str]] = {
+    "opening-center": (7, 6, "3"),
+    "opening-edge": (7, 6, "0"),
+    "opening-3": (7, 6, "334"),
+    "early-5": (7, 6, "33425"),
+    "midgame-11": (7, 6, "33424522611"),
+    "midgame-15": (7, 6, "334245226110056"),
+    "midgame-21": (7, 6, "334245226110056641163"),
+    "near-full-31": (7, 6, "3342452261100566411635544000331"),
+    "variant-9x8-opening": (9, 8, "4"),
+    "variant-9x8-midgame": (9, 8, "445335266"),
+    "variant-10x10-opening": (10, 10, "5"),
+}
+
+# set name -> positions names, every set holds positions of a single board size
+POSITION_SETS: Dict[str, List[str]] = {
+    "openings": ["opening-center", "opening-edge", "opening-3", "early-5"],
+    "midgames": ["midgame-11", "midgame-15", "midgame-21"],
+    "near-full": ["near-full-31"],
+    "9x8": ["variant-9x8-opening", "variant-9x8-midgame"],
+    "10x10": ["variant-10x10-opening"],
+}
+
+
+def state_from_moves(width: int, height: int, moves: str) -> State:
+    """
+    Changes the game board to the given size, and plays the given moves from the empty board.
+
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :param moves: The columns played in order, e.g. "334", the human playing first.
+    :type moves: str
+    :return: The state after the moves.
+    :rtype: State
+    """
+    change_game_board(width, height)
+    state = State()
+    for move in moves:
+        state.update_col(int(move), True)
+    return state
+
+
+def load_position(name: str) -> State:
+    """
+    Builds a position of the fixed set (the game board size is changed to the position one).
+
+    :param name: The position name, one of the `POSITIONS` keys.
+    :type name: str
+    :return: The state of the position.
+    :rtype: State
+    """
+    width, height, moves = POSITIONS[name]
+    return state_from_moves(width, height, moves)
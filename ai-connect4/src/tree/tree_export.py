@@ -0,0 +1,148 @@
+import json
+import struct
+from typing import *
+
+from src.tree.tree_representation import Tree
+
+"""
+Connect 4 Tree Export
+
+This code defines a streaming exporter of the recorded search trees: the tree is walked with an explicit stack (see
+`Tree.walk`) and every node is written to the file as soon as it is walked, so that trees of millions of nodes can be
+exported without building their whole text in memory, and without hitting the recursion limit.
+
+Every exported node gets an id (its rank in the walk, the root being 0), along with the id of its parent (-1 for the
+root), its depth, its state (as int) and its evaluation. The supported formats are:
+    - JSONL: one JSON object per line, e.g. {"id": 1, "parent": 0, "depth": 1, "state": 8, "value": 25.0}
+    - DOT: a Graphviz digraph, labelled like `Tree.display_tree` (Node<identifier>: <evaluation>).
+    - BINARY: the `BINARY_MAGIC` bytes, then one record per node: parent id (int32), depth (uint16), evaluation
+      (double), state bytes count (uint16) and the state bytes (little endian), to be read back with
+      `read_binary_tree`.
+
+The export can be limited to the nodes down to a depth, and to a number of nodes.
+
+"""
+
+JSONL = "jsonl"
+DOT = "dot"
+BINARY = "bin"
+
+BINARY_MAGIC = b"C4TREE1\n"
+_RECORD = struct.Struct("<iHdH")
+
+# file extension -> format
+_EXTENSIONS = {".jsonl": JSONL, ".dot": DOT, ".gv": DOT, ".bin": BINARY}
+
+
+def walk_with_ids(tree: Tree, max_depth: Optional[int] = None,
+                  max_nodes: Optional[int] = None) -> Iterator[Tuple[int, int, int, int, float]]:
+    """
+    Walks the tree in depth-first order, numbering the walked nodes.
+
+    :param tree: The recorded search tree.
+    :type tree: Tree
+    :param max_depth: The depth of the deepest nodes to be walked, None for no depth limit.
+    :type max_depth: int
+    :param max_nodes: The maximum number of walked nodes, None for no nodes limit.
+    :type max_nodes: int
+    :return: Iterator of (id, parent id, depth, state, evaluation) of every walked node.
+    """
+    path: List[int] = []  # the ids of the ancestors of the current node, by depth
+    for node_id, (depth, state, value) in enumerate(tree.walk(max_depth)):
+        if max_nodes is not None and node_id >= max_nodes:
+            return
+        del path[depth:]
+        yield node_id, path[-1] if path else -1, depth, state, value
+        path.append(node_id)
+
+
+def export_tree(tree: Tree, file_path: str, export_format: Optional[str] = None, max_depth: Optional[int] = None,
+                max_nodes: Optional[int] = None) -> int:
+    """
+    Writes the tree to a file, node by node.
+
+    :param tree: The recorded search tree.
+    :type tree: Tree
+    :param file_path: The path of the file to be written.
+    :type file_path: str
+    :param export_format: JSONL, DOT or BINARY. Defaults to None (the format of the file extension).
+    :type export_format: str
+    :param max_depth: The depth of the deepest nodes to be exported, None for no depth limit.
+    :type max_depth: int
+    :param max_nodes: The maximum number of exported nodes, None for no nodes limit.
+    :type max_nodes: int
+    :return: The number of exported nodes.
+    :rtype: int
+    :raises ValueError: if the format is unknown, or can not be told from the file extension.
+    """
+    if export_format is None:
+        extension = file_path[file_path.rfind("."):].lower() if "." in file_path else ""
+        if extension not in _EXTENSIONS:
+            raise ValueError(f"Unknown tree export format of {file_path}")
+        export_format = _EXTENSIONS[extension]
+
+    nodes = walk_with_ids(tree, max_depth, max_nodes)
+    if export_format == JSONL:
+        with open(file_path, "w") as file:
+            return _write_jsonl(nodes, file)
+    if export_format == DOT:
+        with open(file_path, "w") as file:
+            return _write_dot(tree, nodes, file)
+    if export_format == BINARY:
+        with open(file_path, "wb") as file:
+            return _write_binary(nodes, file)
+    raise ValueError(f"Unknown tree export format {export_format}")
+
+
+def read_binary_tree(file_path: str) -> Iterator[Tuple[int, int, int, int, float]]:
+    """
+    Reads back a tree exported in the BINARY format, node by node.
+
+    :param file_path: The path of the exported file.
+    :type file_path: str
+    :return: Iterator of (id, parent id, depth, state, evaluation) of every exported node.
+    :raises ValueError: if the file is not an exported tree.
+    """
+    with open(file_path, "rb") as file:
+        if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{file_path} is not an exported tree")
+        node_id = 0
+        while True:
+            record = file.read(_RECORD.size)
+            if len(record) < _RECORD.size:
+                return
+            parent, depth, value, state_size = _RECORD.unpack(record)
+            yield node_id, parent, depth, int.from_bytes(file.read(state_size), "little"), value
+            node_id += 1
+
+
+def _write_jsonl(nodes: Iterator[Tuple[int, int, int, int, float]], file: TextIO) -> int:
+    count = 0
+    for node_id, parent, depth, state, value in nodes:
+        file.write(json.dumps({"id": node_id, "parent": parent, "depth": depth, "state": state, "value": value}))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def _write_dot(tree: Tree, nodes: Iterator[Tuple[int, int, int, int, float]], file: TextIO) -> int:
+    count = 0
+    file.write("digraph tree {\n")
+    for node_id, parent, depth, state, value in nodes:
+        file.write(f'  n{node_id} [label="Node{tree.identifier[state]}: {value}"];\n')
+        if parent != -1:
+            file.write(f"  n{parent} -> n{node_id};\n")
+        count += 1
+    file.write("}\n")
+    return count
+
+
+def _write_binary(nodes: Iterator[Tuple[int, int, int, int, float]], file: BinaryIO) -> int:
+    count = 0
+    file.write(BINARY_MAGIC)
+    for node_id, parent, depth, state, value in nodes:
+        state_bytes = state.to_bytes((state.bit_length() + 7) // 8, "little")
+        file.write(_RECORD.pack(parent, depth, value, len(state_bytes)))
+        file.write(state_bytes)
+        count += 1
+    return count
@@ -1,15 +1,32 @@
+import math
+from array import array
 from src.state.state import *
 from typing import *
 
+# The recording modes of the search algorithms, that is, the depth down to which the explored edges are recorded in
+# the tree: nothing (no tree is built), the root children only, or the full tree. Any other int N records the edges
+# of the first N levels.
+RECORD_OFF = 0
+RECORD_ROOT = 1
+RECORD_FULL = math.inf
+
 
 class Tree:
     """
         A class used to represent and visualize the minimax tree of the AI agent algorithm.
 
+        The tree is stored in compact parallel arrays instead of a list of tuples per node: every node (state) gets an
+        index, and every edge (child) holds the index of the child node, its evaluation and the next edge of the same
+        parent, so the children of a node are a linked list starting at its first edge.
+
         Attributes:
         - root (Tuple[int, float]): The root node of the tree (initial state).
-        - nodes (Dict[int, List[Tuple[int, float]]]): Mapping of nodes to their children.
-        - identifier (Dict[int, int]): Mapping of node values to their identifiers (Ordering is neglected).
+        - identifier (Dict[int, int]): Mapping of node values to their identifiers (Ordering is neglected), the index
+          of a node in the node arrays is its identifier - 1.
+        - node_states (List[int]): The state (as int) of every node.
+        - first_edge, last_edge (array): The first and last child edges of every node, -1 if it has no children.
+        - edge_child, edge_value, edge_next (array): The child node, the child evaluation and the next sibling edge
+          (-1 for the last one) of every edge.
     """
     def __init__(self, root: Tuple[int, float]):
         """
@@ -19,10 +36,20 @@ class Tree:
             :type root: Tuple[int, float]
         """
         self.root = root
-        # state as int maps to -> children as Tuples of [child_value, child_evaluation]
-        self.nodes: Dict[int, List[Tuple[int, float]]] = {}
-        self.identifier = {}
-        self.identifier[root[0]] = len(self.identifier) + 1
+        self.identifier: Dict[int, int] = {}
+        self.node_states: List[int] = []
+        self.first_edge = array('l')
+        self.last_edge = array('l')
+        self.edge_child = array('l')
+        self.edge_value = array('d')
+        self.edge_next = array('l')
+        self._node_index(root[0])
+
+    def __len__(self):
+        """
+            Returns the number of recorded edges.
+        """
+        return len(self.edge_child)
 
     def add_child_to_node(self, node: int, child: Tuple[int, float]):
         """
@@ -33,29 +60,77 @@ class Tree:
             :param child: The child node to be added.
             :type child: Tuple[int, float]
         """
-        if child[0] not in self.identifier:
-            self.identifier[child[0]] = len(self.identifier) + 1
-        if node not in self.nodes:
-            self.nodes[node] = []
-        self.nodes[node].append(child)
+        parent_index = self._node_index(node)
+        edge = len(self.edge_child)
+        self.edge_child.append(self._node_index(child[0]))
+        self.edge_value.append(child[1])
+        self.edge_next.append(-1)
+        if self.last_edge[parent_index] == -1:
+            self.first_edge[parent_index] = edge
+        else:
+            self.edge_next[self.last_edge[parent_index]] = edge
+        self.last_edge[parent_index] = edge
+
+    def children(self, node: int) -> List[Tuple[int, float]]:
+        """
+            Returns the children of a node.
+
+            :param node: The parent node (integer representation).
+            :type node: int
+            :return: The children as Tuples of [child_value, child_evaluation], in the order they were added.
+            :rtype: List[Tuple[int, float]]
+        """
+        index = self.identifier.get(node)
+        if index is None:
+            return []
+        children = []
+        edge = self.first_edge[index - 1]
+        while edge != -1:
+            children.append((self.node_states[self.edge_child[edge]], self.edge_value[edge]))
+            edge = self.edge_next[edge]
+        return children
+
+    @property
+    def nodes(self) -> Dict[int, List[Tuple[int, float]]]:
+        """
+            Mapping of the nodes (that have children) to their children, built from the node arrays.
+        """
+        return {state: self.children(state) for index, state in enumerate(self.node_states)
+                if self.first_edge[index] != -1}
+
+    def walk(self, max_depth: Optional[int] = None,
+             root: Optional[Tuple[int, float]] = None) -> Iterator[Tuple[int, int, float]]:
+        """
+            Walks the tree in depth-first order (every node before its children), with an explicit stack, so that
+            deep trees do not hit the recursion limit.
+
+            :param max_depth: The depth of the deepest nodes to be walked, None to walk the whole tree.
+            :type max_depth: int
+            :param root: The node to start from. Defaults to the tree root.
+            :type root: Tuple[int, float]
+            :return: Iterator of (depth, node state, node evaluation) of every walked node.
+        """
+        stack = [(0, *(root if root is not None else self.root))]
+        while stack:
+            depth, state, value = stack.pop()
+            yield depth, state, value
+            if max_depth is None or depth < max_depth:
+                stack.extend((depth + 1, *child) for child in reversed(self.children(state)))
 
     def display_tree(self):
         self.display_node(self.root, "")
 
     def display_node(self, node: Tuple[int, float], prefix):
         """
-            Recursively displays the node and its children.
+            Displays the node and its children.
 
             :param node: The node to be displayed.
             :type node: Tuple[int, float]
             :param prefix: Prefix string for formatting display.
             :type prefix: str
         """
-        print(f"{prefix}Node{self.identifier[node[0]]}: {node[1]}")
-        if node[0] not in self.nodes:
-            return
-        for child in self.nodes[node[0]]:
-            self.display_node(child, prefix + "|--")
+        for depth, state, value in self.walk(root=node):
+            print(f"{prefix}{'|--' * depth}Node{self.identifier[state]}: {value}")
 
     def set_root(self, root: Tuple[int, float]):
         """
@@ -65,3 +140,17 @@ class Tree:
             :type root: Tuple[int, float]
         """
         self.root = root
+        self._node_index(root[0])
+
+    def _node_index(self, state: int) -> int:
+        """
+            Returns the index of a node in the node arrays, the node is added if it is not in the tree yet.
+        """
+        identifier = self.identifier.get(state)
+        if identifier is None:
+            identifier = len(self.identifier) + 1
+            self.identifier[state] = identifier
+            self.node_states.append(state)
+            self.first_edge.append(-1)
+            self.last_edge.append(-1)
+        return identifier - 1
@@ -0,0 +1,138 @@
+from typing import *
+
+import numpy as np
+
+from src.state.geometry import get_geometry
+
+"""
+Connect 4 Batch Evaluation
+
+This code evaluates `calculate_heuristic` and `get_game_score` for many boards at once with NumPy, instead of paying the
+Python loops overhead for every single board.
+
+The boards are given as an (N, H, W) integer array, holding the same values as `State.to_2d` (row 0 is the top row,
+0 for an empty cell), and can be built out of states objects or `State.get_value()` integers with `boards_from_states`
+and `boards_from_values`.
+
+NOTE: NumPy is only needed by this module, the rest of the game does not depend on it.
+
+"""
+
+
+def boards_from_states(states: Sequence) -> np.ndarray:
+    """
+    Stacks the 2D boards of the given states.
+
+    :param states: The states to be converted (`State` or `BitboardState`), all of the same board size.
+    :return: (N, H, W) int8 array of the boards.
+    :rtype: np.ndarray
+    """
+    return np.array([state.to_2d() for state in states], dtype=np.int8)
+
+
+def boards_from_values(values: Sequence[int], width: int, height: int) -> np.ndarray:
+    """
+    Decodes `State.get_value()` integers of the given board size into 2D boards.
+
+    :param values: The state integer values.
+    :param width: Board width.
+    :type width: int
+    :param height: Board height.
+    :type height: int
+    :return: (N, H, W) int8 array of the boards.
+    :rtype: np.ndarray
+    """
+    geometry = get_geometry(width, height)
+    n_bytes = (width * (height + geometry.h_i_bits_count) + 7) // 8
+    raw = np.frombuffer(b''.join(value.to_bytes(n_bytes, 'little') for value in values), dtype=np.uint8)
+    bits = np.unpackbits(raw.reshape(len(values), n_bytes), axis=1, bitorder='little')
+
+    heights = np.zeros((len(values), width), dtype=np.int64)
+    for i in range(geometry.h_i_bits_count):
+        heights += bits[:, np.array(geometry.height_shifts) + i].astype(np.int64) << i
+    cells = bits[:, np.array(geometry.cell_shifts)]  # (N, H, W), row 0 is the bottom row
+    occupied = np.arange(height)[None, :, None] < heights[:, None, :]
+    boards = np.where(occupied, np.where(cells == 1, 2, 1), 0).astype(np.int8)
+    return boards[:, ::-1, :]
+
+
+def batch_heuristic(boards: np.ndarray, computer_piece: int = 1, human_piece: int = 2) -> np.ndarray:
+    """
+    Computes `calculate_heuristic` of every board.
+
+    Every line of a board is split into segments of cells that are not blocked by the opponent, and a segment of
+    length L > 3 holding `a` player discs scores (L - 3) * 25 * a, that is, every player disc scores 25 * (L - 3) where
+    L is the length of the segment holding it, and L is the sum of the free cells runs to the left and to the right.
+
+    :param boards: (N, H, W) array of the boards.
+    :type boards: np.ndarray
+    :param computer_piece: The computer piece number.
+    :type computer_piece: int
+    :param human_piece: The human piece number.
+    :type human_piece: int
+    :return: (N,) array of the heuristic values.
+    :rtype: np.ndarray
+    """
+    boards = np.asarray(boards)
+    geometry = get_geometry(boards.shape[2], boards.shape[1])
+    lines = geometry.row_lines + geometry.column_lines + geometry.diagonal_lines
+    max_length = max(len(line) for line in lines)
+
+    rows = np.zeros((len(lines), max_length), dtype=np.intp)
+    cols = np.zeros((len(lines), max_length), dtype=np.intp)
+    valid = np.zeros((len(lines), max_length), dtype=bool)
+    for line_idx, line in enumerate(lines):
+        rows[line_idx, :len(line)] = [row for row, _ in line]
+        cols[line_idx, :len(line)] = [col for _, col in line]
+        valid[line_idx, :len(line)] = True
+    cells = boards[:, rows.T, cols.T].transpose(1, 0, 2)  # (max_length, N, lines)
+    valid = valid.T[:, None, :]
+
+    return _batch_player_heuristic(cells, valid, computer_piece) - _batch_player_heuristic(cells, valid, human_piece)
+
+
+def batch_game_score(boards: np.ndarray, computer_number: int = 1, human_number: int = 2) -> np.ndarray:
+    """
+    Computes `get_game_score` of every board, with sliding windows of 4 cells in all the directions.
+
+    :param boards: (N, H, W) array of the boards.
+    :type boards: np.ndarray
+    :param computer_number: The computer piece number.
+    :type computer_number: int
+    :param human_number: The human piece number.
+    :type human_number: int
+    :return: (N, 2) array of the computer and human scores.
+    :rtype: np.ndarray
+    """
+    boards = np.asarray(boards)
+    return np.stack([_batch_player_score(boards == computer_number),
+                     _batch_player_score(boards == human_number)], axis=1)
+
+
+def _batch_player_heuristic(cells: np.ndarray, valid: np.ndarray, player_piece: int) -> np.ndarray:
+    discs = cells == player_piece
+    free = (discs | (cells == 0)) & valid
+    max_length = cells.shape[0]
+
+    # runs of free cells ending at (left) and starting from (right) every cell of the lines
+    left = np.empty(cells.shape, dtype=np.int16)
+    right = np.empty(cells.shape, dtype=np.int16)
+    left[0] = free[0]
+    right[-1] = free[-1]
+    for i in range(1, max_length):
+        left[i] = (left[i - 1] + 1) * free[i]
+        right[-1 - i] = (right[-i] + 1) * free[-1 - i]
+
+    windows_count = np.maximum(left + right - 4, 0)
+    return 25 * (discs * windows_count).sum(axis=(0, 2), dtype=np.int64)
+
+
+def _batch_player_score(player: np.ndarray) -> np.ndarray:
+    height, width = player.shape[1], player.shape[2]
+    horizontal = player[:, :, :width - 3] & player[:, :, 1:width - 2] & player[:, :, 2:width - 1] & player[:, :, 3:]
+    vertical = player[:, :height - 3] & player[:, 1:height - 2] & player[:, 2:height - 1] & player[:, 3:]
+    main_diagonal = (player[:, 3:, :width - 3] & player[:, 2:height - 1, 1:width - 2] &
+                     player[:, 1:height - 2, 2:width - 1] & player[:, :height - 3, 3:])
+    secondary_diagonal = (player[:, :height - 3, :width - 3] & player[:, 1:height - 2, 1:width - 2] &
+                          player[:, 2:height - 1, 2:width - 1] & player[:, 3:, 3:])
+    return sum(windows.sum(axis=(1, 2)) for windows in (horizontal, vertical, main_diagonal, secondary_diagonal))
@@ -1,34 +1,37 @@
 from typing import List
 
 from src.utilities.get_score import get_player_score
-from src.state.state import _check_valid_indices
+from src.state.geometry import get_geometry
 
 
-def get_boundary_pts(state):
-    pts = []
-    for row in range(len(state)):
-        pts.append((row, 0))
-        pts.append((row, len(state[0]) - 1))
-    for col in range(1, len(state[0])):
-        pts.append((0, col))
-    return pts
+def calc_lines(state: List[List[int]], lines, player_piece: int):
+    """
+    Scores the given lines of the board for a player.
 
+    Every maximal segment of a line holding only the player discs or empty cells, and of length L > 3, adds
+    (L - 3) * 25 * (number of the player discs in the segment) to the score.
 
-def calc_row(state: List[List[int]], player_piece: int):
+    :param state: 2D representation of the game state.
+    :type state: List[List[int]]
+    :param lines: The lines to be scanned, each line is a sequence of (row, col) cells.
+    :param player_piece: The player piece number.
+    :type player_piece: int
+    :return: The score of the lines.
+    :rtype: int
+    """
     score = 0
-    for row in range(len(state)):
+    for line in lines:
         accumulator = 0
         longest_chain = 0
-        for col in range(len(state[0])):
-            if state[row][col] == player_piece or state[row][col] == 0:
-                if state[row][col] == player_piece:
+        for row, col in line:
+            cell = state[row][col]
+            if cell == player_piece or cell == 0:
+                if cell == player_piece:
                     accumulator += 1
-                # accumulator += 1
                 longest_chain += 1
             else:
                 if longest_chain > 3:
                     score += (longest_chain - 3) * 25 * accumulator
-                # score += (longest_chain - 3) * 100 - (longest_chain - accumulator) * 25
                 accumulator = 0
                 longest_chain = 0
         if longest_chain > 3:
@@ -36,76 +39,16 @@ def calc_row(state: List[List[int]], player_piece: int):
     return score
 
 
-def calc_col(state: List[List[int]], player_piece: int):
-    score = 0
-    for col in range(len(state[0])):
-        accumulator = 0
-        longest_chain = 0
-        for row in range(len(state)):
-            if state[row][col] == player_piece or state[row][col] == 0:
-                if state[row][col] == player_piece:
-                    accumulator += 1
-                # accumulator += 1
-                longest_chain += 1
-            else:
-                if longest_chain > 3:
-                    score += (longest_chain - 3) * 25 * accumulator
-                # score += (longest_chain - 3) * 100 - (longest_chain - accumulator) * 25
-                accumulator = 0
-                longest_chain = 0
-        if longest_chain > 3:
-            score += (longest_chain - 3) * 25 * accumulator
-    return score
-
+def calc_row(state: List[List[int]], player_piece: int):
+    return calc_lines(state, get_geometry(len(state[0]), len(state)).row_lines, player_piece)
 
-def calc_diagonal(state: List[List[int]], player_piece: int):
-    boundary_pts = get_boundary_pts(state)
-    score = 0
-    for pt in boundary_pts:
-        # up left
 
-        accumulator = 0
-        longest_chain = 0
-        i = 0
-        # while _check_valid_indices(pt[0] - i, pt[1] - i):
-        while (0 <= pt[0] - i) and (0 <= pt[1] - i):
-            if state[pt[0] - i][pt[1] - i] == player_piece or state[pt[0] - i][pt[1] - i] == 0:
-                if state[pt[0] - i][pt[1] - i] == player_piece:
-                    accumulator += 1
-                # accumulator += 1
-                longest_chain += 1
-            else:
-                if longest_chain > 3:
-                    score += (longest_chain - 3) * 25 * accumulator
-                # score += (longest_chain - 3) * 100 - (longest_chain - accumulator) * 25
-                accumulator = 0
-                longest_chain = 0
-            i += 1
-        if longest_chain > 3:
-            score += (longest_chain - 3) * 25 * accumulator
+def calc_col(state: List[List[int]], player_piece: int):
+    return calc_lines(state, get_geometry(len(state[0]), len(state)).column_lines, player_piece)
 
-        # up right
-        accumulator = 0
-        longest_chain = 0
-        i = 0
-        # while _check_valid_indices(pt[0] + i, pt[1] + i):
-        while (0 <= pt[0] - i) and (pt[1] + i < len(state[0])):
-            if (state[pt[0] - i][pt[1] + i] == player_piece) or (state[pt[0] - i][pt[1] + i] == 0):
-                if state[pt[0] - i][pt[1] + i] == player_piece:
-                    accumulator += 1
-                # accumulator += 1
-                longest_chain += 1
-            else:
-                if longest_chain > 3:
-                    score += (longest_chain - 3) * 25 * accumulator
-                # score += (longest_chain - 3) * 100 - (longest_chain - accumulator) * 25
-                accumulator = 0
-                longest_chain = 0
-            i += 1
-        if longest_chain > 3:
-            score += (longest_chain - 3) * 25 * accumulator
 
-    return score
+def calc_diagonal(state: List[List[int]], player_piece: int):
+    return calc_lines(state, get_geometry(len(state[0]), len(state)).diagonal_lines, player_piece)
 
 
 def calculate_heuristic(state: List[List[int]], computer_piece: int, human_piece: int) -> float:
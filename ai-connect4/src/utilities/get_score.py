@@ -1,5 +1,7 @@
 from typing import *
 
+from src.state.geometry import get_geometry
+
 
 # First number for computer score and the second number for human score
 def get_game_score(state: List[List[int]], computer_number: int, human_number: int) -> Tuple[int, int]:
@@ -7,12 +9,9 @@ def get_game_score(state: List[List[int]], computer_number: int, human_number: i
 
 
 def get_player_score(state: List[List[int]], player_number: int) -> int:
-    score = 0
-    score += count_in_rows(state, player_number)
-    score += count_in_columns(state, player_number)
-    score += count_in_main_diagonals(state, player_number)
-    score += count_in_secondary_diagonals(state, player_number)
-    return score
+    # same as summing count_in_rows, count_in_columns and both count_in_*_diagonals, using the board bitboard
+    geometry = get_geometry(len(state[0]), len(state))
+    return geometry.count_fours(geometry.to_bitboard(state, player_number))
 
 
 def count_in_rows(state: List[List[int]], player: int) -> int:
@@ -0,0 +1,121 @@
+from typing import *
+
+from src.state.geometry import get_geometry
+from src.utilities.get_heuristic import calc_lines
+
+"""
+Connect 4 Incremental Heuristic
+
+This code defines an evaluator that keeps the value of `calculate_heuristic` up to date while moves are played and
+taken back during a search, instead of rescanning the whole 2D board at every leaf.
+
+The heuristic scores every line (row, column and diagonal) independently, so the evaluator keeps, for every line,
+the bits of the computer and human discs on it, and the value of the line. Dropping (or removing) a disc only changes
+the lines passing by its cell (at most 4), whose values are looked up in tables shared by all the lines of the same
+length, and filled the first time a pattern is seen.
+
+"""
+
+# line length -> {(computer bits, human bits): computer line score - human line score}
+_line_values: Dict[int, Dict[Tuple[int, int], int]] = {}
+
+
+def _line_value(length: int, computer_bits: int, human_bits: int) -> int:
+    """
+    Scores a single line of the given discs, the same way `calculate_heuristic` does.
+
+    :param length: The number of cells of the line.
+    :type length: int
+    :param computer_bits: The computer discs on the line, bit i is set if the i-th cell holds a computer disc.
+    :type computer_bits: int
+    :param human_bits: The human discs on the line, bit i is set if the i-th cell holds a human disc.
+    :type human_bits: int
+    :return: The computer score of the line minus the human score of the line.
+    :rtype: int
+    """
+    table = _line_values.setdefault(length, {})
+    key = (computer_bits, human_bits)
+    if key not in table:
+        line = [[1 if computer_bits >> i & 1 else 2 if human_bits >> i & 1 else 0 for i in range(length)]]
+        cells = [tuple((0, i) for i in range(length))]
+        table[key] = calc_lines(line, cells, 1) - calc_lines(line, cells, 2)
+    return table[key]
+
+
+class IncrementalHeuristic:
+    def __init__(self, state):
+        """
+        Builds the evaluator of the given state.
+
+        :param state: The state to be evaluated (`State` or `BitboardState`).
+        """
+        state_2d = state.to_2d()
+        geometry = get_geometry(len(state_2d[0]), len(state_2d))
+        self.height = geometry.height
+        lines = geometry.row_lines + geometry.column_lines + geometry.diagonal_lines
+
+        self.lengths = [len(line) for line in lines]
+        self.computer_bits = [0] * len(lines)
+        self.human_bits = [0] * len(lines)
+        self.line_values = [0] * len(lines)
+        # col * height + row (row 0 is the bottom row) -> list of (line index, bit of the cell in the line)
+        self.cell_lines: List[List[Tuple[int, int]]] = [[] for _ in range(geometry.width * geometry.height)]
+        for line_idx, line in enumerate(lines):
+            for position, (row_2d, col) in enumerate(line):
+                self.cell_lines[col * self.height + self.height - 1 - row_2d].append((line_idx, 1 << position))
+
+        self.value = 0
+        for row_2d, row in enumerate(state_2d):
+            for col, cell in enumerate(row):
+                if cell:
+                    self.add(self.height - 1 - row_2d, col, cell == 1)
+
+    def get_value(self) -> int:
+        """
+        Returns the current heuristic value, equal to `calculate_heuristic(state.to_2d(), 1, 2)`.
+
+        :return: The heuristic value of the current state.
+        :rtype: int
+        """
+        return self.value
+
+    def add(self, row: int, col: int, is_computer: bool):
+        """
+        Updates the value after a disc has been dropped.
+
+        :param row: The row the disc landed in (row 0 is the bottom row, as returned by `play`).
+        :type row: int
+        :param col: The column of the disc.
+        :type col: int
+        :param is_computer: True if the disc belongs to the computer.
+        :type is_computer: bool
+        """
+        self._update(row, col, is_computer)
+
+    def remove(self, row: int, col: int, is_computer: bool):
+        """
+        Updates the value after a disc has been taken back.
+
+        :param row: The row the disc is removed from (row 0 is the bottom row, as returned by `undo`).
+        :type row: int
+        :param col: The column of the disc.
+        :type col: int
+        :param is_computer: True if the disc belongs to the computer.
+        :type is_computer: bool
+        """
+        self._update(row, col, is_computer)
+
+    def _update(self, row: int, col: int, is_computer: bool):
+        """
+        Toggles a disc of the lines passing by the cell, and updates the value by the changes of their values.
+        """
+        computer_bits = self.computer_bits
+        human_bits = self.human_bits
+        for line_idx, bit in self.cell_lines[col * self.height + row]:
+            if is_computer:
+                computer_bits[line_idx] ^= bit
+            else:
+                human_bits[line_idx] ^= bit
+            new_value = _line_value(self.lengths[line_idx], computer_bits[line_idx], human_bits[line_idx])
+            self.value += new_value - self.line_values[line_idx]
+            self.line_values[line_idx] = new_value
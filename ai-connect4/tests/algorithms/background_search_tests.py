@@ -0,0 +1,88 @@
+import unittest
+
+from src.state.state import State, change_game_board
+from src.algorithms.engine import SearchEngine, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.background_search import BackgroundSearch, BackgroundPonder
+from src.controller.controller import Connect4Controller
+
+
+class BackgroundSearchTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_same_result_as_search(self):
+        state = State(True)
+        state.update_col(3)
+        search = BackgroundSearch(SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4), state).start()
+        self.assertTrue(search.join(60))
+        value, next_state = search.get_result()
+        expected_value, expected_state = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4).search(state)
+        self.assertEqual(expected_value, value)
+        self.assertEqual(expected_state.get_value(), next_state.get_value())
+        self.assertEqual(search.depth, 4)
+        self.assertEqual(search.value, value)
+        self.assertGreater(search.nodes, 0)
+
+    def test_move_now(self):
+        """
+            Test that a deep search stopped early still plays a legal move, of a completed depth.
+        """
+        state = State(True)
+        search = BackgroundSearch(SearchEngine(MINIMAX_WITH_ALPHA_BETA, 42), state).start()
+        search.move_now()
+        self.assertTrue(search.join(60))
+        _, next_state = search.get_result()
+        self.assertGreaterEqual(search.depth, 1)
+        self.assertLess(search.depth, 42)
+        self.assertIn(next_state.get_value(), [successor.get_value() for successor in state.get_successors()])
+
+    def test_not_done(self):
+        search = BackgroundSearch(SearchEngine(), State(True))
+        self.assertFalse(search.done())
+        self.assertRaises(RuntimeError, search.get_result)
+
+    def test_error_is_raised(self):
+        search = BackgroundSearch(SearchEngine(), State(True))
+        search.engine = None  # the search fails in the worker thread
+        search.start().join(60)
+        self.assertRaises(AttributeError, search.get_result)
+
+    def test_controller(self):
+        controller = Connect4Controller(5, 4)
+        controller.set_ai_options(MINIMAX_WITH_ALPHA_BETA, 3)
+        controller.play(2)
+        search = controller.start_ai_search()
+        board = controller.finish_ai_search(search)
+        self.assertEqual(sum(cell != 0 for row in board for cell in row), 2)
+        self.assertFalse(controller.get_state().is_computer_turn())
+
+    def test_controller_pondering(self):
+        controller = Connect4Controller(5, 4, SearchEngine(MINIMAX_WITH_ALPHA_BETA, 3), ponder=True)
+        controller.play(2)
+        controller.ai_play()
+        self.assertIsNotNone(controller.ponderer)
+        self.assertTrue(controller.ponderer.join(60))
+        self.assertEqual(controller.ponderer.pondered, len(controller.get_state().legal_moves()))
+        controller.play(1)
+        search = controller.start_ai_search()
+        search.join(60)
+        self.assertEqual(search.nodes, 0)  # served from the pondered searches
+        controller.finish_ai_search(search)
+        controller.stop_pondering()
+        self.assertIsNone(controller.ponderer)
+
+    def test_controller_pondering_keeps_ai_search(self):
+        controller = Connect4Controller(7, 6, SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4), ponder=True)
+        controller.play(3)
+        controller.ai_play()
+        solver, nodes, depth_reached = controller.engine.solver, controller.engine.nodes, controller.engine.depth_reached
+        self.assertTrue(controller.ponderer.join(60))
+        self.assertIs(controller.engine.solver, solver)
+        self.assertEqual((controller.engine.nodes, controller.engine.depth_reached), (nodes, depth_reached))
+
+    def test_ponder_error_is_raised(self):
+        ponderer = BackgroundPonder(SearchEngine(), State())
+        ponderer.engine = None  # the pondering fails in the worker thread
+        ponderer.start()
+        self.assertRaises(AttributeError, ponderer.join, 60)
+        self.assertRaises(AttributeError, ponderer.stop)
@@ -0,0 +1,181 @@
+import threading
+import unittest
+
+from src.state.state import State, change_game_board
+from src.algorithms.engine import SearchEngine, PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.minimax import Minimax
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+
+
+class _FixedMoveDatabase:
+    """
+    A positions database playing the same move in every position.
+    """
+    def __init__(self, move: int, depth: int):
+        self.move = move
+        self.depth = depth
+
+    def lookup(self, state):
+        return self.move, 0.0
+
+
+class SearchEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4, table_capacity=1 << 14)
+
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_same_results_as_fresh_solvers(self):
+        """
+            Test that playing a game with a warm table gives the same values as searching every move from scratch.
+        """
+        for approach, solver_cls, run in ((PURE_MINIMAX, Minimax, "run_minimax"),
+                                          (MINIMAX_WITH_ALPHA_BETA, MinimaxWithAlphaBeta,
+                                           "run_minimax_with_alpha_beta")):
+            self.engine.approach = approach
+            self.engine.new_game()
+            state = State()
+            for human_move in (3, 2, 4, 3):
+                state.update_col(human_move, True)
+                value, next_state = self.engine.search(state)
+                expected_value, _ = getattr(solver_cls(4), run)(state)
+                self.assertEqual(expected_value, value)
+                state = next_state
+
+    def test_table_is_kept_between_moves(self):
+        state = State()
+        state.update_col(3, True)
+        self.engine.search(state)
+        size = len(self.engine.table)
+        self.assertGreater(size, 0)
+        self.engine.search(state)
+        self.assertEqual(size, len(self.engine.table))
+
+    def test_new_game(self):
+        self.engine.search(State(True))
+        self.engine.new_game()
+        self.assertEqual(len(self.engine.table), 0)
+
+        engine = SearchEngine(k=2, keep_table_across_games=True)
+        engine.search(State(True))
+        engine.new_game()
+        self.assertGreater(len(engine.table), 0)
+
+    def test_board_size_change_clears_table(self):
+        self.engine.search(State(True))
+        self.assertGreater(len(self.engine.table), 0)
+        change_game_board(5, 5)
+        # a database answers the 5x5 search, so that no new entry is stored
+        self.engine.attach_database(_FixedMoveDatabase(2, self.engine.k))
+        self.engine.search(State(True))
+        self.assertEqual(len(self.engine.table), 0)
+        self.assertEqual(self.engine._board_size, (5, 5))
+
+    def test_iterative_deepening_completes(self):
+        """
+            Test that with a large enough budget, iterative deepening reaches depth k and finds the k depth value.
+        """
+        state = State(True)
+        state.update_col(3)
+        value, _ = self.engine.search(state, time_budget=60)
+        self.assertEqual(self.engine.depth_reached, 4)
+        self.assertEqual(MinimaxWithAlphaBeta(4).run_minimax_with_alpha_beta(state)[0], value)
+
+    def test_iterative_deepening_budget(self):
+        """
+            Test that an exhausted budget stops the search early, while still returning a legal move.
+        """
+        engine = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 12)
+        state = State(True)
+        _, next_state = engine.search(state, node_budget=2000)
+        self.assertLess(engine.depth_reached, 12)
+        self.assertIn(next_state.get_value(), [successor.get_value() for successor in state.get_successors()])
+
+        _, next_state = engine.search(state, time_budget=0)
+        self.assertEqual(engine.depth_reached, 1)
+        self.assertIn(next_state.get_value(), [successor.get_value() for successor in state.get_successors()])
+
+    def test_stop_flag(self):
+        """
+            Test that a set stop flag stops the search after depth 1, and that a stop flag alone deepens up to k.
+        """
+        engine = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 12)
+        state = State(True)
+        stop = threading.Event()
+        stop.set()
+        _, next_state = engine.search(state, stop=stop)
+        self.assertEqual(engine.depth_reached, 1)
+        self.assertIn(next_state.get_value(), [successor.get_value() for successor in state.get_successors()])
+
+        value, _ = self.engine.search(state, stop=threading.Event())
+        self.assertEqual(self.engine.depth_reached, 4)
+        self.assertEqual(MinimaxWithAlphaBeta(4).run_minimax_with_alpha_beta(state)[0], value)
+
+    def test_progress(self):
+        """
+            Test that the progress callback is called after every completed depth, and that the searched nodes are
+            counted.
+        """
+        state = State(True)
+        updates = []
+        value, _ = self.engine.search(state, time_budget=60,
+                                      progress=lambda depth, move, value_: updates.append((depth, move, value_)))
+        self.assertEqual([depth for depth, _, _ in updates], [1, 2, 3, 4])
+        self.assertEqual((self.engine.solver.best_move, value), updates[-1][1:])
+        self.assertEqual(self.engine.searched_nodes, self.engine.nodes)
+        self.assertGreater(self.engine.nodes, 0)
+
+        updates.clear()
+        self.engine.search(state, progress=lambda depth, move, value_: updates.append(depth))
+        self.assertEqual(updates, [4])
+
+    def test_ponder(self):
+        """
+            Test that after pondering, the search of every human reply is served from the pondered results, with the
+            same values as fresh searches.
+        """
+        state = State()
+        state.update_col(3, True)
+        _, state = self.engine.search(state)
+        self.assertEqual(self.engine.ponder(state), len(state.legal_moves()))
+        for col in state.legal_moves():
+            reply = state.copy()
+            reply.update_col(col, True)
+            value, next_state = self.engine.search(reply)
+            self.assertEqual(self.engine.searched_nodes, 0)  # no search
+            self.assertEqual(self.engine.depth_reached, 4)
+            expected_value, _ = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4).search(reply)
+            self.assertEqual(expected_value, value)
+            self.assertIn(next_state.get_value(), [successor.get_value() for successor in reply.get_successors()])
+
+    def test_ponder_stop_and_options(self):
+        """
+            Test that a stopped pondering keeps no results, and that the results of other options are not served.
+        """
+        state = State()
+        state.update_col(3, True)
+        state.update_col(3, True)
+        stop = threading.Event()
+        stop.set()
+        self.assertEqual(self.engine.ponder(state, stop), 0)
+
+        self.engine.ponder(state)
+        self.engine.k = 3
+        reply = state.copy()
+        reply.update_col(2, True)
+        self.engine.search(reply)
+        self.assertGreater(self.engine.searched_nodes, 0)
+
+    def test_ponder_keeps_last_search(self):
+        """
+            Test that pondering leaves the fields of the last search (solver, nodes, depth reached) alone.
+        """
+        state = State()
+        state.update_col(3, True)
+        _, state = self.engine.search(state)
+        solver, nodes, depth_reached = self.engine.solver, self.engine.nodes, self.engine.depth_reached
+        self.engine.ponder(state)
+        self.assertIs(self.engine.solver, solver)
+        self.assertEqual((self.engine.nodes, self.engine.depth_reached), (nodes, depth_reached))
+        self.assertEqual(self.engine.searched_nodes, nodes)
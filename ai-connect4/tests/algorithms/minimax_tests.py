@@ -0,0 +1,66 @@
+import unittest
+
+from src.state.state import State
+from src.algorithms.minimax import Minimax
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.utilities.get_heuristic import calculate_heuristic
+
+
+def plain_minimax(state: State, depth: int) -> float:
+    """
+        Reference minimax built on `get_successors`, without any caching.
+    """
+    successors = state.get_successors()
+    if depth == 0 or not successors:
+        return calculate_heuristic(state.to_2d(), 1, 2)
+    values = [plain_minimax(successor, depth - 1) for successor in successors]
+    return max(values) if state.is_computer_turn() else min(values)
+
+
+class MinimaxTests(unittest.TestCase):
+    def setUp(self):
+        '''
+        0 0 0 0 0 0 0
+        0 0 0 0 0 0 0
+        0 0 0 0 0 0 0
+        0 0 1 0 0 0 0
+        0 0 2 1 0 0 0
+        0 2 1 2 0 0 0
+        '''
+        self.state = State(True)
+        for col in (1, 2, 3, 3, 2, 2):
+            self.state.comp_turn = not self.state.comp_turn
+            self.state.update_col(col)
+        self.state.comp_turn = True
+
+    def test_minimax_value(self):
+        for k in (1, 2, 3):
+            value, _ = Minimax(k).run_minimax(self.state)
+            self.assertEqual(plain_minimax(self.state, k), value)
+
+    def test_next_step_is_a_successor(self):
+        for solver, run in ((Minimax(3), Minimax.run_minimax),
+                            (MinimaxWithAlphaBeta(3), MinimaxWithAlphaBeta.run_minimax_with_alpha_beta)):
+            initial_value = self.state.get_value()
+            _, next_step = run(solver, self.state)
+            self.assertIsInstance(next_step, State)
+            self.assertIn(next_step.get_value(), [successor.get_value() for successor in self.state.get_successors()])
+            self.assertFalse(next_step.is_computer_turn())
+            self.assertEqual(self.state.get_value(), initial_value)
+
+    def test_alpha_beta_root_value(self):
+        """
+            Test that alpha-beta pruning finds the same root value as the plain minimax.
+        """
+        for k in (1, 2, 3, 4):
+            value, _ = MinimaxWithAlphaBeta(k).run_minimax_with_alpha_beta(self.state)
+            self.assertEqual(plain_minimax(self.state, k), value)
+
+    def test_full_board(self):
+        state = State()
+        for _ in range(6):
+            for col in range(7):
+                state.update_col(col, True)
+        value, next_step = Minimax(2).run_minimax(state)
+        self.assertIs(next_step, state)
+        self.assertEqual(value, -float('inf'))
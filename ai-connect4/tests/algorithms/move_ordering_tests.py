@@ -0,0 +1,71 @@
+import unittest
+
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.move_ordering import MoveOrderer, center_out_order, ordered_moves
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.transposition_table import TranspositionTable
+from src.state.bitboard_state import BitboardState
+from src.tools.positions import load_position
+
+
+class MoveOrderingTests(unittest.TestCase):
+    def setUp(self):
+        self.ordering = MoveOrderer(7)
+
+    def test_center_out_order(self):
+        self.assertEqual(center_out_order(7), [3, 2, 4, 1, 5, 0, 6])
+        self.assertEqual(center_out_order(4), [1, 2, 0, 3])
+        self.assertEqual(self.ordering.order([0, 1, 2, 3, 4, 5, 6], 0, True), [3, 2, 4, 1, 5, 0, 6])
+
+    def test_table_move_first(self):
+        self.assertEqual(self.ordering.order([0, 1, 3, 6], 0, True, table_move=6), [6, 3, 1, 0])
+        self.assertEqual(self.ordering.order([0, 1, 3], 0, True, table_move=6), [3, 1, 0])
+
+    def test_killers_and_history(self):
+        """
+            Test that the killer moves of a ply come right after the table move, and the history sorts the rest.
+        """
+        self.ordering.record_cutoff(0, 2, 3, True)
+        self.ordering.record_cutoff(6, 2, 1, True)
+        self.assertEqual(self.ordering.order([0, 1, 2, 3, 4, 5, 6], 2, True), [6, 0, 3, 2, 4, 1, 5])
+        self.assertEqual(self.ordering.order([0, 1, 2, 3, 4, 5, 6], 2, True, table_move=4)[:3], [4, 6, 0])
+        # on another ply, only the history applies, and it is kept per player
+        self.assertEqual(self.ordering.order([0, 1, 2, 3, 4, 5, 6], 1, True)[:3], [0, 6, 3])
+        self.assertEqual(self.ordering.order([0, 1, 2, 3, 4, 5, 6], 1, False)[:3], [3, 2, 4])
+
+    def test_threat_moves(self):
+        """
+            Test that the moves completing a four come first, then the moves stopping a four of the opponent.
+        """
+        state = BitboardState(True)
+        for col in (0, 6, 1, 6, 2, 6):  # the computer threatens column 3, the human column 6
+            state.play(col)
+        own, opponent = state.threats()
+        self.assertEqual((own, opponent), (1 << 3 * 7, 1 << 6 * 7 + 3))
+        self.assertEqual(state.threat_moves(), [3, 6])
+        ordering = MoveOrderer(7, use_threats=True)
+        self.assertEqual(ordering.order(state.legal_moves(), 0, True, 4, state.threat_moves())[:3], [4, 3, 6])
+        self.assertEqual(self.ordering.order(state.legal_moves(), 0, True, None, [6])[0], 3)  # off by default
+
+    def test_ordered_moves(self):
+        state = BitboardState(True)
+        for col in (0, 6, 1, 6, 2, 6):  # the computer threatens column 3, the human column 6
+            state.play(col)
+        ordering = MoveOrderer(7, use_threats=True)
+        self.assertEqual(ordered_moves(state, ordering, 0, 4), ordering.order_state(state, 0, 4))
+        self.assertEqual(ordered_moves(state, ordering, 0, 4)[:3], [4, 3, 6])
+        self.assertEqual(ordered_moves(state, None, 0, 4), [4, 0, 1, 2, 3, 5, 6])  # the columns order
+
+    def test_ordering_keeps_search_value(self):
+        """
+            Test that ordering the moves reduces the visited nodes without changing the search value.
+        """
+        for position in ("early-5", "midgame-15"):
+            results = []
+            for ordering in (None, MoveOrderer(7), MoveOrderer(7, use_threats=True)):
+                limits = SearchLimits()
+                solver = MinimaxWithAlphaBeta(5, TranspositionTable(), limits, ordering)
+                results.append((solver.run_minimax_with_alpha_beta(load_position(position))[0], limits.nodes))
+            self.assertEqual(results[0][0], results[1][0])
+            self.assertEqual(results[0][0], results[2][0])
+            self.assertLess(results[1][1], results[0][1])
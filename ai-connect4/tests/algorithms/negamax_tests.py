@@ -0,0 +1,76 @@
+import unittest
+
+from src.state.state import State
+from src.algorithms.engine import SearchEngine, NEGAMAX_PVS, MINIMAX_WITH_ALPHA_BETA
+from src.algorithms.move_ordering import MoveOrderer
+from src.algorithms.negamax import NegamaxPVS, ASPIRATION_WINDOW
+from src.controller.controller import Connect4Controller
+from tests.algorithms.minimax_tests import plain_minimax
+
+
+class NegamaxPVSTests(unittest.TestCase):
+    def setUp(self):
+        '''
+        0 0 0 0 0 0 0
+        0 0 0 0 0 0 0
+        0 0 0 0 0 0 0
+        0 0 1 0 0 0 0
+        0 0 2 1 0 0 0
+        0 2 1 2 0 0 0
+        '''
+        self.state = State(True)
+        for col in (1, 2, 3, 3, 2, 2):
+            self.state.comp_turn = not self.state.comp_turn
+            self.state.update_col(col)
+        self.state.comp_turn = True
+
+    def test_root_value(self):
+        """
+            Test that the principal variation search finds the same root value as the plain minimax.
+        """
+        for k in (1, 2, 3, 4):
+            value, next_step = NegamaxPVS(k).run_negamax(self.state)
+            self.assertEqual(plain_minimax(self.state, k), value)
+            self.assertIn(next_step.get_value(), [successor.get_value() for successor in self.state.get_successors()])
+            self.assertFalse(next_step.is_computer_turn())
+
+    def test_aspiration_window(self):
+        """
+            Test that the value is the same whether the guess is inside the aspiration window or far outside of it.
+        """
+        expected = plain_minimax(self.state, 4)
+        for guess in (expected, expected + ASPIRATION_WINDOW // 2, expected - 10 * ASPIRATION_WINDOW,
+                      expected + 10 * ASPIRATION_WINDOW):
+            value, _ = NegamaxPVS(4, ordering=MoveOrderer(7)).run_negamax(self.state, 3, guess)
+            self.assertEqual(expected, value)
+
+    def test_human_turn(self):
+        """
+            Test that the human turn values are the minimum over the successors, from the computer point of view.
+        """
+        state = State()
+        state.update_col(3, True)
+        state.update_col(2, True)
+        value, next_step = NegamaxPVS(3).run_negamax(state)
+        self.assertEqual(plain_minimax(state, 3), value)
+        self.assertTrue(next_step.is_computer_turn())
+
+    def test_engine_and_controller(self):
+        """
+            Test that the approach is selectable from the engine and from the controller, sharing its table with the
+            other approaches.
+        """
+        engine = SearchEngine(NEGAMAX_PVS, 4, table_capacity=1 << 14)
+        self.assertEqual(plain_minimax(self.state, 4), engine.search(self.state)[0])
+        self.assertEqual(plain_minimax(self.state, 4), engine.search(self.state, time_budget=60)[0])
+        engine.approach = MINIMAX_WITH_ALPHA_BETA
+        self.assertEqual(plain_minimax(self.state, 4), engine.search(self.state)[0])
+
+        controller = Connect4Controller(7, 6)
+        controller.set_ai_options(NEGAMAX_PVS, 3)
+        controller.play(3)
+        board = controller.ai_play()
+        self.assertEqual(sum(cell != 0 for row in board for cell in row), 2)
+        self.assertFalse(controller.get_state().is_computer_turn())
+        with self.assertRaises(AssertionError):
+            controller.set_ai_options("Unknown", 3)
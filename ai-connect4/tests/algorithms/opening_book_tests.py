@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from src.state.state import State, change_game_board
+from src.algorithms.engine import SearchEngine
+from src.algorithms.opening_book import OpeningBook, build_book, book_positions, SOLVED_DEPTH
+from src.algorithms.solver import Solver
+
+
+class OpeningBookTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_symmetry_folding(self):
+        book = OpeningBook(7, 6, 1, 4)
+        state = State()
+        state.update_col(1, True)
+        book.add(state.get_value(), 2, 50)
+        mirrored = State()
+        mirrored.update_col(5, True)
+        self.assertEqual(len(book), 1)
+        self.assertEqual(book.lookup(state), (2, 50))
+        self.assertEqual(book.lookup(mirrored), (4, 50))
+        self.assertIsNone(book.lookup(State()))  # the human turn
+
+    def test_book_positions(self):
+        change_game_board(4, 4)
+        # the computer turn positions of up to 2 discs: the empty board (computer first), 2 positions after a human
+        # disc and 8 positions after a computer and a human disc (the others are their mirrors)
+        self.assertEqual(len(list(book_positions(2))), 1 + 2 + 8)
+
+    def test_build_save_and_load(self):
+        book = build_book(5, 4, 3, k=3)
+        self.assertGreater(len(book), 0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            book.save(path)
+            loaded = OpeningBook.load(path)
+        self.assertEqual((loaded.width, loaded.height, loaded.plies, loaded.depth), (5, 4, 3, 3))
+        self.assertEqual(loaded.entries, book.entries)
+
+        solver = Solver()
+        change_game_board(4, 4)
+        solved = build_book(4, 4, 1, use_solver=True)
+        self.assertEqual(solved.depth, SOLVED_DEPTH)
+        self.assertEqual(solved.lookup(State(True))[1], solver.solve(State(True)))
+
+    def test_engine_hook(self):
+        state = State()
+        state.update_col(3, True)
+        book = OpeningBook(7, 6, 1, 4)
+        book.add(state.get_value(), 0, 12345)  # not the searched move, to tell that the book was used
+        engine = SearchEngine(k=4, book=book)
+        value, next_state = engine.search(state)
+        self.assertEqual(value, 12345)
+        self.assertIsNone(engine.solver)
+        expected = state.copy()
+        expected.update_col(0, True)
+        self.assertEqual(next_state.get_value(), expected.get_value())
+
+        # a book shallower than the engine depth is not used
+        engine.k = 5
+        self.assertNotEqual(engine.search(state)[0], 12345)
@@ -0,0 +1,37 @@
+import unittest
+
+from src.state.state import State, change_game_board
+from src.algorithms.engine import PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS
+from src.algorithms.parallel import ParallelSearch
+from tests.algorithms.minimax_tests import plain_minimax
+
+
+class ParallelSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.state = State()
+        for col in (3, 2, 4, 3, 2):
+            self.state.update_col(col, True)
+
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_same_value_as_serial_search(self):
+        expected = plain_minimax(self.state, 3)
+        for approach in (PURE_MINIMAX, MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS):
+            with ParallelSearch(3, approach, workers=2) as search:
+                value, next_step = search.run_parallel_search(self.state)
+                self.assertEqual(expected, value)
+                self.assertGreater(search.nodes, 0)
+                # searching again reuses the pool and the worker tables
+                self.assertEqual(expected, search.run_parallel_search(self.state, 6)[0])
+            successors = [successor.get_value() for successor in self.state.get_successors()]
+            self.assertIn(next_step.get_value(), successors)
+            self.assertFalse(next_step.is_computer_turn())
+
+    def test_board_size_change(self):
+        with ParallelSearch(2, workers=2) as search:
+            search.run_parallel_search(self.state)
+            change_game_board(5, 4)
+            state = State()
+            state.update_col(2, True)
+            self.assertEqual(plain_minimax(state, 2), search.run_parallel_search(state)[0])
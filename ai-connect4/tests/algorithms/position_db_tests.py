@@ -0,0 +1,101 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.state.state import State, change_game_board
+from src.algorithms.engine import SearchEngine
+from src.algorithms.opening_book import OpeningBook
+from src.algorithms.position_db import PositionDB, PositionDBBuilder
+from src.algorithms.transposition_table import state_key
+from src.controller.controller import Connect4Controller
+
+
+def random_states(count, seed=7):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        state = State(rng.random() < 0.5)
+        for _ in range(rng.randrange(10)):
+            state.update_col(rng.choice(state.legal_moves()), True)
+        states.append(state)
+    return states
+
+
+class PositionDBTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "positions.pdb")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        change_game_board(7, 6)
+
+    def test_build_and_lookup(self):
+        states = random_states(300)
+        expected = {}
+        # a small chunk size, so that the entries are merged from many runs
+        with PositionDBBuilder(self.path, 7, 6, depth=5, chunk_size=16) as builder:
+            for index, state in enumerate(states):
+                builder.add(state.get_value(), state.is_computer_turn(), index, index % 7)
+                expected.setdefault(state_key(state), (index, index % 7))  # the first entry is kept
+        self.assertEqual(os.listdir(self.directory.name), ["positions.pdb"])  # the runs are removed
+
+        with PositionDB(self.path) as db:
+            self.assertEqual(len(db), len(expected))
+            self.assertEqual(db.depth, 5)
+            for state in states:
+                self.assertEqual(db.lookup_score(state), expected[state_key(state)])
+            missing = State()
+            for col in (0, 1, 2, 3) * 3:  # more discs than any added position
+                missing.update_col(col, True)
+            self.assertIsNone(db.lookup(missing))
+            self.assertIsNone(db.lookup_score(missing))
+            change_game_board(5, 4)  # the positions of another board are never found
+            self.assertIsNone(db.lookup(State(True)))
+
+    def test_folded_lookup(self):
+        state = State()
+        state.update_col(1, True)
+        mirrored = State()
+        mirrored.update_col(5, True)
+        with PositionDBBuilder(self.path, 7, 6, folded=True) as builder:
+            builder.add(state.get_value(), True, 42, 2)
+            builder.add(mirrored.get_value(), True, 0, 0)  # the same position, not kept
+        with PositionDB(self.path) as db:
+            self.assertEqual(len(db), 1)
+            self.assertEqual(db.lookup(state), (2, 42))
+            self.assertEqual(db.lookup(mirrored), (4, 42))
+            self.assertIsNone(db.lookup(State()))
+
+    def test_book_as_database(self):
+        book = OpeningBook(7, 6, 1, 4)
+        state = State()
+        state.update_col(3, True)
+        book.add(state.get_value(), 0, 12345)  # not the searched move, to tell that the database was used
+        self.assertEqual(book.save_db(self.path), 1)
+
+        with PositionDB(self.path) as db:
+            self.assertEqual(db.lookup(state), book.lookup(state))
+            engine = SearchEngine(k=4)
+            engine.attach_database(db)
+            value, next_state = engine.search(state)
+            self.assertEqual(value, 12345)
+            self.assertIsNone(engine.solver)
+            engine.k = 5  # deeper than the database
+            self.assertNotEqual(engine.search(state)[0], 12345)
+
+        controller = Connect4Controller(7, 6)
+        db = controller.attach_database(self.path)
+        self.assertEqual(controller.engine.databases, [db])
+        db.close()
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a database")
+        with self.assertRaises(ValueError):
+            PositionDB(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
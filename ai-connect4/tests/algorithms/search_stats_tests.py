@@ -0,0 +1,57 @@
+import unittest
+
+from src.algorithms.engine import SearchEngine, PURE_MINIMAX, NEGAMAX_PVS
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.search_limits import SearchLimits
+from src.algorithms.search_stats import SearchStats
+from src.algorithms.transposition_table import TranspositionTable
+from src.state.state import change_game_board
+from src.tools.positions import load_position
+
+
+class SearchStatsTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_counters(self):
+        levels = []
+        stats = SearchStats(on_node=lambda state, level: levels.append(level))
+        limits = SearchLimits()
+        solver = MinimaxWithAlphaBeta(5, TranspositionTable(), limits, stats=stats)
+        value, _ = solver.run_minimax_with_alpha_beta(load_position("early-5"))
+        self.assertEqual(stats.nodes, limits.nodes)
+        self.assertEqual(len(levels), stats.nodes)
+        self.assertEqual(max(levels), 5)
+        self.assertEqual(stats.cache_hits + stats.cache_misses, stats.nodes)  # every node probes the table
+        self.assertLess(0, stats.leaves)
+        self.assertLess(stats.leaves, stats.nodes)
+        self.assertLess(0, sum(stats.cutoffs))
+        # the statistics do not change the search
+        self.assertEqual(value, MinimaxWithAlphaBeta(5).run_minimax_with_alpha_beta(load_position("early-5"))[0])
+
+    def test_engine_stats(self):
+        state = load_position("midgame-11")
+        engine = SearchEngine(PURE_MINIMAX, 3, collect_stats=True)
+        engine.search(state)
+        self.assertEqual(engine.stats.nodes, engine.nodes)
+        self.assertEqual(engine.stats.cutoffs, [])  # nothing is pruned
+        self.assertEqual(engine.stats.depth, 3)
+        self.assertAlmostEqual(engine.stats.effective_branching_factor ** 3, engine.stats.nodes)
+        self.assertGreater(engine.stats.elapsed, 0)
+        self.assertEqual(SearchEngine(PURE_MINIMAX, 3).search(state)[0], engine.search(state)[0])
+
+    def test_timing(self):
+        stats = SearchStats(timing=True)
+        engine = SearchEngine(NEGAMAX_PVS, 5)
+        engine.search(load_position("midgame-11"), time_budget=5, stats=stats)
+        self.assertIs(engine.stats, stats)
+        self.assertEqual(stats.nodes, engine.nodes)  # every iteration is counted
+        self.assertGreater(stats.move_generation_time, 0)
+        self.assertGreater(stats.evaluation_time, 0)
+        self.assertLessEqual(stats.move_generation_time + stats.evaluation_time, stats.elapsed)
+        self.assertIn("bookkeeping_time", stats.as_dict())
+        self.assertIn("move generation", stats.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
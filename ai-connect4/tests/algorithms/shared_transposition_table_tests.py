@@ -0,0 +1,72 @@
+import unittest
+
+from src.state.state import State
+from src.algorithms.engine import MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.parallel import LazySMPSearch
+from src.algorithms.shared_transposition_table import SharedTranspositionTable, _HEADER, _SLOT
+from src.algorithms.transposition_table import EXACT, LOWER
+from tests.algorithms.minimax_tests import plain_minimax
+
+
+class SharedTranspositionTableTests(unittest.TestCase):
+    def setUp(self):
+        self.table = SharedTranspositionTable(64)
+        self.attached = SharedTranspositionTable(64, self.table.name)
+
+    def tearDown(self):
+        self.attached.close()
+        self.table.unlink()
+
+    def test_store_and_get(self):
+        self.table.store(5, 3, 100, EXACT, 2)
+        self.assertEqual(self.attached.get(5), (3, 100, EXACT, 2))
+        self.assertIsNone(self.attached.get(6))
+        self.attached.store(6, 1, -25.5, LOWER)
+        self.assertEqual(self.table.get(6), (1, -25.5, LOWER, None))
+        self.assertEqual(self.table.probe(6, 1, -100, -50), (-25.5, None))
+        self.assertEqual(len(self.table), 2)
+
+        # the empty board key (0) is not mistaken for an empty slot
+        self.assertIsNone(self.table.get(0))
+        self.table.store(0, 2, 0, EXACT, 3)
+        self.assertEqual(self.table.get(0), (2, 0, EXACT, 3))
+
+    def test_long_keys(self):
+        key = (1 << 130) | 12345
+        self.table.store(key, 4, 75, EXACT, 1)
+        self.assertEqual(self.attached.get(key), (4, 75, EXACT, 1))
+
+    def test_torn_slot_is_missing(self):
+        self.table.store(5, 3, 100, EXACT, 2)
+        slot = self.table._bucket(5)
+        check, value, info = self.table._read(slot)
+        _SLOT.pack_into(self.table.shm.buf, _HEADER.size + slot * _SLOT.size, check, value + 1, info)
+        self.assertIsNone(self.attached.get(5))
+
+    def test_generations(self):
+        self.table.new_search()
+        self.attached.new_search()
+        self.assertEqual(self.table.generation, 1)
+        self.assertEqual(self.attached.generation, 1)
+
+    def test_same_values_as_private_table(self):
+        state = State()
+        for col in (3, 2, 4):
+            state.update_col(col, True)
+        value, _ = MinimaxWithAlphaBeta(4, self.table).run_minimax_with_alpha_beta(state)
+        self.assertEqual(plain_minimax(state, 4), value)
+        # a second search from the attached table is answered from the shared entries
+        self.assertEqual(value, MinimaxWithAlphaBeta(4, self.attached).run_minimax_with_alpha_beta(state)[0])
+
+    def test_lazy_smp(self):
+        state = State()
+        for col in (3, 2, 4, 3, 2):
+            state.update_col(col, True)
+        for approach in (MINIMAX_WITH_ALPHA_BETA, NEGAMAX_PVS):
+            with LazySMPSearch(4, approach, workers=2, table_capacity=1 << 12) as search:
+                value, next_step = search.run_lazy_smp(state)
+                self.assertEqual(plain_minimax(state, 4), value)
+                self.assertEqual(plain_minimax(state, 4), search.run_lazy_smp(state)[0])
+                self.assertGreater(search.nodes, 0)
+                self.assertIn(next_step.get_value(), [successor.get_value() for successor in state.get_successors()])
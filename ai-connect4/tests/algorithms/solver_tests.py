@@ -0,0 +1,65 @@
+import unittest
+
+from src.state.state import State, change_game_board
+from src.state.bitboard_state import BitboardState
+from src.algorithms.solver import Solver, outcome, WIN, DRAW, LOSS
+from src.algorithms.search_limits import SearchLimits, SearchTimeout
+from src.utilities.get_score import get_game_score
+
+
+def plain_solve(state: State) -> int:
+    """
+        Reference solver, playing every game to the end.
+    """
+    successors = state.get_successors()
+    if not successors:
+        computer_score, human_score = get_game_score(state.to_2d(), 1, 2)
+        return computer_score - human_score
+    values = [plain_solve(successor) for successor in successors]
+    return max(values) if state.is_computer_turn() else min(values)
+
+
+class SolverTests(unittest.TestCase):
+    def setUp(self):
+        change_game_board(4, 4)
+        self.solver = Solver(1 << 12)
+
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_solve(self):
+        for moves in ((0, 1, 1, 2, 2, 3, 3, 0), (1, 1, 2, 0, 3, 3, 2, 2, 0), (0, 0, 0, 1, 1, 1, 2, 2, 3, 3)):
+            state = State()
+            for col in moves:
+                state.update_col(col, True)
+            expected = plain_solve(state)
+            self.assertEqual(expected, self.solver.solve(state))
+            self.assertEqual(expected, self.solver.solve(BitboardState(state.is_computer_turn(), state.get_value())))
+
+            value, next_step = self.solver.run_solver(state)
+            self.assertEqual(expected, value)
+            self.assertEqual(expected, plain_solve(next_step))
+            scores = self.solver.analyze(state)
+            self.assertEqual(set(scores), set(state.legal_moves()))
+            best = max if state.is_computer_turn() else min
+            self.assertEqual(expected, best(scores.values()))
+
+    def test_full_board(self):
+        state = State()
+        for _ in range(4):
+            for col in range(4):
+                state.update_col(col, True)
+        computer_score, human_score = get_game_score(state.to_2d(), 1, 2)
+        self.assertEqual(computer_score - human_score, self.solver.solve(state))
+        self.assertIs(self.solver.run_solver(state)[1], state)
+
+    def test_outcome(self):
+        self.assertEqual(outcome(3), WIN)
+        self.assertEqual(outcome(0), DRAW)
+        self.assertEqual(outcome(-1), LOSS)
+
+    def test_limits(self):
+        change_game_board(7, 6)
+        solver = Solver(limits=SearchLimits(node_budget=1000))
+        with self.assertRaises(SearchTimeout):
+            solver.solve(State())
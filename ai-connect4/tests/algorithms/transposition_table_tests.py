@@ -0,0 +1,117 @@
+import unittest
+
+from src.state.state import State
+from src.state.bitboard_state import BitboardState
+from src.state.geometry import get_geometry
+from src.algorithms.transposition_table import TranspositionTable, state_key, canonical_key, mirror_move, value_key, \
+    canonical_value_key, EXACT, LOWER, UPPER
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+
+
+class TranspositionTableTests(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(8)
+
+    def test_store_and_get(self):
+        self.table.store(5, 3, 100, EXACT, 2)
+        self.assertEqual(self.table.get(5), (3, 100, EXACT, 2))
+        self.assertIsNone(self.table.get(6))
+        self.assertEqual(len(self.table), 1)
+
+    def test_probe_depth_and_bounds(self):
+        """
+            Test that entries are only used for searches that are not deeper than them, and that bounds are only used
+            when they are outside of the search window.
+        """
+        self.table.store(1, 2, 50, EXACT, 0)
+        self.assertEqual(self.table.probe(1, 2, -1000, 1000), (50, 0))
+        self.assertEqual(self.table.probe(1, 3, -1000, 1000), (None, 0))
+
+        self.table.store(2, 4, 50, LOWER, 1)
+        self.assertEqual(self.table.probe(2, 4, 0, 40), (50, 1))
+        self.assertEqual(self.table.probe(2, 4, 0, 60), (None, 1))
+
+        self.table.store(3, 4, 50, UPPER, 1)
+        self.assertEqual(self.table.probe(3, 4, 60, 100), (50, 1))
+        self.assertEqual(self.table.probe(3, 4, 40, 100), (None, 1))
+
+    def test_capacity_is_bounded(self):
+        for key in range(1000):
+            self.table.store(key, key % 5, key, EXACT)
+        self.assertLessEqual(len(self.table), self.table.capacity)
+        self.assertEqual(sum(key is not None for key in self.table.keys), len(self.table))
+
+    def test_depth_preferred_replacement(self):
+        """
+            Test that a shallower entry of the same bucket does not evict a deeper one.
+        """
+        table = TranspositionTable(2)  # a single bucket
+        table.store(1, 5, 10, EXACT)
+        table.store(2, 1, 20, EXACT)
+        table.store(3, 2, 30, EXACT)
+        self.assertEqual(table.get(1), (5, 10, EXACT, None))
+        self.assertIsNone(table.get(2))
+        self.assertEqual(table.get(3), (2, 30, EXACT, None))
+        table.store(4, 6, 40, EXACT)
+        self.assertEqual(table.get(4), (6, 40, EXACT, None))
+        self.assertEqual(table.get(1), (5, 10, EXACT, None))
+        self.assertEqual(len(table), 2)
+
+    def test_state_key_includes_turn(self):
+        self.assertNotEqual(state_key(State(True)), state_key(State(False)))
+
+    def test_canonical_key_is_shared_by_mirrors(self):
+        state, mirrored = State(True), State(True)
+        state.update_col(1, True)
+        state.update_col(2, True)
+        mirrored.update_col(5, True)
+        mirrored.update_col(4, True)
+        (key, is_mirror), (mirrored_key, mirrored_is_mirror) = canonical_key(state), canonical_key(mirrored)
+        self.assertEqual(key, mirrored_key)
+        self.assertNotEqual(is_mirror, mirrored_is_mirror)
+        self.assertNotEqual(canonical_key(State(True))[0], canonical_key(State(False))[0])
+        self.assertEqual(mirror_move(1, True, 7), 5)
+        self.assertEqual(mirror_move(1, False, 7), 1)
+        self.assertIsNone(mirror_move(None, True, 7))
+
+    def test_value_keys_match_state_keys(self):
+        geometry = get_geometry(7, 6)
+        state = State(True)
+        for col in (1, 2, 2):
+            state.update_col(col, True)
+        for searched in (state, BitboardState(state.is_computer_turn(), state.get_value())):
+            self.assertEqual(value_key(state.get_value(), state.is_computer_turn()), state_key(searched))
+            self.assertEqual(canonical_value_key(geometry, state.get_value(), state.is_computer_turn()),
+                             canonical_key(searched))
+
+    def test_mirrored_search_reuses_the_table(self):
+        """
+            Test that searching the mirror of a searched position is answered by the table, with the mirrored move.
+        """
+        state, mirrored = State(True), State(True)
+        for col in (0, 1, 1):
+            state.update_col(col, True)
+            mirrored.update_col(6 - col, True)
+        solver = MinimaxWithAlphaBeta(4)
+        value, _ = solver.run_minimax_with_alpha_beta(state)
+        best_move = solver.best_move
+        stored = len(solver.explored)
+        mirrored_value, _ = solver.run_minimax_with_alpha_beta(mirrored, 6 - best_move)
+        self.assertEqual(mirrored_value, value)
+        self.assertEqual(solver.best_move, 6 - best_move)
+        self.assertEqual(len(solver.explored), stored)  # every mirrored position was already in the table
+
+    def test_stale_entries_are_replaced_first(self):
+        """
+            Test that a deeper entry of a previous search is replaced by a shallower entry of the current search.
+        """
+        table = TranspositionTable(2)
+        table.store(1, 5, 10, EXACT)
+        table.new_search()
+        table.store(2, 1, 20, EXACT)
+        self.assertEqual(table.get(2), (1, 20, EXACT, None))
+        self.assertEqual(table.get(1), (5, 10, EXACT, None))
+        table.store(3, 1, 30, EXACT)
+        self.assertEqual(table.get(3), (1, 30, EXACT, None))
+        self.assertEqual(table.get(2), (1, 20, EXACT, None))
+        self.assertIsNone(table.get(1))
@@ -0,0 +1,173 @@
+import random
+import unittest
+
+from src.state.state import State, change_game_board
+from src.state.bitboard_state import BitboardState
+from src.utilities.get_score import get_game_score
+
+WIDTH = 7
+HEIGHT = 6
+
+
+class TestBitboardStateMethods(unittest.TestCase):
+    def setUp(self):
+        self.state = BitboardState()
+
+    def tearDown(self):
+        change_game_board(WIDTH, HEIGHT)
+
+    def _play_random_game(self, width, height, moves_count, seed):
+        """
+            Plays the same random moves on both backends and checks they always agree.
+        """
+        change_game_board(width, height)
+        rng = random.Random(seed)
+        state = State()
+        bitboard_state = BitboardState()
+        for _ in range(moves_count):
+            successors = state.get_successors()
+            if not successors:
+                break
+            cols = [col for col in range(width) if state._get_height(col) < height]
+            col = rng.choice(cols)
+            state.update_col(col, True)
+            bitboard_state.update_col(col, True)
+            self.assertEqual(state.get_value(), bitboard_state.get_value())
+            self.assertEqual(state.get_canonical_value(), bitboard_state.get_canonical_value())
+            self.assertEqual(state.to_2d(), bitboard_state.to_2d())
+            self.assertEqual(state.is_computer_turn(), bitboard_state.is_computer_turn())
+            self.assertEqual(get_game_score(state.to_2d(), 1, 2), bitboard_state.get_scores())
+        return state, bitboard_state
+
+    def test_matches_state_backend(self):
+        """
+            Test that both backends produce the same values, boards, turns and scores for random games.
+        """
+        for seed in range(5):
+            self._play_random_game(WIDTH, HEIGHT, WIDTH * HEIGHT, seed)
+
+    def test_matches_state_backend_other_sizes(self):
+        for width, height in ((9, 8), (10, 10), (4, 4)):
+            self._play_random_game(width, height, width * height, width)
+
+    def test_successors_match_state_backend(self):
+        state, bitboard_state = self._play_random_game(WIDTH, HEIGHT, 20, 42)
+        self.assertEqual([successor.get_value() for successor in state.get_successors()],
+                         [successor.get_value() for successor in bitboard_state.get_successors()])
+
+    def test_decode_state_value(self):
+        """
+            Test that a bitboard state built from a `State` integer value has the same board.
+        """
+        state, _ = self._play_random_game(WIDTH, HEIGHT, 17, 7)
+        decoded = BitboardState(state.is_computer_turn(), state.get_value())
+        self.assertEqual(state.to_2d(), decoded.to_2d())
+        self.assertEqual(state.get_value(), decoded.get_value())
+
+    def test_full_board(self):
+        for _ in range(HEIGHT):
+            for col in range(WIDTH):
+                self.state.update_col(col, True)
+        self.assertEqual(self.state.get_successors(), [])
+        for col in range(WIDTH):
+            with self.assertRaises(AssertionError):
+                self.state.update_col(col)
+
+    def test_invalid_column(self):
+        with self.assertRaises(AssertionError):
+            self.state.update_col(WIDTH)
+
+    def test_has_four(self):
+        """
+            Test the constant-time four in a row check in every direction.
+        """
+        for col in range(4):
+            self.state.update_col(col)  # human discs in the bottom row, turn is not changed
+        _, human = self.state.get_player_masks()
+        self.assertTrue(self.state.has_four(human))
+
+        vertical = BitboardState(True)
+        for _ in range(3):
+            vertical.update_col(0)
+        computer, _ = vertical.get_player_masks()
+        self.assertFalse(vertical.has_four(computer))
+        vertical.update_col(0)
+        computer, _ = vertical.get_player_masks()
+        self.assertTrue(vertical.has_four(computer))
+
+    def test_has_four_diagonal(self):
+        '''
+        0 0 0 0 0 0 0
+        0 0 0 0 0 0 0
+        0 0 0 2 0 0 0
+        0 0 2 1 0 0 0
+        0 2 1 1 0 0 0
+        2 1 1 1 0 0 0
+        '''
+        state = State()
+        for col, discs in ((0, [2]), (1, [1, 2]), (2, [1, 1, 2]), (3, [1, 1, 1, 2])):
+            for disc in discs:
+                state.comp_turn = disc == 1
+                state.update_col(col)
+        self.state = BitboardState(state.is_computer_turn(), state.get_value())
+        computer, human = self.state.get_player_masks()
+        self.assertTrue(self.state.has_four(human))
+        self.assertFalse(self.state.has_four(computer))
+
+    def test_no_wrap_between_columns(self):
+        """
+            Test that discs on top of a column and the bottom of the next one are not seen as a vertical four.
+        """
+        state = State(True)
+        for _ in range(HEIGHT - 2):
+            state.update_col(0)
+        state.comp_turn = False
+        for _ in range(2):
+            state.update_col(0)
+            state.update_col(1)
+        self.state = BitboardState(state.is_computer_turn(), state.get_value())
+        _, human = self.state.get_player_masks()
+        self.assertFalse(self.state.has_four(human))
+
+    def test_play_and_undo(self):
+        """
+            Test that play / undo keep both the bitboards and the `State` value in sync, and restore them exactly.
+        """
+        rng = random.Random(3)
+        history = []
+        for _ in range(30):
+            col = rng.choice(self.state.legal_moves())
+            history.append((col, self.state.get_value(), self.state.mask, self.state.current))
+            self.state.play(col)
+            self.assertEqual(self.state.to_2d(), BitboardState(self.state.is_computer_turn(),
+                                                               self.state.get_value()).to_2d())
+        for col, value, mask, current in reversed(history):
+            self.state.undo(col)
+            self.assertEqual((self.state.get_value(), self.state.mask, self.state.current), (value, mask, current))
+            self.assertEqual(self.state.mirror, self.state.geometry.mirror_value(value))
+        self.assertFalse(self.state.is_computer_turn())
+
+    def test_canonical_value(self):
+        """
+            Test that a position and its left to right mirror have the same canonical value.
+        """
+        mirrored = BitboardState()
+        for col in (0, 1, 1, 5):
+            self.state.play(col)
+            mirrored.play(WIDTH - 1 - col)
+        self.assertEqual(self.state.get_canonical_value()[0], mirrored.get_canonical_value()[0])
+        self.assertNotEqual(self.state.get_canonical_value()[1], mirrored.get_canonical_value()[1])
+        self.assertEqual(self.state.copy().get_canonical_value(), self.state.get_canonical_value())
+
+    def test_legal_moves(self):
+        for _ in range(HEIGHT):
+            self.state.play(0)
+        self.assertEqual(self.state.legal_moves(), list(range(1, WIDTH)))
+        self.assertFalse(self.state.is_full())
+
+    def test_computer_turn(self):
+        self.assertFalse(self.state.is_computer_turn())
+        self.state.update_col(3, True)
+        self.assertTrue(self.state.is_computer_turn())
+        self.state.update_col(0, True)
+        self.assertFalse(self.state.is_computer_turn())
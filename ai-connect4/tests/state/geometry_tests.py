@@ -0,0 +1,104 @@
+import random
+import unittest
+
+from src.state.geometry import get_geometry
+from src.state.bitboard_state import BitboardState
+from src.state.state import State
+
+
+class TestBoardGeometry(unittest.TestCase):
+    def setUp(self):
+        self.geometry = get_geometry(7, 6)
+
+    def test_geometry_is_cached(self):
+        self.assertIs(self.geometry, get_geometry(7, 6))
+        self.assertIsNot(self.geometry, get_geometry(9, 8))
+
+    def test_cell_shifts(self):
+        """
+            Test that the packed integer shifts match the ones of the `State` representation.
+        """
+        self.assertEqual(self.geometry.cell_shifts[0][0], 63 - 3 - 6)
+        self.assertEqual(self.geometry.cell_shifts[5][0], 63 - 3 - 1)
+        self.assertEqual(self.geometry.cell_shifts[5][6], 5)
+        self.assertEqual(self.geometry.height_shifts[6], 6)
+        self.assertEqual(self.geometry.height_masks[6], 0b111 << 6)
+
+    def test_windows_count(self):
+        """
+            Test the number of length-4 windows, e.g. the standard board has 24 horizontal, 21 vertical and
+            12 windows for each diagonal direction.
+        """
+        self.assertEqual(len(self.geometry.windows), 69)
+        self.assertEqual(len(set(self.geometry.windows)), 69)
+        self.assertEqual(len(get_geometry(4, 4).windows), 10)
+
+    def test_cell_windows(self):
+        """
+            Test that a corner cell belongs to 3 windows, and a center cell of the bottom row belongs to 7 windows.
+        """
+        h1 = self.geometry.h1
+        self.assertEqual(len(self.geometry.cell_windows[0]), 3)
+        self.assertEqual(len(self.geometry.cell_windows[3 * h1]), 7)
+        for window_idx in self.geometry.cell_windows[3 * h1]:
+            self.assertTrue(self.geometry.windows[window_idx] & (1 << (3 * h1)))
+
+    def test_windows_stay_inside_board(self):
+        for window in self.geometry.windows:
+            self.assertEqual(window & self.geometry.board_mask, window)
+            self.assertEqual(bin(window).count('1'), 4)
+
+    def test_diagonal_lines(self):
+        """
+            Test that only the heuristic diagonals that can hold a window are kept.
+        """
+        for line in self.geometry.diagonal_lines:
+            self.assertGreater(len(line), 3)
+        self.assertEqual(len(self.geometry.diagonal_lines), 6)
+
+    def test_count_fours(self):
+        state_2d = [
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1, 0, 0]
+        ]
+        bitboard = self.geometry.to_bitboard(state_2d, 1)
+        self.assertEqual(self.geometry.count_fours(bitboard), 2)
+        self.assertTrue(self.geometry.has_four(bitboard))
+        self.assertFalse(self.geometry.has_four(self.geometry.to_bitboard(state_2d, 2)))
+
+    def test_mirror_value(self):
+        state = State()
+        for col in (0, 0, 1, 5, 6, 6, 6, 3):
+            state.update_col(col, True)
+        mirrored = State(state.is_computer_turn(), self.geometry.mirror_value(state.get_value()))
+        self.assertEqual(mirrored.to_2d(), [row[::-1] for row in state.to_2d()])
+        self.assertEqual(self.geometry.mirror_value(mirrored.get_value()), state.get_value())
+
+    def test_winning_cells(self):
+        """
+            Test that the winning cells are the empty cells of the windows holding 3 discs of a player, for random boards.
+        """
+        rng = random.Random(19)
+        for _ in range(200):
+            state = BitboardState()
+            for _ in range(rng.randrange(42)):
+                state.play(rng.choice(state.legal_moves()))
+            for discs in (state.current, state.mask ^ state.current):
+                expected = 0
+                for window in self.geometry.windows:
+                    missing = window & ~discs
+                    if bin(missing).count('1') == 1 and not missing & state.mask:
+                        expected |= missing
+                self.assertEqual(self.geometry.winning_cells(discs, state.mask), expected)
+
+    def test_swap_players(self):
+        state = State()
+        for col in (0, 0, 1, 5, 6, 6, 6, 3):
+            state.update_col(col, True)
+        swapped = State(not state.is_computer_turn(), self.geometry.swap_players(state.get_value()))
+        self.assertEqual(swapped.to_2d(), [[{0: 0, 1: 2, 2: 1}[cell] for cell in row] for row in state.to_2d()])
+        self.assertEqual(self.geometry.swap_players(swapped.get_value()), state.get_value())
@@ -165,3 +165,34 @@ class TestStateMethods(unittest.TestCase):
         self.assertFalse(self.state.is_computer_turn())
         self.state.update_col(5, True)
         self.assertTrue(self.state.is_computer_turn())
+
+    def test_play_and_undo(self):
+        """
+            Test that undoing moves played in place restores the exact previous state.
+
+            This test method plays moves with `play` and checks the returned rows and the turn, then it takes them
+            back with `undo` in the reverse order and checks the state value after each step.
+        """
+        values = [self.state.get_value()]
+        moves = [3, 3, 0, 6, 3]
+        rows = [0, 1, 0, 0, 2]
+        for move, row in zip(moves, rows):
+            self.assertEqual(self.state.play(move), row)
+            values.append(self.state.get_value())
+        self.assertTrue(self.state.is_computer_turn())
+        for move, row in zip(reversed(moves), reversed(rows)):
+            values.pop()
+            self.assertEqual(self.state.undo(move), row)
+            self.assertEqual(self.state.get_value(), values[-1])
+        self.assertEqual(self.state.get_value(), 0)
+        self.assertFalse(self.state.is_computer_turn())
+
+    def test_legal_moves(self):
+        """
+            Test that full columns are not returned as legal moves.
+        """
+        self.assertEqual(self.state.legal_moves(), list(range(WIDTH)))
+        for _ in range(HEIGHT):
+            self.state.play(2)
+        self.assertEqual(self.state.legal_moves(), [0, 1, 3, 4, 5, 6])
+        self.assertFalse(self.state.is_full())
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.geometry import get_geometry
+from src.algorithms.engine import SearchEngine, MINIMAX_WITH_ALPHA_BETA
+from src.tools.analyze import parse_position, analyze_position, analyze_lines, analyze_file
+from src.tools.match import EngineConfig
+from src.tools.positions import state_from_moves
+
+
+class AnalyzeTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_parse_moves(self):
+        state = parse_position("334", 7, 6)
+        self.assertEqual(state.get_value(), state_from_moves(7, 6, "334").get_value())
+        self.assertTrue(state.is_computer_turn())
+        self.assertEqual(parse_position("3, 3,4", 7, 6).get_value(), state.get_value())
+        for line in ("7", "3333333", "3a"):
+            with self.assertRaises(ValueError):
+                parse_position(line, 7, 6)
+
+    def test_parse_values(self):
+        for moves in ("3", "3342", "334245226110056"):
+            expected = state_from_moves(7, 6, moves)
+            state = parse_position(str(expected.get_value()), 7, 6, "values")
+            self.assertEqual(state.get_value(), expected.get_value())
+            self.assertEqual(state.is_computer_turn(), expected.is_computer_turn())
+        geometry = get_geometry(7, 6)
+        for value in (-1, 7 << geometry.height_shifts[0], 1 << (7 * geometry.col_bits)):
+            with self.assertRaises(ValueError):
+                parse_position(str(value), 7, 6, "values")
+
+    def test_analyze_position(self):
+        """
+            Test that the human turn positions are analyzed for the human, as the swapped computer positions.
+        """
+        engine = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4)
+        state = state_from_moves(7, 6, "3342")
+        swapped = State(True, get_geometry(7, 6).swap_players(state.get_value()))
+        analysis = analyze_position(engine, state)
+        expected_score, _ = SearchEngine(MINIMAX_WITH_ALPHA_BETA, 4).search(swapped)
+        self.assertEqual(analysis["score"], expected_score)
+        self.assertEqual(analysis["best_move"], engine.solver.best_move)
+        self.assertEqual(analysis["depth"], 4)
+        self.assertGreater(analysis["nodes"], 0)
+        with self.assertRaises(ValueError):
+            analyze_position(engine, State(True, (1 << (7 * get_geometry(7, 6).col_bits)) - 1))
+
+    def test_analyze_lines(self):
+        """
+            Test that the analyses are in the input order, and the same in the calling process and in worker processes.
+        """
+        lines = ["3\n", "\n", "334\n", "9\n", "0123456\n", "33425\n"]
+        config = EngineConfig(MINIMAX_WITH_ALPHA_BETA, 3)
+        change_game_board(5, 4)
+        results = list(analyze_lines(lines, config))
+        self.assertEqual((state_module.WIDTH, state_module.HEIGHT), (5, 4))  # the board size is restored
+        self.assertEqual([result["position"] for result in results], ["3", "334", "9", "0123456", "33425"])
+        self.assertEqual([("error" in result) for result in results], [False, False, True, False, False])
+
+        pooled = list(analyze_lines(lines, config, workers=2, chunk_size=2))
+        for result in results + pooled:
+            result.pop("time", None)
+        self.assertEqual(results, pooled)
+
+    def test_analyze_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "positions.txt")
+            output_path = os.path.join(directory, "results.jsonl")
+            with open(input_path, "w") as file:
+                file.write("3\n33\n")
+            count = analyze_file(input_path, output_path, EngineConfig(MINIMAX_WITH_ALPHA_BETA, 2), 5, 4)
+            with open(output_path) as file:
+                results = [json.loads(line) for line in file]
+        self.assertEqual(count, 2)
+        self.assertEqual([result["position"] for result in results], ["3", "33"])
+        self.assertTrue(all(0 <= result["best_move"] < 5 for result in results))
@@ -0,0 +1,74 @@
+import time
+import unittest
+from unittest import mock
+
+from src.state import state as state_module
+from src.state.state import change_game_board
+from src.algorithms.engine import SearchEngine
+from src.tools.benchmark import measure, run_benchmarks, compare, search_benchmarks
+from src.tools.positions import load_position
+
+
+class BenchmarkTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_measure(self):
+        calls = []
+
+        def benchmark():
+            calls.append(1)
+            return 10
+
+        result = measure(benchmark, repeats=3, warmup=2, min_time=0)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(result["repeats"], 3)
+        self.assertLessEqual(result["min"], result["median"])
+        self.assertLessEqual(result["median"], result["max"])
+
+    def test_measure_timed_benchmark(self):
+        """
+            Test that the benchmarks timing their own operations are measured on their time, not on the calls time.
+        """
+        def benchmark():
+            time.sleep(0.01)  # a setup, not measured
+            return 10, 0.001
+
+        result = measure(benchmark, repeats=2, warmup=0, min_time=0)
+        self.assertAlmostEqual(result["median"], 10000)
+
+    def test_search_benchmarks_count_nodes(self):
+        benchmarks = search_benchmarks([load_position("midgame-21")], depth=2)
+        self.assertEqual(len(benchmarks), 3)
+        for benchmark in benchmarks.values():
+            nodes, seconds = benchmark()
+            self.assertGreater(nodes, 0)
+            self.assertGreater(seconds, 0)
+
+    def test_search_benchmarks_exclude_engine_creation(self):
+        def slow_engine(*args, **kwargs):
+            time.sleep(0.05)
+            return SearchEngine(*args, **kwargs)
+
+        states = [load_position(name) for name in ("opening-center", "opening-edge", "opening-3", "early-5")]
+        with mock.patch("src.tools.benchmark.SearchEngine", side_effect=slow_engine):
+            for benchmark in search_benchmarks(states, depth=1).values():
+                _, seconds = benchmark()
+                self.assertLess(seconds, 0.05)  # less than a single engine creation
+
+    def test_run_and_compare(self):
+        change_game_board(5, 4)
+        results = run_benchmarks("state.to_2d", repeats=2, warmup=0)
+        self.assertEqual((state_module.WIDTH, state_module.HEIGHT), (5, 4))  # the board size is restored
+        self.assertEqual(set(results["benchmarks"]), {"state.to_2d/openings", "state.to_2d/midgames",
+                                                      "state.to_2d/near-full", "state.to_2d/9x8",
+                                                      "state.to_2d/10x10"})
+        self.assertEqual(results["benchmarks"]["state.to_2d/openings"]["unit"], "ops/s")
+        median = results["benchmarks"]["state.to_2d/openings"]["median"]
+        baseline = {"benchmarks": {"state.to_2d/openings": {"median": median / 2}}}
+        (name, _, _, speedup), = compare(results, baseline)
+        self.assertEqual((name, speedup), ("state.to_2d/openings", 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
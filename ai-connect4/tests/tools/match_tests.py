@@ -0,0 +1,70 @@
+import random
+import unittest
+from unittest import mock
+
+from src.state import state as state_module
+from src.state.state import State, change_game_board
+from src.state.bitboard_state import BitboardState
+from src.algorithms.engine import PURE_MINIMAX, NEGAMAX_PVS
+from src.tools.match import EngineConfig, MatchResult, elo_difference, play_game, random_opening, run_match
+
+
+class MatchTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def test_parse_engine(self):
+        config = EngineConfig.parse("negamax:6:0.5")
+        self.assertEqual((config.approach, config.k, config.time_budget), (NEGAMAX_PVS, 6, 0.5))
+        self.assertEqual(config.name, "negamax:6:0.5")
+        self.assertEqual(EngineConfig.parse("minimax:2").approach, PURE_MINIMAX)
+        for spec in ("minimax", "unknown:2", "minimax:2:1:1"):
+            with self.assertRaises(ValueError):
+                EngineConfig.parse(spec)
+
+    def test_elo(self):
+        self.assertEqual(elo_difference(0.5), 0)
+        self.assertAlmostEqual(elo_difference(0.75), 190.85, places=2)
+        self.assertAlmostEqual(elo_difference(0.25), - elo_difference(0.75))
+        result = MatchResult(EngineConfig(), EngineConfig())
+        for margin in (1, 2, 0, -1, 3):
+            result.add_game(margin, [10, 20], [1.0, 1.0])
+        self.assertEqual((result.wins, result.draws, result.losses), (3, 1, 1))
+        self.assertEqual(result.score, 0.7)
+        elo, low, high = result.elo()
+        self.assertLess(low, elo)
+        self.assertLess(elo, high)
+        self.assertEqual(result.nodes_per_second(1), 20)
+
+    def test_random_opening(self):
+        opening = random_opening(4, 4, 20, random.Random(1))
+        self.assertEqual(len(opening), 16)  # the board is full
+        self.assertEqual(sorted(opening.count(col) for col in range(4)), [4, 4, 4, 4])
+
+    def test_play_game(self):
+        """
+            Test that a game is played to the full board, and that swapping the engines sides negates the margin.
+        """
+        deep, shallow = EngineConfig(k=4), EngineConfig(PURE_MINIMAX, 1)
+        with mock.patch("src.tools.match.BitboardState", wraps=BitboardState) as final_state:
+            margin, nodes, _ = play_game(deep, shallow, 4, 4, [1, 2], True)
+        comp_turn, state_val = final_state.call_args.args  # the state the fours are counted on
+        self.assertTrue(State(comp_turn, state_val).is_full())
+        computer, human = BitboardState(comp_turn, state_val).get_scores()
+        self.assertEqual(margin, computer - human)
+        self.assertTrue(all(nodes))
+
+        swapped_margin, swapped_nodes, _ = play_game(shallow, deep, 4, 4, [1, 2], False)
+        self.assertEqual(swapped_margin, -margin)
+        self.assertEqual(swapped_nodes, nodes[::-1])
+
+    def test_run_match(self):
+        result = run_match(EngineConfig(k=4), EngineConfig(PURE_MINIMAX, 1), games=6, width=5, height=4,
+                           opening_plies=2)
+        self.assertEqual(result.games, 6)
+        self.assertGreaterEqual(result.score, 0.5)
+        self.assertEqual((state_module.WIDTH, state_module.HEIGHT), (7, 6))  # the board size is restored
+
+
+if __name__ == '__main__':
+    unittest.main()
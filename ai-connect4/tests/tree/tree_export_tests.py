@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.state.state import State
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.tree.tree_representation import Tree, RECORD_FULL
+from src.tree.tree_export import export_tree, read_binary_tree, walk_with_ids, BINARY, DOT, JSONL
+
+
+class TreeExportTests(unittest.TestCase):
+    def setUp(self):
+        '''
+        1
+        |-- 2 -- 4
+        |-- 3
+        '''
+        self.tree = Tree((1, 5))
+        self.tree.add_child_to_node(1, (2, 5))
+        self.tree.add_child_to_node(1, (3, -float('inf')))
+        self.tree.add_child_to_node(2, (4, 2.5))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_walk_with_ids(self):
+        self.assertEqual(list(walk_with_ids(self.tree)),
+                         [(0, -1, 0, 1, 5), (1, 0, 1, 2, 5), (2, 1, 2, 4, 2.5), (3, 0, 1, 3, -float('inf'))])
+        self.assertEqual([node[0] for node in walk_with_ids(self.tree, max_depth=1)], [0, 1, 2])
+        self.assertEqual(len(list(walk_with_ids(self.tree, max_nodes=2))), 2)
+
+    def test_formats(self):
+        self.assertEqual(export_tree(self.tree, self.path("tree.jsonl")), 4)
+        with open(self.path("tree.jsonl")) as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(lines[2], {"id": 2, "parent": 1, "depth": 2, "state": 4, "value": 2.5})
+
+        self.assertEqual(export_tree(self.tree, self.path("tree.gv"), DOT, max_depth=1), 3)
+        with open(self.path("tree.gv")) as file:
+            dot = file.read()
+        self.assertTrue(dot.startswith("digraph tree {"))
+        self.assertIn('n2 [label="Node3: -inf"];', dot)
+        self.assertIn("n0 -> n2;", dot)
+
+        self.assertEqual(export_tree(self.tree, self.path("tree.bin")), 4)
+        self.assertEqual(list(read_binary_tree(self.path("tree.bin"))), list(walk_with_ids(self.tree)))
+
+        with self.assertRaises(ValueError):
+            export_tree(self.tree, self.path("tree.txt"))
+        with self.assertRaises(ValueError):
+            list(read_binary_tree(self.path("tree.jsonl")))
+
+    def test_search_tree(self):
+        """
+            Test that a deep recorded search tree is exported in full, and read back with the same states.
+        """
+        state = State()
+        state.update_col(3, True)
+        solver = MinimaxWithAlphaBeta(5, record_depth=RECORD_FULL)
+        solver.run_minimax_with_alpha_beta(state)
+        count = export_tree(solver.tree, self.path("search.bin"), BINARY)
+        self.assertEqual(count, len(list(solver.tree.walk())))
+        self.assertGreater(count, len(solver.tree.identifier))  # transpositions are exported once per path
+        states = {node[3] for node in read_binary_tree(self.path("search.bin"))}
+        self.assertEqual(states, set(solver.tree.identifier))
+        self.assertEqual(export_tree(solver.tree, self.path("search.jsonl"), JSONL, max_nodes=100), 100)
@@ -0,0 +1,44 @@
+import unittest
+
+from src.state.state import State
+from src.algorithms.minimax import Minimax
+from src.algorithms.minimax_with_alpha_beta import MinimaxWithAlphaBeta
+from src.algorithms.negamax import NegamaxPVS
+from src.tree.tree_representation import Tree, RECORD_OFF, RECORD_ROOT, RECORD_FULL
+
+
+class TreeTests(unittest.TestCase):
+    def test_children(self):
+        tree = Tree((10, 0))
+        tree.add_child_to_node(10, (11, 5))
+        tree.add_child_to_node(10, (12, -5))
+        tree.add_child_to_node(11, (13, 7.5))
+        tree.set_root((10, 5))
+        self.assertEqual(tree.children(10), [(11, 5), (12, -5)])
+        self.assertEqual(tree.children(11), [(13, 7.5)])
+        self.assertEqual(tree.children(13), [])
+        self.assertEqual(tree.children(99), [])
+        self.assertEqual(tree.nodes, {10: [(11, 5), (12, -5)], 11: [(13, 7.5)]})
+        self.assertEqual(tree.identifier, {10: 1, 11: 2, 12: 3, 13: 4})
+        self.assertEqual(len(tree), 3)
+
+    def test_recording_modes(self):
+        """
+            Test that the recording depth only changes the recorded tree, not the search results.
+        """
+        state = State()
+        state.update_col(3, True)
+        for solver_cls, run in ((Minimax, "run_minimax"),
+                                (MinimaxWithAlphaBeta, "run_minimax_with_alpha_beta"),
+                                (NegamaxPVS, "run_negamax")):
+            expected, _ = getattr(solver_cls(3), run)(state)
+            edges = []
+            for record_depth in (RECORD_OFF, RECORD_ROOT, 2, RECORD_FULL):
+                solver = solver_cls(3, record_depth=record_depth)
+                self.assertEqual(expected, getattr(solver, run)(state)[0])
+                edges.append(0 if solver.tree is None else len(solver.tree))
+            self.assertIsNone(solver_cls(3).tree)
+            self.assertEqual(edges[0], 0)
+            self.assertEqual(edges[1], len(state.legal_moves()))
+            self.assertLess(edges[1], edges[2])
+            self.assertLess(edges[2], edges[3])
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from src.state.state import State, change_game_board
+from src.utilities.get_heuristic import calculate_heuristic
+from src.utilities.get_score import get_game_score
+
+try:
+    import numpy
+    from src.utilities.batch_evaluation import batch_heuristic, batch_game_score, boards_from_states, \
+        boards_from_values
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class BatchEvaluationTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def _random_states(self, width, height, count, seed):
+        change_game_board(width, height)
+        rng = random.Random(seed)
+        states = []
+        for _ in range(count):
+            state = State()
+            for _ in range(rng.randint(0, width * height)):
+                state.play(rng.choice(state.legal_moves()))
+            states.append(state)
+        return states
+
+    def test_matches_single_board_evaluation(self):
+        for width, height in ((7, 6), (9, 8), (10, 10), (4, 4)):
+            states = self._random_states(width, height, 40, width)
+            boards = boards_from_states(states)
+            heuristics = batch_heuristic(boards)
+            scores = batch_game_score(boards)
+            for idx, state in enumerate(states):
+                self.assertEqual(calculate_heuristic(state.to_2d(), 1, 2), heuristics[idx])
+                self.assertEqual(get_game_score(state.to_2d(), 1, 2), tuple(scores[idx]))
+
+    def test_boards_from_values(self):
+        for width, height in ((7, 6), (10, 10)):
+            states = self._random_states(width, height, 20, height)
+            boards = boards_from_values([state.get_value() for state in states], width, height)
+            self.assertTrue((boards == boards_from_states(states)).all())
+
+    def test_score_board(self):
+        board = [
+            [0, 0, 0, 0, 0, 0, 2],
+            [0, 0, 0, 2, 0, 0, 2],
+            [0, 2, 0, 2, 2, 0, 2],
+            [0, 1, 0, 2, 2, 2, 2],
+            [1, 1, 1, 1, 1, 1, 2],
+            [1, 1, 2, 2, 1, 2, 2]
+        ]
+        self.assertEqual([3, 5], batch_game_score(numpy.array([board]))[0].tolist())
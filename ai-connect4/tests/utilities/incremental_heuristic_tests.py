@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from src.state.state import change_game_board
+from src.state.bitboard_state import BitboardState
+from src.utilities.get_heuristic import calculate_heuristic
+from src.utilities.incremental_heuristic import IncrementalHeuristic
+
+
+class IncrementalHeuristicTests(unittest.TestCase):
+    def tearDown(self):
+        change_game_board(7, 6)
+
+    def _check_random_game(self, seed):
+        rng = random.Random(seed)
+        state = BitboardState()
+        evaluator = IncrementalHeuristic(state)
+        history = []
+        while not state.is_full():
+            col = rng.choice(state.legal_moves())
+            is_computer = state.is_computer_turn()
+            row = state.play(col)
+            evaluator.add(row, col, is_computer)
+            history.append((row, col, is_computer))
+            self.assertEqual(calculate_heuristic(state.to_2d(), 1, 2), evaluator.get_value())
+            if rng.random() < 0.3:
+                row, col, is_computer = history.pop()
+                state.undo(col)
+                evaluator.remove(row, col, is_computer)
+                self.assertEqual(calculate_heuristic(state.to_2d(), 1, 2), evaluator.get_value())
+
+    def test_matches_heuristic(self):
+        for seed in range(5):
+            self._check_random_game(seed)
+
+    def test_matches_heuristic_other_sizes(self):
+        for width, height in ((9, 8), (10, 10), (4, 5)):
+            change_game_board(width, height)
+            self._check_random_game(width)
+
+    def test_initial_state(self):
+        """
+            Test that an evaluator built from a non-empty state starts from its heuristic value.
+        """
+        state = BitboardState()
+        for col in (3, 3, 2, 4, 4, 1, 0):
+            state.play(col)
+        self.assertEqual(calculate_heuristic(state.to_2d(), 1, 2), IncrementalHeuristic(state).get_value())